@@ -0,0 +1,179 @@
+"""
+Asynchronous article fetcher in front of the article store.
+
+All downloads share one aiohttp connection pool with a per-host connection
+limit, so k links take about as long as the slowest one rather than their
+sum. Each attempt is paced and retried by the fetch scheduler, behind a
+circuit breaker per domain. Bodies are read in chunks and decoded
+incrementally, and a page larger than FETCH_MAX_BYTES is abandoned instead
+of being buffered.
+"""
+import re
+import codecs
+import asyncio
+import logging
+import weakref
+
+import aiohttp
+
+from backend import config
+from backend.article_store import get_article_store, url_domain
+from backend.circuit_breaker import get_breaker
+from backend.fetch_scheduler import check_status, get_fetch_scheduler
+from backend.http_client import DEFAULT_HEADERS
+from backend.metrics import time_stage
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+class ResponseTooLarge(Exception):
+    pass
+
+
+class ServerError(Exception):
+    def __init__(self, url, status):
+        super().__init__(f"HTTP {status} from {url}")
+        self.status = status
+
+
+def _charset(response, first_chunk):
+    # Header charset, else a <meta charset> near the top of the page, else UTF-8
+    candidates = [response.charset]
+    match = META_CHARSET.search(first_chunk[:4096])
+    if match:
+        candidates.append(match.group(1).decode("ascii", "ignore"))
+    for name in candidates:
+        if not name:
+            continue
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def _domain_breaker(url):
+    # A 4xx or an oversized page means the site answered; outages, timeouts and 5xx trip it
+    return get_breaker(
+        "domain", url_domain(url),
+        failure_threshold=config.DOMAIN_BREAKER_FAILURES,
+        reset_timeout=config.DOMAIN_BREAKER_RESET_TIMEOUT,
+        ignore=(aiohttp.ClientResponseError, ResponseTooLarge),
+    )
+
+
+class AsyncArticleFetcher:
+    def __init__(self, store=None, max_connections=None, per_host=None, timeout=None, max_bytes=None):
+        self.store = store or get_article_store()
+        self.max_connections = max_connections or config.FETCH_MAX_CONNECTIONS
+        self.per_host = per_host or config.FETCH_PER_HOST
+        self.timeout = timeout or config.FETCH_TIMEOUT
+        self.max_bytes = max_bytes or config.FETCH_MAX_BYTES
+        self._session = None
+
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections, limit_per_host=self.per_host, ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=config.FETCH_CONNECT_TIMEOUT),
+            )
+        return self._session
+
+    async def _read_text(self, response):
+        if response.content_length and response.content_length > self.max_bytes:
+            raise ResponseTooLarge(f"{response.content_length} bytes exceeds the {self.max_bytes} byte cap")
+        decoder = None
+        parts = []
+        size = 0
+        async for chunk in response.content.iter_chunked(CHUNK_SIZE):
+            size += len(chunk)
+            if size > self.max_bytes:
+                raise ResponseTooLarge(f"body exceeds the {self.max_bytes} byte cap")
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder(_charset(response, chunk))(errors="replace")
+            parts.append(decoder.decode(chunk))
+        if decoder is not None:
+            parts.append(decoder.decode(b"", final=True))
+        return "".join(parts)
+
+    async def _fetch(self, url, record):
+        # One attempt: None when the stored copy is still current, else (html, etag, last_modified)
+        async with self._get_session().get(url, headers=self.store.conditional_headers(record)) as response:
+            if response.status == 304 and record is not None:
+                return None
+            check_status(url, response.status, response.headers)
+            if response.status >= 500:
+                # Raised apart from ClientResponseError so the domain breaker counts every 5xx
+                raise ServerError(url, response.status)
+            response.raise_for_status()
+            html = await self._read_text(response)
+            return html, response.headers.get("ETag"), response.headers.get("Last-Modified")
+
+    async def load(self, url):
+        """Document for one URL, served from the store when it is fresh or unchanged upstream"""
+        record = await asyncio.to_thread(self.store.lookup, url)
+        if self.store.is_fresh(record):
+            return await asyncio.to_thread(self.store.serve, url, record)
+        try:
+            with time_stage("article_fetch"):
+                fetched = await _domain_breaker(url).acall(get_fetch_scheduler().acall, url, self._fetch, url, record)
+        except Exception:
+            self.store.record_error(url)
+            raise
+        if fetched is None:
+            return await asyncio.to_thread(self.store.serve, url, record, True)
+        html, etag, last_modified = fetched
+        return await asyncio.to_thread(self.store.store, url, html, etag, last_modified, record)
+
+    async def load_all(self, links, total_timeout=None):
+        """
+        Fetch all links concurrently; returns {url: Document} for those that loaded.
+
+        Failed links are logged and skipped, and links still loading when
+        total_timeout expires are abandoned.
+        """
+        total_timeout = config.FETCH_TOTAL_TIMEOUT if total_timeout is None else total_timeout
+        links = list(dict.fromkeys(links))
+        tasks = {asyncio.ensure_future(self.load(url)): url for url in links}
+        if not tasks:
+            return {}
+        done, pending = await asyncio.wait(tasks, timeout=total_timeout)
+        for task in pending:
+            task.cancel()
+            logger.warning(f"Gave up on {tasks[task]} after {total_timeout}s")
+        docs = {}
+        for task in done:
+            try:
+                docs[tasks[task]] = task.result()
+            except Exception as e:
+                logger.warning(f"Failed to load {tasks[task]}: {e}")
+        return docs
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+# aiohttp sessions belong to one event loop, so each loop gets its own fetcher
+_fetchers = weakref.WeakKeyDictionary()
+
+
+def get_article_fetcher():
+    loop = asyncio.get_running_loop()
+    fetcher = _fetchers.get(loop)
+    if fetcher is None:
+        fetcher = _fetchers[loop] = AsyncArticleFetcher()
+    return fetcher
+
+
+async def close_article_fetcher():
+    fetcher = _fetchers.pop(asyncio.get_running_loop(), None)
+    if fetcher is not None:
+        await fetcher.close()
@@ -0,0 +1,284 @@
+"""
+Local store of fetched news articles, keyed by canonical URL.
+
+Each URL maps to the sha256 of its extracted text, and the text itself is
+stored once per hash, so syndicated copies of the same story share storage.
+Recently validated articles are served without touching the network; older
+ones are re-fetched with If-None-Match / If-Modified-Since and a 304 serves
+the stored copy. When the stored text exceeds the size budget, the least
+recently used articles are evicted.
+"""
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from bs4 import BeautifulSoup
+from langchain_core.documents import Document
+
+from backend import config
+from backend.content_extraction import EXTRACTOR_VERSION, extract_main_content
+from backend.http_client import http_get
+from backend.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+# Articles deleted per query while evicting
+EVICT_BATCH = 64
+
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid", "ocid", "ref", "from", "src"}
+
+
+def canonical_url(url):
+    """Lowercase scheme and host, drop fragments and tracking parameters, sort the rest"""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+def url_domain(url):
+    host = urlsplit(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def parse_article(html, url):
+    """Main article text and WebBaseLoader-style metadata, plus how much boilerplate was dropped"""
+    soup = BeautifulSoup(html, "html.parser")
+    metadata = {"source": url}
+    if title := soup.find("title"):
+        metadata["title"] = title.get_text()
+    if description := soup.find("meta", attrs={"name": "description"}):
+        metadata["description"] = description.get("content", "No description found.")
+    if root := soup.find("html"):
+        metadata["language"] = root.get("lang", "No language found.")
+    extraction = extract_main_content(soup, url)
+    metadata.update(
+        extraction=extraction.method,
+        extractor_version=EXTRACTOR_VERSION,
+        bytes_removed=extraction.bytes_removed,
+    )
+    return extraction.text, metadata
+
+
+class ArticleStore:
+    def __init__(self, db_path=None, max_bytes=None, fresh_seconds=None):
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, "articles.sqlite3")
+        self.max_bytes = max_bytes or config.ARTICLE_STORE_MAX_BYTES
+        self.fresh_seconds = config.ARTICLE_FRESH_SECONDS if fresh_seconds is None else fresh_seconds
+        self._lock = threading.Lock()
+        self.domain_stats = defaultdict(Counter)
+        self._conn = connect(self.db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS articles (
+                url TEXT PRIMARY KEY,
+                domain TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                metadata TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                validated_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS contents (
+                content_hash TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_accessed_at ON articles (accessed_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS articles_content_hash ON articles (content_hash)")
+        # Running total of stored text, kept by triggers so every process sharing the file agrees
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS contents_size (id INTEGER PRIMARY KEY CHECK (id = 0), bytes INTEGER NOT NULL)"
+        )
+        self._conn.execute(
+            "INSERT OR IGNORE INTO contents_size (id, bytes) SELECT 0, COALESCE(SUM(size), 0) FROM contents"
+        )
+        self._conn.execute(
+            """CREATE TRIGGER IF NOT EXISTS contents_size_insert AFTER INSERT ON contents
+               BEGIN UPDATE contents_size SET bytes = bytes + new.size WHERE id = 0; END"""
+        )
+        self._conn.execute(
+            """CREATE TRIGGER IF NOT EXISTS contents_size_delete AFTER DELETE ON contents
+               BEGIN UPDATE contents_size SET bytes = bytes - old.size WHERE id = 0; END"""
+        )
+
+    def _count(self, url, event, amount=1):
+        # Fetch threads count concurrently; callers must not already hold the lock
+        with self._lock:
+            self.domain_stats[url_domain(url)][event] += amount
+
+    def lookup(self, url):
+        """Stored record for the URL, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                """SELECT a.content_hash, a.metadata, a.etag, a.last_modified, a.validated_at, c.text
+                   FROM articles a JOIN contents c ON c.content_hash = a.content_hash WHERE a.url = ?""",
+                (canonical_url(url),),
+            ).fetchone()
+        # Articles extracted by an older extractor are fetched again in full
+        if row is None or json.loads(row[1]).get("extractor_version") != EXTRACTOR_VERSION:
+            return None
+        return {
+            "content_hash": row[0],
+            "metadata": json.loads(row[1]),
+            "etag": row[2],
+            "last_modified": row[3],
+            "validated_at": row[4],
+            "text": row[5],
+        }
+
+    def is_fresh(self, record):
+        return record is not None and time.time() - record["validated_at"] < self.fresh_seconds
+
+    @staticmethod
+    def conditional_headers(record):
+        headers = {}
+        if record is not None:
+            if record["etag"]:
+                headers["If-None-Match"] = record["etag"]
+            if record["last_modified"]:
+                headers["If-Modified-Since"] = record["last_modified"]
+        return headers
+
+    def serve(self, url, record, revalidated=False):
+        """Document for a stored record; revalidated=True marks a 304 from the origin"""
+        now = time.time()
+        key = canonical_url(url)
+        with self._lock:
+            if revalidated:
+                self._conn.execute(
+                    "UPDATE articles SET validated_at = ?, accessed_at = ? WHERE url = ?", (now, now, key)
+                )
+            else:
+                self._conn.execute("UPDATE articles SET accessed_at = ? WHERE url = ?", (now, key))
+        self._count(url, "not_modified" if revalidated else "hits")
+        return Document(page_content=record["text"], metadata={**record["metadata"], "source": url})
+
+    def store(self, url, html, etag=None, last_modified=None, previous=None):
+        """Extract and keep a freshly downloaded page; returns its Document"""
+        text, metadata = parse_article(html, url)
+        content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        now = time.time()
+        key = canonical_url(url)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                replaced = self._conn.execute("SELECT content_hash FROM articles WHERE url = ?", (key,)).fetchone()
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO contents (content_hash, text, size) VALUES (?, ?, ?)",
+                    (content_hash, text, len(text.encode("utf-8"))),
+                )
+                self._conn.execute(
+                    """INSERT OR REPLACE INTO articles
+                       (url, domain, content_hash, metadata, etag, last_modified, fetched_at, validated_at, accessed_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    (key, url_domain(url), content_hash, json.dumps(metadata, ensure_ascii=False),
+                     etag, last_modified, now, now, now),
+                )
+                if replaced is not None and replaced[0] != content_hash:
+                    self._drop_unreferenced(replaced[0])
+                self._evict()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        self._count(url, "fetched")
+        self._count(url, "bytes_fetched", len(html.encode("utf-8")))
+        self._count(url, "boilerplate_bytes_removed", metadata["bytes_removed"])
+        if previous is not None and previous["content_hash"] != content_hash:
+            self._count(url, "changed")
+        return Document(page_content=text, metadata=metadata)
+
+    def _stored_bytes(self):
+        return self._conn.execute("SELECT bytes FROM contents_size WHERE id = 0").fetchone()[0]
+
+    def _drop_unreferenced(self, content_hash):
+        # Shared text only frees space once its last article is gone
+        referenced = self._conn.execute("SELECT 1 FROM articles WHERE content_hash = ? LIMIT 1", (content_hash,))
+        if referenced.fetchone() is None:
+            self._conn.execute("DELETE FROM contents WHERE content_hash = ?", (content_hash,))
+
+    def _evict(self):
+        # Drop whole articles, least recently used first, a batch at a time off the
+        # accessed_at index, until the running total fits. Called with the lock held.
+        while self._stored_bytes() > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT url, domain, content_hash FROM articles ORDER BY accessed_at ASC LIMIT ?", (EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                # Only text left behind by an older version of the store remains
+                self._conn.execute("DELETE FROM contents WHERE content_hash NOT IN (SELECT content_hash FROM articles)")
+                return
+            for url, domain, content_hash in rows:
+                self._conn.execute("DELETE FROM articles WHERE url = ?", (url,))
+                self.domain_stats[domain]["evicted"] += 1
+                self._drop_unreferenced(content_hash)
+                if self._stored_bytes() <= self.max_bytes:
+                    return
+
+    def record_error(self, url):
+        self._count(url, "errors")
+
+    def load(self, url):
+        """Document for the URL, from the store when it is fresh or unchanged upstream"""
+        record = self.lookup(url)
+        if self.is_fresh(record):
+            return self.serve(url, record)
+        try:
+            response = http_get(url, headers=self.conditional_headers(record))
+            if response.status_code == 304 and record is not None:
+                return self.serve(url, record, revalidated=True)
+            response.raise_for_status()
+            response.encoding = response.apparent_encoding
+        except Exception:
+            self.record_error(url)
+            raise
+        return self.store(
+            url, response.text,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            previous=record,
+        )
+
+    def stats(self):
+        with self._lock:
+            stored = self._conn.execute(
+                """SELECT a.domain, COUNT(*), COALESCE(SUM(c.size), 0)
+                   FROM articles a JOIN contents c ON c.content_hash = a.content_hash GROUP BY a.domain"""
+            ).fetchall()
+            total = self._conn.execute("SELECT COUNT(*), (SELECT bytes FROM contents_size) FROM contents").fetchone()
+            domains = {domain: dict(counts) for domain, counts in self.domain_stats.items()}
+        for domain, articles, size in stored:
+            domains.setdefault(domain, {}).update({"articles": articles, "stored_bytes": size})
+        return {
+            "unique_contents": total[0],
+            "stored_bytes": total[1],
+            "max_bytes": self.max_bytes,
+            "fresh_seconds": self.fresh_seconds,
+            "domains": domains,
+        }
+
+
+_article_store = None
+_article_store_lock = threading.Lock()
+
+
+def get_article_store():
+    global _article_store
+    if _article_store is None:
+        with _article_store_lock:
+            if _article_store is None:
+                _article_store = ArticleStore()
+    return _article_store
@@ -1,92 +1,127 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
-import time
+from backend import config
+from backend.metrics import timed, record_scraper_error, record_search_path
+from backend.browser_pool import get_browser_pool
+from backend.http_client import fetch_html
+from backend.fetch_scheduler import get_fetch_scheduler
 
-def get_bbc_links(search_term):
-    options = Options()
-    options.add_argument('--headless')  # Uncomment for headless mode
-    options.add_argument('--start-maximized')
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+STOPWORDS = {"the", "is", "in", "at", "of", "on", "and", "a", "to", "after", "has", "with", "for", "by", "an", "as", "it", "from", "this", "that", "be", "are", "was", "were", "or", "but", "not", "which", "have", "had", "will", "would", "can", "could", "should", "may", "might", "do", "does", "did", "so", "such", "if", "then", "than", "also", "their", "its", "about", "into", "more", "other", "some", "any", "all", "no", "only", "over", "out", "up", "down", "off", "just", "now", "like", "because", "how", "when", "where", "who", "what", "why"}
+
+SEARCH_BUTTON_XPATH = '//*[@id="__next"]/div/header/div/div[1]/button'
+SEARCH_INPUT_XPATH = '//*[@id="__next"]/div/div[5]/div/div[1]/div/input'
+RESULTS_SELECTOR = 'div[data-testid="new-jersey-grid"]'
+
+def keyword_query(search_term, top_n=10):
+    """Main keywords of the search term, stopwords removed"""
+    keywords = [word for word in search_term.split() if word.lower() not in STOPWORDS]
+    return " ".join(keywords[:top_n])
+
+def parse_bbc_links(page_source, limit=3):
+    """Pick news article links out of a BBC search results page"""
     links = []
-    try:
-        # ---- Step 1: Open BBC News ----
-        driver.get("https://www.bbc.com/news")
-        time.sleep(2)
+    soup = BeautifulSoup(page_source, "html.parser")
+    search_results_div = soup.select_one(RESULTS_SELECTOR)
 
-        # --- Handle popups/modals (example for BBC cookie banner or modal) ---
-        try:
-            # Try to close a modal if present (adjust selector as needed)
-            modal_close = driver.find_element(By.CSS_SELECTOR, ".tp-modal [aria-label='Close'], .tp-modal button, .tp-modal .close")
-            modal_close.click()
-            print("✅ Modal popup closed.")
-            time.sleep(1)
-        except Exception:
-            print("No modal popup found or already closed.")
-
-        # Try to close cookie banner if present
+    print(f"\n🔗 Top {limit} Search Result Links:")
+    count = 0
+    if search_results_div:
+        for link in search_results_div.find_all("a", href=True):
+            href = link["href"]
+            text = link.get_text(strip=True)
+            if text and ("/news" in href or href.startswith("https://www.bbc.com/news")):
+                count += 1
+                full_url = href if href.startswith("http") else "https://www.bbc.com" + href
+                links.append(full_url)
+                print(f"{count}. {text[:80]} ➜ {full_url}")
+                if count == limit:
+                    break
+    else:
+        print("❌ Could not find search results section.")
+
+    if count == 0:
+        print("❌ No valid news article links found in search results.")
+    return links
+
+@timed("search_bbc_http")
+def search_bbc_http(search_term):
+    """Fetch the search results page by URL and parse it without a browser"""
+    return parse_bbc_links(fetch_html("https://www.bbc.com/search", params={"q": keyword_query(search_term)}))
+
+def search_bbc_browser(search_term):
+    links = []
+    with get_browser_pool().lease("bbc") as driver:
         try:
-            cookie_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Agree') or contains(text(), 'Accept')]")
-            cookie_button.click()
-            print("✅ Cookie popup closed.")
-            time.sleep(1)
-        except Exception:
-            print("No cookie popup found or already closed.")
-
-        # ---- Step 2: Click on Search Icon's Parent Button ----
-        search_icon_button = driver.find_element(By.XPATH, '//*[@id="__next"]/div/header/div/div[1]/button')
-        search_icon_button.click()
-        print("✅ Search icon clicked.")
-        time.sleep(2)
-
-        # ---- Step 3: Enter Search Term in Search Bar ----
-        search_input = driver.find_element(By.XPATH, '//*[@id="__next"]/div/div[5]/div/div[1]/div/input')
-        # Extract main keywords (remove common stopwords)
-        stopwords = {"the", "is", "in", "at", "of", "on", "and", "a", "to", "after", "has", "with", "for", "by", "an", "as", "it", "from", "this", "that", "be", "are", "was", "were", "or", "but", "not", "which", "have", "had", "will", "would", "can", "could", "should", "may", "might", "do", "does", "did", "so", "such", "if", "then", "than", "also", "their", "its", "about", "into", "more", "other", "some", "any", "all", "no", "only", "over", "out", "up", "down", "off", "just", "now", "like", "because", "how", "when", "where", "who", "what", "why"}
-        keywords = [word for word in search_term.split() if word.lower() not in stopwords]
-        # Use only the first 3 keywords for the search
-        top_n = 10
-        selected_keywords = keywords[:top_n]
-        keyword_query = " ".join(selected_keywords)
-        search_input.send_keys(keyword_query)
-        search_input.send_keys(Keys.RETURN)
-        print(f"🔍 Searched for top {top_n} main keywords: {keyword_query}")
-        time.sleep(5)  # Wait for results to load
-
-        # ---- Step 4: Scrape Result Links Only from Search Results Section ----
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        search_results_div = soup.find("div", {"data-testid": "new-jersey-grid"})
-
-        print("\n🔗 Top 3 Search Result Links:")
-        count = 0
-        if search_results_div:
-            for link in search_results_div.find_all("a", href=True):
-                href = link["href"]
-                text = link.get_text(strip=True)
-                if text and ("/news" in href or href.startswith("https://www.bbc.com/news")):
-                    count += 1
-                    full_url = href if href.startswith("http") else "https://www.bbc.com" + href
-                    links.append(full_url)
-                    print(f"{count}. {text[:80]} ➜ {full_url}")
-                    if count == 3:
-                        break
-        else:
-            print("❌ Could not find search results section.")
-
-        if count == 0:
-            print("❌ No valid news article links found in search results.")
-
-    except Exception as e:
-        print(f"❌ Error occurred: {e}")
-
-    finally:
-        driver.quit()
+            # ---- Step 1: Open BBC News ----
+            with get_fetch_scheduler().slot("https://www.bbc.com/news"):
+                driver.get("https://www.bbc.com/news")
+            wait = WebDriverWait(driver, config.BROWSER_WAIT_TIMEOUT)
+            wait.until(EC.presence_of_element_located((By.XPATH, SEARCH_BUTTON_XPATH)))
+
+            # --- Handle popups/modals (example for BBC cookie banner or modal) ---
+            try:
+                # Try to close a modal if present (adjust selector as needed)
+                modal_close = driver.find_element(By.CSS_SELECTOR, ".tp-modal [aria-label='Close'], .tp-modal button, .tp-modal .close")
+                modal_close.click()
+                print("✅ Modal popup closed.")
+            except Exception:
+                print("No modal popup found or already closed.")
+
+            # Try to close cookie banner if present
+            try:
+                cookie_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Agree') or contains(text(), 'Accept')]")
+                cookie_button.click()
+                print("✅ Cookie popup closed.")
+            except Exception:
+                print("No cookie popup found or already closed.")
+
+            # ---- Step 2: Click on Search Icon's Parent Button ----
+            # Clickable only once any popup overlay is gone
+            search_icon_button = wait.until(EC.element_to_be_clickable((By.XPATH, SEARCH_BUTTON_XPATH)))
+            search_icon_button.click()
+            print("✅ Search icon clicked.")
+
+            # ---- Step 3: Enter Search Term in Search Bar ----
+            search_input = wait.until(EC.visibility_of_element_located((By.XPATH, SEARCH_INPUT_XPATH)))
+            # Search for the top 10 main keywords (common stopwords removed)
+            top_n = 10
+            query = keyword_query(search_term, top_n)
+            search_input.send_keys(query)
+            search_input.send_keys(Keys.RETURN)
+            print(f"🔍 Searched for top {top_n} main keywords: {query}")
+            try:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, RESULTS_SELECTOR)))
+            except TimeoutException:
+                pass  # parse_bbc_links reports the missing section
+
+            # ---- Step 4: Scrape Result Links Only from Search Results Section ----
+            links = parse_bbc_links(driver.page_source)
+
+        except Exception as e:
+            record_scraper_error("bbc")
+            print(f"❌ Error occurred: {e}")
+            raise
     return links
 
+@timed("search_bbc")
+def get_bbc_links(search_term):
+    # Plain HTTP first; the browser only runs when that finds nothing
+    if config.HTTP_SEARCH:
+        try:
+            links = search_bbc_http(search_term)
+        except Exception as e:
+            print(f"⚠️ BBC HTTP search failed, falling back to browser: {e}")
+            links = []
+        if links:
+            record_search_path("bbc", "http")
+            return links
+    record_search_path("bbc", "browser")
+    return search_bbc_browser(search_term)
+
 if __name__ == "__main__":
     search_term = input("Enter search term: ")
     bbc_links = get_bbc_links(search_term)
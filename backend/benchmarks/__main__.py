@@ -0,0 +1,3 @@
+from backend.benchmarks.run import main
+
+main()
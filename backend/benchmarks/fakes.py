@@ -0,0 +1,74 @@
+"""
+Deterministic stand-ins for the embedding model and the LLM.
+
+They keep the benchmarks offline and repeatable: the same input always gives
+the same vectors and the same verdict, whatever machine runs the suite.
+"""
+import re
+import json
+import zlib
+
+import numpy as np
+
+from backend.resources import PipelineResources
+
+EMBEDDING_DIM = 384
+
+
+class HashingEmbeddings:
+    """Bag-of-words hashing embedder with the MiniLM output shape and unit-length vectors"""
+
+    def __init__(self, dim=EMBEDDING_DIM):
+        self.dim = dim
+
+    def _vector(self, text):
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in re.findall(r"\w+", text.lower()):
+            h = zlib.crc32(token.encode("utf-8"))
+            vector[h % self.dim] += 1.0 if (h >> 16) & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def encode(self, texts, convert_to_numpy=True, show_progress_bar=False, **kwargs):
+        if isinstance(texts, str):
+            return self._vector(texts)
+        return np.vstack([self._vector(t) for t in texts]) if texts else np.zeros((0, self.dim), dtype=np.float32)
+
+    def embed_documents(self, texts):
+        return [self._vector(t).tolist() for t in texts]
+
+    def embed_query(self, text):
+        return self._vector(text).tolist()
+
+
+class FakeVerdictChain:
+    """Mimics prompt | llm | StrOutputParser, scoring the question by word overlap with the context"""
+
+    def _respond(self, inputs):
+        context_words = set(re.findall(r"\w+", inputs["context"].lower()))
+        question_words = set(re.findall(r"\w+", inputs["question"].lower()))
+        score = round(len(context_words & question_words) / len(question_words), 2) if question_words else 0.0
+        verdict = "Highly Trustworthy" if score > 0.8 else "Likely Trustworthy" if score >= 0.5 else "Not Trustworthy"
+        body = json.dumps({"trust_score": score, "verdict": verdict, "trusted_news": inputs["context"][:200]})
+        return f"Here is my assessment.\n```json\n{body}\n```"
+
+    def invoke(self, inputs, config=None):
+        return self._respond(inputs)
+
+    def stream(self, inputs, config=None):
+        for token in re.findall(r"\S+\s*", self._respond(inputs)):
+            yield token
+
+
+def fake_resources():
+    """PipelineResources wired to the fakes; the splitter is the real one"""
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from backend import config
+
+    resources = PipelineResources(embedding_model="fake-hashing", llm_model="fake-verdict")
+    resources.embeddings = HashingEmbeddings()
+    resources.splitter = RecursiveCharacterTextSplitter(chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP)
+    resources.chain = FakeVerdictChain()
+    resources.loaded = True
+    resources.ready = True
+    return resources
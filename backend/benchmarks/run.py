@@ -0,0 +1,368 @@
+"""
+Offline benchmark suite for every stage of the verification pipeline.
+
+    python -m backend.benchmarks --iterations 50 --output bench.json
+    python -m backend.benchmarks --only chunk_text,extract_keywords --compare bench.json
+
+Pages and PDFs come from fixtures/ through a local HTTP stand-in, the LLM and
+embedding model are deterministic fakes, and the vector DB corpus is
+fixtures/corpus.csv, so two runs on the same machine are directly comparable.
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime
+
+# Keep caches and stores created by the pipeline out of the working tree
+os.environ.setdefault("FND_CACHE_DIR", tempfile.mkdtemp(prefix="fnd-bench-"))
+# The fixture server is local; per-host pacing meant for real sites would dominate the timings
+os.environ.setdefault("FND_FETCH_HOST_RATE", "100000")
+os.environ.setdefault("FND_FETCH_HOST_BURST", "100000")
+os.environ.setdefault("FND_FETCH_HOST_CONCURRENCY", "64")
+
+import numpy as np
+import pandas as pd
+
+from backend.benchmarks.fakes import HashingEmbeddings, fake_resources
+from backend.benchmarks.server import FIXTURES_DIR, FixtureServer
+
+ARTICLE_PATHS = ["articles/et_rbi_liquidity.html", "articles/bbc_markets.html", "articles/hindu_sebi.html"]
+NEWS_TEXT = (
+    "RBI halts daily variable rate repo auctions as surplus liquidity in the banking system touches "
+    "Rs 2.45 lakh crore, saying abundant liquidity makes routine operations unnecessary."
+)
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a setup function that returns the zero-argument callable to time"""
+    def decorator(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return decorator
+
+
+def _fixture(path):
+    with open(os.path.join(FIXTURES_DIR, path), encoding="utf-8") as f:
+        return f.read()
+
+
+def _corpus():
+    return pd.read_csv(os.path.join(FIXTURES_DIR, "corpus.csv"), encoding="utf-8")
+
+
+@benchmark("extract_keywords")
+def bench_extract_keywords(server):
+    from backend.verification import extract_keywords
+    texts = [NEWS_TEXT] + list(_corpus()["title"])
+    return lambda: [extract_keywords(t) for t in texts]
+
+
+@benchmark("search_link_extraction")
+def bench_search_links(server):
+    from bs4 import BeautifulSoup
+    from backend.etscrape import parse_et_links
+    from backend.bbcscrape import parse_bbc_links
+    from backend.hinduscrape import parse_hindu_links
+    et_results = str(BeautifulSoup(_fixture("et_search.html"), "html.parser").find(id="categorywiseTop"))
+    bbc_page = _fixture("bbc_search.html")
+    hindu_page = _fixture("hindu_search.html")
+
+    def run():
+        parse_et_links(et_results)
+        parse_bbc_links(bbc_page)
+        parse_hindu_links(hindu_page)
+    return run
+
+
+@benchmark("article_loading")
+def bench_article_loading(server):
+    from backend.rag_pipeline import load_documents
+    links = [server.url(p) for p in ARTICLE_PATHS]
+    return lambda: load_documents(links)
+
+
+@benchmark("article_revalidation")
+def bench_article_revalidation(server):
+    # Every load goes back to the origin with If-Modified-Since and is answered 304
+    from backend.article_store import ArticleStore
+    store = ArticleStore(db_path=os.path.join(tempfile.mkdtemp(prefix="fnd-bench-"), "articles.sqlite3"), fresh_seconds=0)
+    links = [server.url(p) for p in ARTICLE_PATHS]
+    return lambda: [store.load(url) for url in links]
+
+
+@benchmark("content_extraction")
+def bench_content_extraction(server):
+    from backend.article_store import parse_article
+    pages = [(_fixture(p), server.url(p)) for p in ARTICLE_PATHS]
+    return lambda: [parse_article(html, url) for html, url in pages]
+
+
+@benchmark("news_ingest_poll")
+def bench_news_ingest_poll(server):
+    # A fresh ingester each time pays for the full poll; later polls of the same feed are a 304
+    import asyncio
+    from backend.news_ingest import NewsIndex, NewsIngester
+    feeds = [server.url("feeds/news.xml")]
+
+    def run():
+        workdir = tempfile.mkdtemp(prefix="fnd-bench-ingest-")
+        index = NewsIndex(persist_directory=os.path.join(workdir, "index"))
+        ingester = NewsIngester(feeds, db_path=os.path.join(workdir, "ingest.sqlite3"), index=index)
+        asyncio.run(_poll(ingester))
+    return run
+
+
+async def _poll(ingester):
+    from backend.article_fetcher import close_article_fetcher
+    try:
+        return await ingester.poll_once()
+    finally:
+        await close_article_fetcher()
+
+
+@benchmark("news_index_search")
+def bench_news_index_search(server):
+    import asyncio
+    from backend.news_ingest import NewsIndex, NewsIngester
+    from backend.resources import get_resources
+    workdir = tempfile.mkdtemp(prefix="fnd-bench-ingest-")
+    index = NewsIndex(persist_directory=os.path.join(workdir, "index"))
+    ingester = NewsIngester([server.url("feeds/news.xml")], db_path=os.path.join(workdir, "ingest.sqlite3"), index=index)
+    asyncio.run(_poll(ingester))
+    embedding = get_resources().embeddings.embed_query(NEWS_TEXT)
+    # The hashing embedder scores related text further apart than MiniLM does
+    return lambda: index.search(embedding, max_distance=1.3)
+
+
+@benchmark("chunk_text")
+def bench_chunk_text(server):
+    from backend.csv_db import CSVToVectorDB
+    converter = CSVToVectorDB.__new__(CSVToVectorDB)
+    contents = list(_corpus()["content"])
+    return lambda: [converter.chunk_text(c) for c in contents]
+
+
+@benchmark("create_embeddings")
+def bench_create_embeddings(server):
+    from backend.csv_db import CSVToVectorDB
+    converter = CSVToVectorDB.__new__(CSVToVectorDB)
+    converter.embedding_model = HashingEmbeddings()
+    texts = [chunk for c in _corpus()["content"] for chunk in converter.chunk_text(c)]
+    return lambda: converter.create_embeddings(texts)
+
+
+@benchmark("phi_rag_retrieve")
+def bench_phi_retrieve(server):
+    # fake_news_detector imports its neighbours as top-level modules
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from backend.fake_news_detector import PhiRAGFakeNewsDetector
+    detector = PhiRAGFakeNewsDetector.__new__(PhiRAGFakeNewsDetector)
+    detector.embedding_model = HashingEmbeddings()
+    detector.docs = [str(c)[:2000] for c in _corpus()["content"]]
+    detector.doc_embeddings = detector.embedding_model.encode(detector.docs)
+    return lambda: detector.retrieve(NEWS_TEXT, top_k=5)
+
+
+@benchmark("is_news_topic_related")
+def bench_topic_related(server):
+    import PyPDF2
+    from backend.rbi_scraping import RBINewsTopicScraperHeadless
+    from backend.benchmarks.server import make_pdf, PRESS_RELEASE_PAGES
+    scraper = RBINewsTopicScraperHeadless(download_folder=tempfile.mkdtemp(prefix="fnd-bench-pdfs-"), news_topic=NEWS_TEXT)
+    reader = PyPDF2.PdfReader(io.BytesIO(make_pdf(PRESS_RELEASE_PAGES)))
+    pdf_text = "\n".join(page.extract_text() for page in reader.pages)
+    titles = list(_corpus()["title"])
+
+    def run():
+        for title in titles:
+            scraper.is_news_topic_related(title)
+        scraper.is_news_topic_related(pdf_text)
+    return run
+
+
+@benchmark("topic_match_multi_mb")
+def bench_topic_match_multi_mb(server):
+    # Circular-sized inputs: 1 MB and 4 MB of corpus text scored against the news topic
+    from backend.rbi_scraping import RBINewsTopicScraperHeadless
+    scraper = RBINewsTopicScraperHeadless(download_folder=tempfile.mkdtemp(prefix="fnd-bench-pdfs-"), news_topic=NEWS_TEXT)
+    corpus_text = "\n".join(str(c) for c in _corpus()["content"])
+    texts = [(corpus_text * (size // len(corpus_text) + 1))[:size] for size in (1 << 20, 4 << 20)]
+    return lambda: [scraper.is_news_topic_related(text) for text in texts]
+
+
+@benchmark("press_release_pdfs")
+def bench_press_release_pdfs(server):
+    # Download, extract and score 20 press-release PDFs through the staged pipeline
+    from backend.rbi_scraping import RBINewsTopicScraperHeadless
+    scraper = RBINewsTopicScraperHeadless(download_folder=tempfile.mkdtemp(prefix="fnd-bench-pdfs-"), news_topic=NEWS_TEXT)
+    releases = [
+        {"date": "N/A", "title": title, "pdf_url": server.url(f"pdf/press_release.pdf?n={i}"), "detail_url": None,
+         "title_is_related": False, "title_similarity": 0.0, "title_found_terms": []}
+        for i, title in enumerate(list(_corpus()["title"])[:20])
+    ]
+
+    scraper.ledger = None
+
+    def run():
+        scraper.scraped_data = []
+        scraper.process_press_releases_headless(releases, max_pdfs=len(releases))
+    return run
+
+
+@benchmark("press_release_pdfs_incremental")
+def bench_press_release_pdfs_incremental(server):
+    # The same 20 releases on a later run: all served from the scrape ledger
+    from backend.rbi_scraping import RBINewsTopicScraperHeadless
+    from backend.scrape_ledger import ScrapeLedger
+    workdir = tempfile.mkdtemp(prefix="fnd-bench-ledger-")
+    scraper = RBINewsTopicScraperHeadless(download_folder=workdir, news_topic=NEWS_TEXT)
+    scraper.ledger = ScrapeLedger(db_path=os.path.join(workdir, "ledger.sqlite3"), text_dir=os.path.join(workdir, "texts"))
+    releases = [
+        {"date": "N/A", "title": title, "pdf_url": server.url(f"pdf/press_release.pdf?n={i}"), "detail_url": None,
+         "title_is_related": False, "title_similarity": 0.0, "title_found_terms": []}
+        for i, title in enumerate(list(_corpus()["title"])[:20])
+    ]
+    scraper.process_press_releases_headless(releases, max_pdfs=len(releases))
+
+    def run():
+        scraper.scraped_data = []
+        scraper.process_press_releases_headless(releases, max_pdfs=len(releases))
+    return run
+
+
+@benchmark("press_release_screening")
+def bench_press_release_screening(server):
+    # 20 long circulars unrelated to the topic: screened on their first pages, read through Range requests
+    from backend.rbi_scraping import RBINewsTopicScraperHeadless
+    scraper = RBINewsTopicScraperHeadless(download_folder=tempfile.mkdtemp(prefix="fnd-bench-pdfs-"), news_topic=NEWS_TEXT)
+    releases = [
+        {"date": "N/A", "title": f"Portfolio disclosure circular {i}", "pdf_url": server.url(f"pdf/circular.pdf?n={i}"),
+         "detail_url": None, "title_is_related": False, "title_similarity": 0.0, "title_found_terms": []}
+        for i in range(20)
+    ]
+
+    scraper.ledger = None
+
+    def run():
+        scraper.scraped_data = []
+        scraper.process_press_releases_headless(releases, max_pdfs=len(releases))
+    return run
+
+
+@benchmark("run_rag_pipeline")
+def bench_run_rag_pipeline(server):
+    from backend.rag_pipeline import run_rag_pipeline
+    links = [server.url(p) for p in ARTICLE_PATHS]
+    return lambda: run_rag_pipeline(NEWS_TEXT, links)
+
+
+def measure(fn, iterations, warmup):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+    ms = np.array(samples) * 1000
+    return {
+        "iterations": iterations,
+        "throughput_per_s": iterations / total if total else float("inf"),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "min_ms": float(ms.min()),
+        "max_ms": float(ms.max()),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except Exception:
+        return None
+
+
+def run_suite(names=None, iterations=20, warmup=2):
+    from backend.resources import install_resources
+    install_resources(fake_resources())
+    results = {}
+    with FixtureServer() as server:
+        for name, setup in BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            # Silence the print() calls inside the pipeline while timing
+            stdout, sys.stdout = sys.stdout, io.StringIO()
+            try:
+                results[name] = measure(setup(server), iterations, warmup)
+            except ImportError as e:
+                results[name] = {"skipped": f"missing dependency: {e}"}
+            finally:
+                sys.stdout = stdout
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "iterations": iterations,
+            "warmup": warmup,
+        },
+        "results": results,
+    }
+
+
+def print_report(report, baseline=None):
+    base = (baseline or {}).get("results", {})
+    print(f"{'benchmark':<26}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'p50 vs base':>14}")
+    for name, r in report["results"].items():
+        if "skipped" in r:
+            print(f"{name:<26}skipped ({r['skipped']})")
+            continue
+        delta = ""
+        if name in base and "p50_ms" in base[name] and base[name]["p50_ms"]:
+            delta = f"{(r['p50_ms'] / base[name]['p50_ms'] - 1) * 100:+.1f}%"
+        print(f"{name:<26}{r['throughput_per_s']:>10.1f}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}{delta:>14}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the offline pipeline benchmarks")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--only", default="", help="comma-separated benchmark names")
+    parser.add_argument("--output", help="write machine-readable results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    parser.add_argument("--list", action="store_true", help="list benchmark names and exit")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return
+    names = {n.strip() for n in args.only.split(",") if n.strip()} or None
+    report = run_suite(names, iterations=args.iterations, warmup=args.warmup)
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
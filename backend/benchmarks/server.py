@@ -0,0 +1,151 @@
+"""
+Local HTTP stand-in for the news sites and regulator PDFs used by the benchmarks.
+
+Serves the recorded pages under fixtures/ and a generated press-release PDF,
+so every benchmark runs without network access.
+"""
+import os
+import re
+import hashlib
+import threading
+import textwrap
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+PRESS_RELEASE_PAGES = [
+    "RESERVE BANK OF INDIA - PRESS RELEASE. Liquidity management: discontinuation of daily variable rate repo "
+    "auctions. In view of the prevailing liquidity conditions, with surplus liquidity in the banking system "
+    "estimated at about Rs 2.45 lakh crore as on June 8, 2025, it has been decided to discontinue the daily "
+    "variable rate repo (VRR) operations with effect from June 10, 2025.",
+    "The Reserve Bank will continue to monitor liquidity and financial market conditions and will take measures "
+    "as appropriate. The fortnightly main operation under the revised liquidity management framework will "
+    "continue. Market participants may refer to the circular on the revised framework for details of the "
+    "standing deposit facility and the marginal standing facility.",
+    "This press release is issued for public information. Chief General Manager, Department of Communication. "
+    "Press Release: 2025-2026/512.",
+]
+
+# A long circular with nothing in common with the benchmark news topic
+CIRCULAR_TEXT = (
+    "Asset management companies shall publish the portfolio of each scheme on their websites within ten "
+    "working days of the close of each month, in the format specified in the annexure. The disclosure shall "
+    "include the name of each security, its quantity, the market value and the percentage of net assets. "
+    "Trustees shall ensure that the disclosures are uploaded on time and that investors are informed by "
+    "email of the link to the published portfolio. "
+)
+CIRCULAR_PAGES = [f"Page {n}. " + CIRCULAR_TEXT * 4 for n in range(1, 241)]
+RANGE = re.compile(r"bytes=(\d+)-(\d*)$")
+
+
+def _escape_pdf_text(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(pages, line_width=90):
+    """Build a small text-only PDF with one page per entry of `pages`"""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for text in pages:
+        lines = textwrap.wrap(text, line_width) or [""]
+        body = "BT /F1 10 Tf 14 TL 50 790 Td " + " ".join(f"({_escape_pdf_text(line)}) Tj T*" for line in lines) + " ET"
+        stream = body.encode("latin-1", "replace")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream.decode('latin-1')}\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Resources << /Font << /F1 3 0 R >> >> "
+            f"/Contents {content_id} 0 R >>"
+        )
+        page_ids.append(len(objects))
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    return bytes(out)
+
+
+class _FixtureHandler(SimpleHTTPRequestHandler):
+    pdfs = {"/pdf/press_release.pdf": make_pdf(PRESS_RELEASE_PAGES), "/pdf/circular.pdf": make_pdf(CIRCULAR_PAGES)}
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path.startswith("/feeds/"):
+            return self._send_feed(path)
+        pdf = self.pdfs.get(path)
+        if pdf is None:
+            return super().do_GET()
+        self._send_pdf(pdf)
+
+    def _send_pdf(self, pdf):
+        # Honour single byte ranges like the regulator sites' web servers do
+        etag = '"' + hashlib.sha1(pdf).hexdigest() + '"'
+        match = RANGE.match(self.headers.get("Range", ""))
+        if match and self.headers.get("If-Range", etag) == etag:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(pdf) - 1), len(pdf) - 1)
+            body = pdf[start:end + 1]
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(pdf)}")
+        else:
+            body = pdf
+            self.send_response(200)
+        self.send_header("Content-Type", "application/pdf")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_feed(self, path):
+        # Feed links point back at this server; answer conditional GETs like a real feed host
+        file_path = os.path.join(self.directory, path.lstrip("/"))
+        if not os.path.isfile(file_path):
+            return self.send_error(404)
+        last_modified = self.date_time_string(int(os.path.getmtime(file_path)))
+        if self.headers.get("If-Modified-Since") == last_modified:
+            self.send_response(304)
+            self.end_headers()
+            return
+        with open(file_path, encoding="utf-8") as f:
+            body = f.read().replace("{{BASE}}", f"http://127.0.0.1:{self.server.server_address[1]}").encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Last-Modified", last_modified)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Serve the fixtures directory on an ephemeral localhost port for the lifetime of a with-block"""
+
+    def __init__(self, directory=FIXTURES_DIR):
+        self.directory = directory
+        self.httpd = None
+        self.thread = None
+
+    def __enter__(self):
+        handler = partial(_FixtureHandler, directory=self.directory)
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/{path.lstrip('/')}"
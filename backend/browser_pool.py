@@ -0,0 +1,240 @@
+"""
+Pool of warm headless Chrome sessions shared by the news-site scrapers.
+Each search leases a session instead of starting Chrome, which costs
+seconds per launch:
+
+    with get_browser_pool().lease() as driver:
+        driver.get(...)
+
+The chromedriver binary is resolved once per process. A session is health
+checked before it is handed out, and replaced after BROWSER_MAX_USES leases
+or as soon as it stops responding, so a crashed Chrome never reaches a scraper.
+"""
+import time
+import uuid
+import logging
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.chrome.options import Options
+from webdriver_manager.chrome import ChromeDriverManager
+
+from backend import config
+from backend.metrics import BROWSER_RECYCLED
+from backend.resource_blocking import configure_options, block_resources, record_network_stats
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+@contextmanager
+def lease_deadline(deadline):
+    """Cap lease waits made by this thread at the time.monotonic() `deadline`"""
+    previous = getattr(_local, "deadline", None)
+    _local.deadline = deadline if previous is None else min(deadline, previous)
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+class BrowserSession:
+    def __init__(self, driver):
+        self.id = uuid.uuid4().hex[:8]
+        self.driver = driver
+        self.uses = 0
+        self.created_at = time.time()
+
+    def healthy(self):
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"Error quitting browser session {self.id}: {e}")
+
+
+class BrowserPool:
+    """
+    Bounded set of reusable Chrome sessions.
+
+    At most `size` browsers exist at once; a lease waits up to `lease_timeout`
+    seconds for one to become free, or less inside lease_deadline, and raises
+    TimeoutError otherwise.
+    """
+
+    def __init__(self, size=None, max_uses=None, lease_timeout=None, headless=True):
+        self.size = size or config.BROWSER_POOL_SIZE
+        self.max_uses = max_uses or config.BROWSER_MAX_USES
+        self.lease_timeout = config.BROWSER_LEASE_TIMEOUT if lease_timeout is None else lease_timeout
+        self.headless = headless
+        self._driver_path = None
+        self._driver_path_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._idle = []
+        self._open = 0
+        self._closed = False
+        self.leases = 0
+        self.created = 0
+
+    def _service(self):
+        if self._driver_path is None:
+            with self._driver_path_lock:
+                if self._driver_path is None:
+                    self._driver_path = ChromeDriverManager().install()
+        return Service(self._driver_path)
+
+    def _options(self):
+        options = Options()
+        if self.headless:
+            options.add_argument('--headless')
+        options.add_argument('--start-maximized')
+        return configure_options(options)
+
+    def _create(self):
+        driver = webdriver.Chrome(service=self._service(), options=self._options())
+        self.created += 1
+        session = BrowserSession(driver)
+        logger.info(f"Started browser session {session.id}")
+        return session
+
+    def _retire(self, session, reason):
+        BROWSER_RECYCLED.labels(reason).inc()
+        logger.info(f"Recycling browser session {session.id} after {session.uses} uses ({reason})")
+        session.quit()
+
+    def _discard(self, session, reason):
+        self._retire(session, reason)
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def _checkout(self):
+        start = time.monotonic()
+        deadline = start + self.lease_timeout
+        if getattr(_local, "deadline", None) is not None:
+            deadline = min(deadline, _local.deadline)
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Browser pool is closed")
+                if self._idle:
+                    session = self._idle.pop()
+                    self.leases += 1
+                    break
+                if self._open < self.size:
+                    self._open += 1
+                    self.leases += 1
+                    session = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No browser session free within {deadline - start:.1f}s")
+                self._cond.wait(remaining)
+
+        if session is not None:
+            if session.healthy():
+                return session
+            # Keep the slot and start a replacement in its place
+            self._retire(session, "crashed")
+        try:
+            return self._create()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+    def _checkin(self, session):
+        session.uses += 1
+        if session.uses >= self.max_uses:
+            self._discard(session, "max_uses")
+            return
+        try:
+            # Stop the last page's scripts from burning CPU while the session sits idle
+            session.driver.get("about:blank")
+        except Exception:
+            self._discard(session, "crashed")
+            return
+        with self._cond:
+            if self._closed:
+                self._open -= 1
+                session.quit()
+                return
+            self._idle.append(session)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, site=None):
+        """Borrow a driver for the duration of the with-block, with `site`'s resource blocking applied"""
+        session = self._checkout()
+        block_resources(session.driver, site)
+        try:
+            yield session.driver
+        finally:
+            record_network_stats(session.driver, site)
+            self._checkin(session)
+
+    def warm(self, count=None):
+        """Start up to `count` sessions ahead of the first search"""
+        count = min(self.size, self.size if count is None else count)
+        sessions = []
+        try:
+            for _ in range(count):
+                sessions.append(self._checkout())
+        finally:
+            for session in sessions:
+                with self._cond:
+                    self._idle.append(session)
+                    self._cond.notify()
+        return len(sessions)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for session in idle:
+            session.quit()
+
+    def stats(self):
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "size": self.size,
+                "open": self._open,
+                "idle": idle,
+                "in_use": self._open - idle,
+                "leases": self.leases,
+                "created": self.created,
+                "max_uses": self.max_uses,
+            }
+
+
+_browser_pool = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    global _browser_pool
+    if _browser_pool is None:
+        with _browser_pool_lock:
+            if _browser_pool is None:
+                _browser_pool = BrowserPool()
+    return _browser_pool
+
+
+def close_browser_pool():
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is not None:
+            _browser_pool.close()
+            _browser_pool = None
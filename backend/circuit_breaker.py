@@ -0,0 +1,161 @@
+"""
+Circuit breakers for the search sources and article domains we depend on.
+
+A breaker trips open after a run of consecutive failures (exceptions, or calls
+slower than slow_after seconds). While open, calls fail at once with
+CircuitOpen instead of waiting out timeouts against a site that is down or
+has changed its markup. After reset_timeout one probe call is let through
+half-open: success closes the breaker, failure opens it again. Each breaker's
+state is exported as fnd_circuit_state (0 closed, 1 half-open, 2 open).
+
+A breaker only sees failures that are raised, so functions run through one
+(the scrapers' browser searches, for instance) log and re-raise errors
+instead of returning an empty result.
+"""
+import time
+import asyncio
+import logging
+import threading
+
+from backend import config
+from backend.metrics import CIRCUIT_STATE, CIRCUIT_REJECTED
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpen(Exception):
+    def __init__(self, breaker):
+        super().__init__(f"{breaker.kind} {breaker.name} is unavailable, retrying after {breaker.retry_in():.0f}s")
+        self.breaker = breaker
+
+
+class CircuitBreaker:
+    def __init__(self, kind, name, failure_threshold, reset_timeout, slow_after=None, ignore=()):
+        self.kind = kind
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.slow_after = slow_after
+        # Exceptions that mean the remote end answered, so they do not count against it
+        self.ignore = ignore
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+        CIRCUIT_STATE.labels(kind, name).set(STATE_VALUES[CLOSED])
+
+    def _set_state(self, state):
+        if state != self.state:
+            logger.warning(f"Circuit for {self.kind} {self.name} is now {state}")
+        self.state = state
+        CIRCUIT_STATE.labels(self.kind, self.name).set(STATE_VALUES[state])
+
+    def retry_in(self):
+        if self.state != OPEN:
+            return 0.0
+        return max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0)
+
+    def allow(self):
+        """Whether a call may go ahead now; a True in half-open state makes the caller the probe"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self.probing:
+                self.probing = True
+                return True
+        CIRCUIT_REJECTED.labels(self.kind, self.name).inc()
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.probing = False
+            self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.probing = False
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def _record(self, started, error=None):
+        if error is not None and not isinstance(error, self.ignore):
+            self.record_failure()
+        elif self.slow_after is not None and time.monotonic() - started > self.slow_after:
+            self.record_failure()
+        else:
+            self.record_success()
+
+    def call(self, fn, *args, **kwargs):
+        """Run fn through the breaker, raising CircuitOpen while it is open"""
+        if not self.allow():
+            raise CircuitOpen(self)
+        started = time.monotonic()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._record(started, e)
+            raise
+        self._record(started)
+        return result
+
+    async def acall(self, fn, *args, **kwargs):
+        """Async form of call(); fn is a coroutine function"""
+        if not self.allow():
+            raise CircuitOpen(self)
+        started = time.monotonic()
+        try:
+            result = await fn(*args, **kwargs)
+        except asyncio.CancelledError:
+            # Says nothing about the remote end; just let another caller probe
+            with self._lock:
+                self.probing = False
+            raise
+        except Exception as e:
+            self._record(started, e)
+            raise
+        self._record(started)
+        return result
+
+    def stats(self):
+        return {"state": self.state, "failures": self.failures, "retry_in": round(self.retry_in(), 1)}
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(kind, name, **overrides):
+    """Shared breaker for one source or domain; settings come from config unless overridden on first use"""
+    key = (kind, name)
+    breaker = _breakers.get(key)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(key)
+            if breaker is None:
+                settings = {
+                    "failure_threshold": config.BREAKER_FAILURES,
+                    "reset_timeout": config.BREAKER_RESET_TIMEOUT,
+                    **overrides,
+                }
+                breaker = _breakers[key] = CircuitBreaker(kind, name, **settings)
+    return breaker
+
+
+def breaker_stats():
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    stats = {}
+    for breaker in breakers:
+        stats.setdefault(breaker.kind, {})[breaker.name] = breaker.stats()
+    return stats
@@ -0,0 +1,137 @@
+# Centralized backend settings, overridable through environment variables
+import os
+
+
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+def _env_float(name, default):
+    return float(os.environ.get(name, default))
+
+
+def _env_bool(name, default):
+    return os.environ.get(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+# Models
+EMBEDDING_MODEL = os.environ.get("FND_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+LLM_MODEL = os.environ.get("FND_LLM_MODEL", "llama3")
+
+# Retrieval
+CHUNK_SIZE = _env_int("FND_CHUNK_SIZE", 1000)
+CHUNK_OVERLAP = _env_int("FND_CHUNK_OVERLAP", 200)
+RETRIEVER_K = _env_int("FND_RETRIEVER_K", 2)
+
+# Execution layer
+SCRAPE_WORKERS = _env_int("FND_SCRAPE_WORKERS", 4)
+EMBED_WORKERS = _env_int("FND_EMBED_WORKERS", 2)
+GENERATE_WORKERS = _env_int("FND_GENERATE_WORKERS", 2)
+MAX_CONCURRENT_VERIFICATIONS = _env_int("FND_MAX_CONCURRENT_VERIFICATIONS", 4)
+MAX_QUEUED_VERIFICATIONS = _env_int("FND_MAX_QUEUED_VERIFICATIONS", 16)
+RETRY_AFTER_SECONDS = _env_int("FND_RETRY_AFTER_SECONDS", 10)
+# A batch is charged one verification slot per this many texts that miss the verdict cache
+BATCH_TEXTS_PER_SLOT = _env_int("FND_BATCH_TEXTS_PER_SLOT", 5)
+
+# Browser pool for the Selenium scrapers
+BROWSER_POOL_SIZE = _env_int("FND_BROWSER_POOL_SIZE", 2)
+BROWSER_MAX_USES = _env_int("FND_BROWSER_MAX_USES", 50)
+BROWSER_LEASE_TIMEOUT = _env_float("FND_BROWSER_LEASE_TIMEOUT", 60.0)
+BROWSER_POOL_WARM = _env_int("FND_BROWSER_POOL_WARM", 0)
+BLOCK_RESOURCES = _env_bool("FND_BLOCK_RESOURCES", True)
+BLOCK_RESOURCE_TYPES = [t.strip() for t in os.environ.get("FND_BLOCK_RESOURCE_TYPES", "image,font,stylesheet,media").split(",") if t.strip()]
+BLOCK_TRACKERS = _env_bool("FND_BLOCK_TRACKERS", True)
+BLOCK_EXTRA_PATTERNS = [p.strip() for p in os.environ.get("FND_BLOCK_EXTRA_PATTERNS", "").split(",") if p.strip()]
+BROWSER_NETWORK_STATS = _env_bool("FND_BROWSER_NETWORK_STATS", True)
+
+# Search fan-out
+SEARCH_SOURCES = [s.strip() for s in os.environ.get("FND_SEARCH_SOURCES", "et,bbc,hindu").split(",") if s.strip()]
+SEARCH_SOURCE_DEADLINE = _env_float("FND_SEARCH_SOURCE_DEADLINE", 30.0)
+SEARCH_BUDGET = _env_float("FND_SEARCH_BUDGET", 40.0)
+
+# Circuit breakers: search sources, and article domains (which see more traffic)
+BREAKER_FAILURES = _env_int("FND_BREAKER_FAILURES", 3)
+BREAKER_RESET_TIMEOUT = _env_float("FND_BREAKER_RESET_TIMEOUT", 60.0)
+DOMAIN_BREAKER_FAILURES = _env_int("FND_DOMAIN_BREAKER_FAILURES", 5)
+DOMAIN_BREAKER_RESET_TIMEOUT = _env_float("FND_DOMAIN_BREAKER_RESET_TIMEOUT", 120.0)
+
+# Plain-HTTP search fast path
+HTTP_SEARCH = _env_bool("FND_HTTP_SEARCH", True)
+HTTP_TIMEOUT = _env_float("FND_HTTP_TIMEOUT", 10.0)
+HTTP_POOL_CONNECTIONS = _env_int("FND_HTTP_POOL_CONNECTIONS", 10)
+HTTP_POOL_MAXSIZE = _env_int("FND_HTTP_POOL_MAXSIZE", 20)
+
+# Article fetching
+FETCH_MAX_CONNECTIONS = _env_int("FND_FETCH_MAX_CONNECTIONS", 32)
+FETCH_PER_HOST = _env_int("FND_FETCH_PER_HOST", 4)
+FETCH_TIMEOUT = _env_float("FND_FETCH_TIMEOUT", 15.0)
+FETCH_CONNECT_TIMEOUT = _env_float("FND_FETCH_CONNECT_TIMEOUT", 5.0)
+FETCH_TOTAL_TIMEOUT = _env_float("FND_FETCH_TOTAL_TIMEOUT", 25.0)
+FETCH_MAX_BYTES = _env_int("FND_FETCH_MAX_BYTES", 5 * 1024 * 1024)
+
+# Per-host fetch scheduling shared by every fetcher; rate is requests per second
+FETCH_HOST_RATE = _env_float("FND_FETCH_HOST_RATE", 4.0)
+FETCH_HOST_BURST = _env_int("FND_FETCH_HOST_BURST", 8)
+FETCH_HOST_CONCURRENCY = _env_int("FND_FETCH_HOST_CONCURRENCY", 4)
+FETCH_RETRIES = _env_int("FND_FETCH_RETRIES", 2)
+FETCH_BACKOFF_BASE = _env_float("FND_FETCH_BACKOFF_BASE", 0.5)
+FETCH_BACKOFF_MAX = _env_float("FND_FETCH_BACKOFF_MAX", 10.0)
+# Longest a scraper browser waits for an element instead of sleeping a fixed time
+BROWSER_WAIT_TIMEOUT = _env_float("FND_BROWSER_WAIT_TIMEOUT", 15.0)
+
+# RBI/SEBI press-release PDFs: concurrent downloads, extraction and scoring in worker processes
+PDF_DOWNLOAD_WORKERS = _env_int("FND_PDF_DOWNLOAD_WORKERS", 8)
+PDF_EXTRACT_WORKERS = _env_int("FND_PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1))
+# Releases whose first pages show no sign of the topic are rejected without extracting the rest;
+# 0 extracts every page of every release
+PDF_SCREEN_PAGES = _env_int("FND_PDF_SCREEN_PAGES", 3)
+# Block size of HTTP Range reads while screening; 0 always downloads the whole PDF
+PDF_RANGE_BLOCK = _env_int("FND_PDF_RANGE_BLOCK", 64 * 1024)
+
+# Ledger of scraped RBI/SEBI releases; known releases are re-downloaded only after the recheck interval
+SCRAPE_LEDGER = _env_bool("FND_SCRAPE_LEDGER", True)
+SCRAPE_RECHECK_SECONDS = _env_int("FND_SCRAPE_RECHECK_SECONDS", 7 * 24 * 60 * 60)
+
+# Background news ingestion and the local index it feeds
+INGEST_ENABLED = _env_bool("FND_INGEST_ENABLED", True)
+INGEST_FEEDS = [f.strip() for f in os.environ.get("FND_INGEST_FEEDS", ",".join([
+    "https://economictimes.indiatimes.com/rssfeedstopstories.cms",
+    "https://economictimes.indiatimes.com/markets/rssfeeds/1977021501.cms",
+    "https://economictimes.indiatimes.com/news/economy/rssfeeds/1373380680.cms",
+    "https://feeds.bbci.co.uk/news/business/rss.xml",
+    "https://feeds.bbci.co.uk/news/world/asia/india/rss.xml",
+    "https://www.thehindu.com/business/feeder/default.rss",
+    "https://www.thehindu.com/news/national/feeder/default.rss",
+    "https://www.thehindu.com/sitemap/googlenews/all/all.xml",
+])).split(",") if f.strip()]
+INGEST_INTERVAL = _env_int("FND_INGEST_INTERVAL", 10 * 60)
+INGEST_MAX_PER_FEED = _env_int("FND_INGEST_MAX_PER_FEED", 20)
+# Squared L2 distance between unit embeddings, so 0.8 is roughly cosine similarity 0.6
+INDEX_MAX_DISTANCE = _env_float("FND_INDEX_MAX_DISTANCE", 0.8)
+INDEX_MIN_HITS = _env_int("FND_INDEX_MIN_HITS", 2)
+INDEX_MAX_AGE = _env_int("FND_INDEX_MAX_AGE", 3 * 24 * 60 * 60)
+
+# Caches
+CACHE_DIR = os.environ.get("FND_CACHE_DIR", "./fnd_cache")
+VERDICT_CACHE_TTL = _env_int("FND_VERDICT_CACHE_TTL", 6 * 60 * 60)
+VERDICT_CACHE_MEMORY_SIZE = _env_int("FND_VERDICT_CACHE_MEMORY_SIZE", 1024)
+VERDICT_CACHE_DISK_SIZE = _env_int("FND_VERDICT_CACHE_DISK_SIZE", 50000)
+SEMANTIC_CACHE_THRESHOLD = _env_float("FND_SEMANTIC_CACHE_THRESHOLD", 0.92)
+SEMANTIC_CACHE_SIZE = _env_int("FND_SEMANTIC_CACHE_SIZE", 2048)
+SEARCH_CACHE_TTL = _env_int("FND_SEARCH_CACHE_TTL", 30 * 60)
+SEARCH_CACHE_NEGATIVE_TTL = _env_int("FND_SEARCH_CACHE_NEGATIVE_TTL", 5 * 60)
+ARTICLE_STORE_MAX_BYTES = _env_int("FND_ARTICLE_STORE_MAX_BYTES", 256 * 1024 * 1024)
+ARTICLE_FRESH_SECONDS = _env_int("FND_ARTICLE_FRESH_SECONDS", 15 * 60)
+MAX_BATCH_SIZE = _env_int("FND_MAX_BATCH_SIZE", 50)
+
+# Job queue
+JOB_DB_PATH = os.environ.get("FND_JOB_DB_PATH", os.path.join(CACHE_DIR, "jobs.sqlite3"))
+JOB_LEASE_SECONDS = _env_int("FND_JOB_LEASE_SECONDS", 120)
+JOB_MAX_ATTEMPTS = _env_int("FND_JOB_MAX_ATTEMPTS", 3)
+JOB_POLL_INTERVAL = _env_float("FND_JOB_POLL_INTERVAL", 1.0)
+JOB_WORKERS = _env_int("FND_JOB_WORKERS", 2)
+# A worker that dies sooner than this after starting is restarted with exponential backoff
+JOB_RESTART_MIN_UPTIME = _env_int("FND_JOB_RESTART_MIN_UPTIME", 60)
+JOB_RESTART_MAX_BACKOFF = _env_int("FND_JOB_RESTART_MAX_BACKOFF", 300)
+# Consecutive early deaths after which a worker slot is given up (0 restarts forever)
+JOB_MAX_RESTARTS = _env_int("FND_JOB_MAX_RESTARTS", 10)
@@ -0,0 +1,157 @@
+"""
+Main-content extraction for news article pages.
+
+Sites we scrape regularly have explicit rules naming the article body and the
+widgets inside it to drop. Any other page goes through a small readability
+pass: strip page chrome, score blocks by the paragraph text they hold, and
+keep the best one. Both paths then remove known boilerplate sentences, such as
+the ETMarkets plug that ET appends to its articles.
+"""
+import re
+import logging
+from collections import namedtuple
+from urllib.parse import urlsplit
+
+from backend.metrics import BOILERPLATE_REMOVED_BYTES
+
+logger = logging.getLogger(__name__)
+
+# Bump when the extraction changes so stored articles are re-extracted
+EXTRACTOR_VERSION = 1
+
+SiteRule = namedtuple("SiteRule", ["content", "drop"])
+
+SITE_RULES = {
+    "economictimes.indiatimes.com": SiteRule(
+        content=["div.artText", "div.article_wrap div.artText"],
+        drop=[".inlineAd", ".relatedStories", ".comments"],
+    ),
+    "bbc.com": SiteRule(
+        content=['article [data-component="text-block"]'],
+        drop=["figure", '[data-component="links-block"]'],
+    ),
+    "bbc.co.uk": SiteRule(
+        content=['article [data-component="text-block"]'],
+        drop=["figure", '[data-component="links-block"]'],
+    ),
+    "thehindu.com": SiteRule(
+        content=["div.articlebodycontent"],
+        drop=[".related-topics", ".comments-shares", ".article-ad"],
+    ),
+}
+
+CHROME_TAGS = ["script", "style", "noscript", "template", "header", "footer", "nav", "aside", "form", "iframe", "button", "svg"]
+NEGATIVE_HINTS = re.compile(
+    r"comment|cookie|consent|promo|prime|related|share|social|footer|header|nav|sidebar|banner|trending|"
+    r"subscribe|newsletter|popup|modal|advert|sponsor|outbrain|taboola|breadcrumb|byline",
+    re.IGNORECASE,
+)
+BOILERPLATE_PATTERNS = [
+    re.compile(r"\(?What's moving Sensex and Nifty.*?(?:Telegram(?: feeds)?\.?\)?|$)", re.IGNORECASE | re.DOTALL),
+    re.compile(r"You are experiencing ETPrime for FREE.*?(?:and more!|$)", re.IGNORECASE | re.DOTALL),
+    re.compile(r"Subscribe to ET Prime and read the Economic Times ePaper Online\.?", re.IGNORECASE),
+    re.compile(r"Top Trending Stocks:[^.\n]*", re.IGNORECASE),
+]
+MIN_CONTENT_CHARS = 200
+
+Extraction = namedtuple("Extraction", ["text", "method", "original_bytes", "bytes_removed"])
+
+
+def _site_rule(url):
+    domain = (urlsplit(url).hostname or "").lower()
+    for site, rule in SITE_RULES.items():
+        if domain == site or domain.endswith("." + site):
+            return rule
+    return None
+
+
+def clean_text(text):
+    """Remove known boilerplate sentences and collapse blank runs"""
+    for pattern in BOILERPLATE_PATTERNS:
+        text = pattern.sub(" ", text)
+    lines = [re.sub(r"[ \t]+", " ", line).strip() for line in text.splitlines()]
+    return "\n\n".join(line for line in lines if line)
+
+
+def _block_text(nodes):
+    parts = []
+    for node in nodes:
+        paragraphs = node.find_all("p")
+        if paragraphs:
+            parts.extend(p.get_text(" ", strip=True) for p in paragraphs)
+        else:
+            parts.append(node.get_text(" ", strip=True))
+    return "\n".join(part for part in parts if part)
+
+
+def _apply_site_rule(soup, rule):
+    for selector in rule.drop:
+        for node in soup.select(selector):
+            node.decompose()
+    for selector in rule.content:
+        nodes = soup.select(selector)
+        if nodes:
+            return _block_text(nodes)
+    return ""
+
+
+def _link_density(node, text_length):
+    link_length = sum(len(a.get_text(strip=True)) for a in node.find_all("a"))
+    return link_length / text_length if text_length else 1.0
+
+
+def _readability(soup):
+    body = soup.body or soup
+    for tag in body.find_all(CHROME_TAGS):
+        tag.decompose()
+    for node in body.find_all(True):
+        if node.decomposed:
+            continue
+        hints = " ".join(node.get("class") or []) + " " + (node.get("id") or "")
+        if hints.strip() and NEGATIVE_HINTS.search(hints):
+            node.decompose()
+
+    scores = {}
+    for paragraph in body.find_all("p"):
+        text = paragraph.get_text(" ", strip=True)
+        if len(text) < 25:
+            continue
+        score = 1 + text.count(",") + min(len(text) // 100, 3)
+        parent = paragraph.parent
+        if parent is not None:
+            scores[parent] = scores.get(parent, 0) + score
+            if parent.parent is not None:
+                scores[parent.parent] = scores.get(parent.parent, 0) + score / 2
+    if not scores:
+        return ""
+    best = max(
+        scores,
+        key=lambda node: scores[node] * (1 - _link_density(node, len(node.get_text(strip=True)))),
+    )
+    return _block_text([best])
+
+
+def extract_main_content(soup, url):
+    """
+    Article text of a parsed page, with the bytes of page text it discarded.
+
+    The soup is modified in place. Falls back to the whole cleaned page text
+    when neither a site rule nor the readability pass finds enough content.
+    """
+    full_text = soup.get_text()
+    original_bytes = len(full_text.encode("utf-8"))
+
+    text, method = "", "fallback"
+    rule = _site_rule(url)
+    if rule is not None:
+        text, method = _apply_site_rule(soup, rule), "site"
+    if len(text) < MIN_CONTENT_CHARS:
+        text, method = _readability(soup), "readability"
+    text = clean_text(text)
+    if len(text) < MIN_CONTENT_CHARS:
+        text, method = clean_text(full_text), "fallback"
+
+    bytes_removed = max(original_bytes - len(text.encode("utf-8")), 0)
+    BOILERPLATE_REMOVED_BYTES.labels(method).observe(bytes_removed)
+    logger.info(f"Extracted {len(text)} chars from {url} via {method}, removed {bytes_removed} bytes")
+    return Extraction(text, method, original_bytes, bytes_removed)
@@ -11,6 +11,7 @@ import json
 from typing import List, Dict, Optional
 import glob
 from pathlib import Path
+from backend.metrics import time_stage
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -277,11 +278,12 @@ class CSVToVectorDB:
         embeddings = []
         for i in range(0, len(texts), batch_size):
             batch = texts[i:i + batch_size]
-            batch_embeddings = self.embedding_model.encode(
-                batch,
-                convert_to_numpy=True,
-                show_progress_bar=True if i == 0 else False
-            )
+            with time_stage("csv_embed"):
+                batch_embeddings = self.embedding_model.encode(
+                    batch,
+                    convert_to_numpy=True,
+                    show_progress_bar=True if i == 0 else False
+                )
             embeddings.append(batch_embeddings)
         
         embeddings = np.vstack(embeddings)
@@ -314,12 +316,13 @@ class CSVToVectorDB:
         for i in range(0, len(documents), batch_size):
             end_idx = min(i + batch_size, len(documents))
             
-            self.collection.add(
-                ids=ids[i:end_idx],
-                documents=texts[i:end_idx],
-                embeddings=embeddings[i:end_idx].tolist(),
-                metadatas=metadatas[i:end_idx]
-            )
+            with time_stage("vector_db_add"):
+                self.collection.add(
+                    ids=ids[i:end_idx],
+                    documents=texts[i:end_idx],
+                    embeddings=embeddings[i:end_idx].tolist(),
+                    metadatas=metadatas[i:end_idx]
+                )
             
             logger.info(f"Added batch {i//batch_size + 1}/{(len(documents)-1)//batch_size + 1}")
         
@@ -1,54 +1,83 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
+from urllib.parse import quote
+from backend import config
+from backend.metrics import timed, record_scraper_error, record_search_path
+from backend.browser_pool import get_browser_pool
+from backend.http_client import fetch_html
+from backend.fetch_scheduler import get_fetch_scheduler
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
 
-def get_et_links(search_term):
-    options = Options()
-    options.add_argument('--headless')  # Uncomment for headless mode
-    options.add_argument('--start-maximized')
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+def parse_et_links(results_html, limit=3):
+    """Pick article links out of the HTML of the #categorywiseTop results div"""
+    links = []
+    soup = BeautifulSoup(results_html, 'html.parser')
+    result_links = soup.find_all('a', href=True)
+
+    count = 0
+    for link in result_links:
+        href = link['href']
+        if "/news/" in href or href.startswith("https://economictimes.indiatimes.com"):
+            if not href.startswith("http"):
+                href = "https://economictimes.indiatimes.com" + href
+            links.append(href)
+            print(href)
+            count += 1
+            if count == limit:
+                break
+    return links
+
+@timed("search_et_http")
+def search_et_http(search_term):
+    """Fetch ET's topic page for the search term directly and parse its results div"""
+    query = "-".join(search_term.split())
+    soup = BeautifulSoup(fetch_html(f"https://economictimes.indiatimes.com/topic/{quote(query)}"), 'html.parser')
+    results = soup.find(id="categorywiseTop")
+    return parse_et_links(str(results)) if results else []
+
+def search_et_browser(search_term):
     links = []
-    try:
-        driver.get("https://economictimes.indiatimes.com/")
-        time.sleep(3)
-
-        # Wait for the search bar to be present and interactable
-        search_input = WebDriverWait(driver, 12).until(
-            EC.element_to_be_clickable((By.XPATH, '//*[@id="ticker_newsearch"]'))
-        )
-        search_input.clear()
-        search_input.send_keys(search_term)
-        search_input.send_keys(Keys.RETURN)
-        time.sleep(5)
-
-        # Locate the specific div using XPath
-        categorywise_top_div = driver.find_element(By.XPATH, '//*[@id="categorywiseTop"]')
-
-        # Parse only the HTML of that div
-        soup = BeautifulSoup(categorywise_top_div.get_attribute('innerHTML'), 'html.parser')
-        result_links = soup.find_all('a', href=True)
-
-        count = 0
-        for link in result_links:
-            href = link['href']
-            if "/news/" in href or href.startswith("https://economictimes.indiatimes.com"):
-                if not href.startswith("http"):
-                    href = "https://economictimes.indiatimes.com" + href
-                links.append(href)
-                print(href)
-                count += 1
-                if count == 3:
-                    break
-
-    except Exception as e:
-        print(f"❌ Error occurred: {e}")
-    finally:
-        driver.quit()
+    with get_browser_pool().lease("et") as driver:
+        try:
+            with get_fetch_scheduler().slot("https://economictimes.indiatimes.com/"):
+                driver.get("https://economictimes.indiatimes.com/")
+            wait = WebDriverWait(driver, config.BROWSER_WAIT_TIMEOUT)
+
+            # Wait for the search bar to be present and interactable
+            search_input = wait.until(
+                EC.element_to_be_clickable((By.XPATH, '//*[@id="ticker_newsearch"]'))
+            )
+            search_input.clear()
+            search_input.send_keys(search_term)
+            search_input.send_keys(Keys.RETURN)
+
+            # Wait for the specific results div rather than a fixed delay
+            categorywise_top_div = wait.until(
+                EC.presence_of_element_located((By.XPATH, '//*[@id="categorywiseTop"]'))
+            )
+
+            # Parse only the HTML of that div
+            links = parse_et_links(categorywise_top_div.get_attribute('innerHTML'))
+
+        except Exception as e:
+            record_scraper_error("et")
+            print(f"❌ Error occurred: {e}")
+            raise
     return links
+
+@timed("search_et")
+def get_et_links(search_term):
+    # Plain HTTP first; the browser only runs when that finds nothing
+    if config.HTTP_SEARCH:
+        try:
+            links = search_et_http(search_term)
+        except Exception as e:
+            print(f"⚠️ ET HTTP search failed, falling back to browser: {e}")
+            links = []
+        if links:
+            record_search_path("et", "http")
+            return links
+    record_search_path("et", "browser")
+    return search_et_browser(search_term)
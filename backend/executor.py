@@ -0,0 +1,160 @@
+import asyncio
+import functools
+import logging
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from backend import config
+
+logger = logging.getLogger(__name__)
+
+
+class Overloaded(Exception):
+    """Raised when the verification queue is full and the request should be retried later"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Verification queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class VerificationExecutor:
+    """
+    Runs the blocking pipeline stages off the event loop.
+
+    Each stage (scrape, embed, generate) gets its own sized thread pool so a
+    slow Selenium search cannot starve the LLM calls, and admission control
+    caps how many verifications run or wait at once. A single verification
+    holds one slot; a batch holds slots_for(uncached texts), so running counts
+    slots rather than requests.
+    """
+
+    def __init__(self, scrape_workers=None, embed_workers=None, generate_workers=None,
+                 max_concurrent=None, max_queued=None, retry_after=None):
+        self.pools = {
+            "scrape": ThreadPoolExecutor(max_workers=scrape_workers or config.SCRAPE_WORKERS, thread_name_prefix="scrape"),
+            "embed": ThreadPoolExecutor(max_workers=embed_workers or config.EMBED_WORKERS, thread_name_prefix="embed"),
+            "generate": ThreadPoolExecutor(max_workers=generate_workers or config.GENERATE_WORKERS, thread_name_prefix="generate"),
+        }
+        self.max_concurrent = max_concurrent or config.MAX_CONCURRENT_VERIFICATIONS
+        self.max_queued = config.MAX_QUEUED_VERIFICATIONS if max_queued is None else max_queued
+        self.retry_after = retry_after or config.RETRY_AFTER_SECONDS
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        # Multi-slot acquirers take their slots one at a time; only one may be
+        # gathering at once, so two batches cannot each hold half of the slots
+        self._gathering = asyncio.Lock()
+        self.running = 0
+        self.waiting = 0
+        self.rejected = 0
+
+    async def run(self, stage, fn, *args, **kwargs):
+        """Run a blocking callable in the pool for the given stage"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pools[stage], functools.partial(fn, *args, **kwargs))
+
+    async def iterate(self, stage, fn, *args, **kwargs):
+        """
+        Drive a blocking iterator in the stage's pool and yield its items on the event loop.
+
+        Closing the consumer (a client leaving an SSE stream) stops the
+        producer at its next item and closes the iterator, so the worker is
+        freed instead of reading an abandoned LLM stream to the end.
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        done = object()
+        abandoned = threading.Event()
+
+        def produce():
+            iterator = None
+            try:
+                iterator = iter(fn(*args, **kwargs))
+                for item in iterator:
+                    if abandoned.is_set():
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, (item, None))
+            except BaseException as e:
+                if not abandoned.is_set():
+                    loop.call_soon_threadsafe(queue.put_nowait, (done, e))
+            else:
+                loop.call_soon_threadsafe(queue.put_nowait, (done, None))
+            finally:
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    close()
+
+        future = loop.run_in_executor(self.pools[stage], produce)
+        try:
+            while True:
+                item, error = await queue.get()
+                if item is done:
+                    await future
+                    if error is not None:
+                        raise error
+                    return
+                yield item
+        finally:
+            abandoned.set()
+
+    def check_capacity(self):
+        """Raise Overloaded when a new verification would be turned away right now"""
+        if self.running >= self.max_concurrent and self.waiting >= self.max_queued:
+            self.rejected += 1
+            raise Overloaded(self.retry_after)
+
+    def slots_for(self, texts):
+        """Slots charged for a batch of this many uncached texts, between 1 and max_concurrent"""
+        return min(self.max_concurrent, max(1, math.ceil(texts / config.BATCH_TEXTS_PER_SLOT)))
+
+    async def acquire(self, slots=1):
+        """Take verification slots, waiting if needed, or raise Overloaded when the queue is full"""
+        self.check_capacity()
+        self.waiting += 1
+        try:
+            if slots == 1:
+                await self._slots.acquire()
+            else:
+                await self._gather(slots)
+        finally:
+            self.waiting -= 1
+        self.running += slots
+
+    async def _gather(self, slots):
+        taken = 0
+        try:
+            async with self._gathering:
+                for _ in range(slots):
+                    await self._slots.acquire()
+                    taken += 1
+        except BaseException:
+            for _ in range(taken):
+                self._slots.release()
+            raise
+
+    def release(self, slots=1):
+        self.running -= slots
+        for _ in range(slots):
+            self._slots.release()
+
+    @asynccontextmanager
+    async def admission(self, slots=1):
+        """Hold verification slots for the duration of the block, or raise Overloaded"""
+        await self.acquire(slots)
+        try:
+            yield
+        finally:
+            self.release(slots)
+
+    def stats(self):
+        return {
+            "running": self.running,
+            "waiting": self.waiting,
+            "rejected": self.rejected,
+            "max_concurrent": self.max_concurrent,
+            "max_queued": self.max_queued,
+        }
+
+    def shutdown(self, wait=False):
+        for pool in self.pools.values():
+            pool.shutdown(wait=wait, cancel_futures=True)
@@ -1,14 +1,71 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import logging
+from fastapi import FastAPI, HTTPException, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import List, Optional
 from pydantic import BaseModel
+from backend import config
 from fastapi.middleware.cors import CORSMiddleware
-from backend.rag_pipeline import run_rag_pipeline
-from backend.bbcscrape import get_bbc_links
-from backend.hinduscrape import get_hindu_links
-from backend.etscrape import get_et_links
+from starlette.routing import Match
+from backend.executor import VerificationExecutor, Overloaded
+from backend.metrics import IN_FLIGHT, VERIFICATIONS, CACHE_HIT_RATIO, BROWSER_SESSIONS, track_gauge, render_latest
+from backend.browser_pool import get_browser_pool, close_browser_pool
+from backend.resources import init_resources, current_resources
+from backend.job_queue import get_job_queue
+from backend.verdict_cache import get_verdict_cache
+from backend.semantic_cache import get_semantic_cache
+from backend.search_cache import get_search_cache
+from backend.article_store import get_article_store
+from backend.article_fetcher import close_article_fetcher
+from backend.news_ingest import NewsIngester
+from backend.circuit_breaker import breaker_stats
+from backend.verification import extract_keywords, verify_news, verify_news_events, verify_batch, flights
 #from backend.test1 import get_cnbc_links_only
-import re
 
-app = FastAPI()
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    app.state.executor = VerificationExecutor()
+    track_gauge(VERIFICATIONS, "running", lambda: app.state.executor.running)
+    track_gauge(VERIFICATIONS, "waiting", lambda: app.state.executor.waiting)
+    track_gauge(CACHE_HIT_RATIO, "verdict", lambda: get_verdict_cache().stats()["hit_ratio"])
+    track_gauge(CACHE_HIT_RATIO, "semantic", lambda: get_semantic_cache().stats()["hit_ratio"])
+    track_gauge(CACHE_HIT_RATIO, "search", lambda: get_search_cache().stats()["hit_ratio"])
+    track_gauge(BROWSER_SESSIONS, "idle", lambda: get_browser_pool().stats()["idle"])
+    track_gauge(BROWSER_SESSIONS, "in_use", lambda: get_browser_pool().stats()["in_use"])
+    # Load models and warm them up once, before the first request is served
+    try:
+        app.state.resources = await asyncio.to_thread(init_resources)
+    except Exception as e:
+        logger.error(f"Pipeline warm-up failed, /ready will report not ready: {e}")
+        app.state.resources = current_resources()
+        app.state.startup_error = str(e)
+    if config.BROWSER_POOL_WARM:
+        try:
+            await asyncio.to_thread(get_browser_pool().warm, config.BROWSER_POOL_WARM)
+        except Exception as e:
+            logger.warning(f"Could not pre-start browser sessions: {e}")
+    app.state.ingester = None
+    if config.INGEST_ENABLED:
+        app.state.ingester = NewsIngester()
+        app.state.ingest_task = asyncio.create_task(app.state.ingester.run())
+    yield
+    if app.state.ingester is not None:
+        app.state.ingest_task.cancel()
+        try:
+            await app.state.ingest_task
+        except asyncio.CancelledError:
+            pass
+    app.state.executor.shutdown()
+    await close_article_fetcher()
+    await asyncio.to_thread(close_browser_pool)
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,32 +75,127 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def route_template(scope):
+    # Label by route template rather than raw path so job ids do not explode the label set
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+@app.middleware("http")
+async def track_in_flight(request: Request, call_next):
+    with IN_FLIGHT.labels(route_template(request.scope)).track_inprogress():
+        return await call_next(request)
+
 class Message(BaseModel):
     text: str
 
-def extract_keywords(text):
-    stopwords = {"the", "is", "in","headline", "at", "of", "on", "and", "a", "to", "after", "has", "with", "for", "by", "an", "as", "it", "from", "this", "that", "be", "are", "was", "were", "or", "but", "not", "which", "have", "had", "will", "would", "can", "could", "should", "may", "might", "do", "does", "did", "so", "such", "if", "then", "than", "also", "their", "its", "about", "into", "more", "other", "some", "any", "all", "no", "only", "over", "out", "up", "down", "off", "just", "now", "like", "because", "how", "when", "where", "who", "what", "why"}
-    words = re.findall(r"\w+", text)
-    keywords = [word for word in words if word.lower() not in stopwords]
-    
-    return " ".join(keywords[:10])
+class BatchMessage(BaseModel):
+    texts: List[str]
 
 @app.post("/run_rag_pipeline/")
 async def analyze_news(msg: Message):
-    # Extract keywords from the news text
-    keywords = extract_keywords(msg.text)
-    # Only start scraping when the endpoint is called (i.e., when the extension button is clicked)
-    et_links = get_et_links(keywords)  # ET scraping only runs now
-    #cnbc_links=get_cnbc_links_only(keywords) 
-    #bbc_links = get_bbc_links(keywords)
-    #hindu_links = get_hindu_links(keywords)
-    all_links =  et_links#bbc_links + hindu_links 
-    # Run the RAG pipeline with the provided news text and links
-    result = run_rag_pipeline(msg.text, all_links)
-    return result
+    # Scraping and the LLM call run in worker pools so one slow request does not block the others
+    try:
+        async with app.state.executor.admission():
+            return await verify_news(msg.text, app.state.executor)
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/run_rag_pipeline/stream")
+async def analyze_news_stream(msg: Message):
+    # Same pipeline as /run_rag_pipeline/, reported as server-sent events while it runs
+    executor = app.state.executor
+    try:
+        executor.check_capacity()
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+    async def events():
+        # The slot is taken once the body starts, so a client gone before then holds nothing
+        try:
+            async with executor.admission():
+                async for event, data in verify_news_events(msg.text, executor):
+                    yield format_sse(event, data)
+        except Exception as e:
+            logger.error(f"Streaming verification failed: {e}")
+            yield format_sse("error", {"error": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.post("/run_rag_pipeline/batch")
+async def analyze_news_batch(msg: BatchMessage):
+    if len(msg.texts) > config.MAX_BATCH_SIZE:
+        raise HTTPException(status_code=422, detail=f"At most {config.MAX_BATCH_SIZE} texts per batch")
+    # verify_batch takes admission slots in proportion to the texts that miss the verdict cache
+    try:
+        results = await verify_batch(msg.texts, app.state.executor)
+    except Overloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    return {"results": results}
+
+@app.post("/jobs", status_code=202)
+async def submit_job(msg: Message):
+    # Durable alternative to /run_rag_pipeline/: the verdict is produced by `python -m backend.worker`
+    job_id = await asyncio.to_thread(get_job_queue().submit, msg.text)
+    return {"job_id": job_id, "status": "queued"}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await asyncio.to_thread(get_job_queue().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
 @app.get("/")
 async def read_message():
     return {"status": "RAG backend is running"}
 
+@app.get("/cache/stats")
+async def cache_stats():
+    return {
+        "verdicts": get_verdict_cache().stats(),
+        "semantic": get_semantic_cache().stats(),
+        "searches": get_search_cache().stats(),
+        "articles": get_article_store().stats(),
+        "coalesced": flights.stats(),
+        "ingest": app.state.ingester.stats() if app.state.ingester is not None else None,
+    }
+
+@app.delete("/cache/search")
+async def invalidate_search_cache(source: Optional[str] = None):
+    # Without ?source= every cached search is dropped
+    removed = await asyncio.to_thread(get_search_cache().invalidate, source)
+    return {"source": source, "removed": removed}
+
+@app.get("/cache/semantic")
+async def semantic_cache_audit():
+    return {"entries": get_semantic_cache().audit()}
+
+@app.get("/circuits")
+async def circuits():
+    return breaker_stats()
+
+@app.get("/metrics")
+async def metrics():
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+@app.get("/ready")
+async def readiness():
+    resources = getattr(app.state, "resources", None)
+    if resources is not None:
+        status = resources.status()
+    else:
+        status = {"ready": False, "error": getattr(app.state, "startup_error", None)}
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
+
 
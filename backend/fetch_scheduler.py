@@ -0,0 +1,207 @@
+"""
+Host-aware scheduling for every outbound fetch in the backend.
+
+Each host gets a token bucket (sustained requests per second plus a burst) and
+a cap on concurrent requests. Sync callers (requests, Selenium) and async
+callers (aiohttp) share the same per-host state, so a site sees one combined
+request rate however many code paths are fetching from it. Connection errors,
+timeouts and 429/5xx responses are retried with exponential backoff and full
+jitter, honouring Retry-After. The time each fetch waited for its turn is
+exported as fnd_fetch_queue_wait_seconds.
+"""
+import time
+import random
+import asyncio
+import logging
+import threading
+from collections import namedtuple
+from contextlib import contextmanager, asynccontextmanager
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import aiohttp
+import requests
+
+from backend import config
+from backend.metrics import FETCH_QUEUE_WAIT, FETCH_RETRIES
+
+logger = logging.getLogger(__name__)
+
+HostPolicy = namedtuple("HostPolicy", ["rate", "burst", "concurrency"])
+
+# Hosts that need gentler pacing than the defaults
+HOST_POLICIES = {
+    "rbi.org.in": HostPolicy(rate=2.0, burst=3, concurrency=2),
+    "sebi.gov.in": HostPolicy(rate=1.0, burst=2, concurrency=2),
+}
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+TRANSIENT_ERRORS = (requests.ConnectionError, requests.Timeout, aiohttp.ClientConnectionError, asyncio.TimeoutError)
+
+# How long a caller at the concurrency cap sleeps before checking again
+SLOT_POLL_INTERVAL = 0.05
+
+
+class RetryableStatus(Exception):
+    def __init__(self, url, status, retry_after=None):
+        super().__init__(f"HTTP {status} from {url}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(value):
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def check_status(url, status, headers):
+    """Raise RetryableStatus for responses worth retrying; anything else is left to the caller"""
+    if status in RETRY_STATUSES:
+        raise RetryableStatus(url, status, _retry_after_seconds(headers.get("Retry-After")))
+
+
+def url_host(url):
+    return (urlsplit(url).hostname or "").lower()
+
+
+class _HostState:
+    def __init__(self, policy, now):
+        self.policy = policy
+        self.tokens = float(policy.burst)
+        self.updated = now
+        self.active = 0
+
+
+class FetchScheduler:
+    def __init__(self, rate=None, burst=None, concurrency=None, retries=None, backoff_base=None, backoff_max=None):
+        self.default_policy = HostPolicy(
+            rate=rate or config.FETCH_HOST_RATE,
+            burst=burst or config.FETCH_HOST_BURST,
+            concurrency=concurrency or config.FETCH_HOST_CONCURRENCY,
+        )
+        self.retries = config.FETCH_RETRIES if retries is None else retries
+        self.backoff_base = backoff_base or config.FETCH_BACKOFF_BASE
+        self.backoff_max = backoff_max or config.FETCH_BACKOFF_MAX
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def policy(self, host):
+        for site, policy in HOST_POLICIES.items():
+            if host == site or host.endswith("." + site):
+                return policy
+        return self.default_policy
+
+    def _try_acquire(self, host):
+        # 0 means the slot is ours; otherwise how long to sleep before asking again
+        with self._lock:
+            # Read under the lock, so `updated` is never ahead of it and no tokens are lost
+            now = time.monotonic()
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.policy(host), now)
+            policy = state.policy
+            state.tokens = min(policy.burst, state.tokens + (now - state.updated) * policy.rate)
+            state.updated = now
+            if state.active >= policy.concurrency:
+                return SLOT_POLL_INTERVAL
+            if state.tokens < 1:
+                return (1 - state.tokens) / policy.rate
+            state.tokens -= 1
+            state.active += 1
+            return 0
+
+    def _release(self, host):
+        with self._lock:
+            self._hosts[host].active -= 1
+
+    @contextmanager
+    def slot(self, url):
+        """Hold one of the host's request slots for the enclosed fetch"""
+        host = url_host(url)
+        start = time.perf_counter()
+        while delay := self._try_acquire(host):
+            time.sleep(delay)
+        FETCH_QUEUE_WAIT.labels(host).observe(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    @asynccontextmanager
+    async def aslot(self, url):
+        """Async form of slot()"""
+        host = url_host(url)
+        start = time.perf_counter()
+        while delay := self._try_acquire(host):
+            await asyncio.sleep(delay)
+        FETCH_QUEUE_WAIT.labels(host).observe(time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release(host)
+
+    def backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential delay before retry number attempt + 1"""
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def _retry_delay(self, url, error, attempt):
+        reason = f"http_{error.status}" if isinstance(error, RetryableStatus) else type(error).__name__
+        FETCH_RETRIES.labels(url_host(url), reason).inc()
+        delay = self.backoff(attempt, getattr(error, "retry_after", None))
+        logger.info(f"Retrying {url} in {delay:.2f}s after {reason} (attempt {attempt + 1}/{self.retries})")
+        return delay
+
+    def call(self, url, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) in a slot for url's host, retrying transient failures"""
+        for attempt in range(self.retries + 1):
+            try:
+                with self.slot(url):
+                    return fn(*args, **kwargs)
+            except (RetryableStatus,) + TRANSIENT_ERRORS as e:
+                if attempt == self.retries:
+                    raise
+                delay = self._retry_delay(url, e, attempt)
+            time.sleep(delay)
+
+    async def acall(self, url, fn, *args, **kwargs):
+        """Async form of call(); fn is a coroutine function"""
+        for attempt in range(self.retries + 1):
+            try:
+                async with self.aslot(url):
+                    return await fn(*args, **kwargs)
+            except (RetryableStatus,) + TRANSIENT_ERRORS as e:
+                if attempt == self.retries:
+                    raise
+                delay = self._retry_delay(url, e, attempt)
+            await asyncio.sleep(delay)
+
+    def stats(self):
+        with self._lock:
+            return {
+                host: {"active": state.active, "tokens": round(state.tokens, 2), **state.policy._asdict()}
+                for host, state in self._hosts.items()
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_fetch_scheduler():
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = FetchScheduler()
+    return _scheduler
@@ -1,60 +1,97 @@
-from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from bs4 import BeautifulSoup
-import time
+from backend import config
+from backend.metrics import timed, record_scraper_error, record_search_path
+from backend.browser_pool import get_browser_pool
+from backend.http_client import fetch_html
+from backend.fetch_scheduler import get_fetch_scheduler
 
-def get_hindu_links(search_term):
-    options = Options()
-    options.add_argument('--headless')  # Optional: Run in headless mode
-    options.add_argument('--start-maximized')
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+STOPWORDS = {"the", "is", "in", "at", "of", "on", "and", "a", "to", "after", "has", "with", "for", "by", "an", "as", "it", "from", "this", "that", "be", "are", "was", "were", "or", "but", "not", "which", "have", "had", "will", "would", "can", "could", "should", "may", "might", "do", "does", "did", "so", "such", "if", "then", "than", "also", "their", "its", "about", "into", "more", "other", "some", "any", "all", "no", "only", "over", "out", "up", "down", "off", "just", "now", "like", "because", "how", "when", "where", "who", "what", "why"}
+
+SEARCH_ICON_XPATH = "//header//div[contains(@class, 'container')]//div[contains(@class, 'hamburger-search')]/a"
+
+def keyword_query(search_term, top_n=10):
+    """Main keywords of the search term, stopwords removed"""
+    keywords = [word for word in search_term.split() if word.lower() not in STOPWORDS]
+    return " ".join(keywords[:top_n])
+
+def parse_hindu_links(page_source, limit=3):
+    """Pick article links out of The Hindu's search results section"""
+    links = []
+    soup = BeautifulSoup(page_source, "html.parser")
+    results_div = soup.select_one('#___gcse_0 div div div div:nth-of-type(5)')  # Results section
+
+    count = 0
+    if results_div:
+        for a_tag in results_div.find_all("a", href=True):
+            href = a_tag["href"]
+            text = a_tag.get_text(strip=True)
+            if text and href.startswith("https://www.thehindu.com"):
+                count += 1
+                links.append(href)
+                if count == limit:
+                    break
+    return links
+
+@timed("search_hindu_http")
+def search_hindu_http(search_term):
+    """Fetch the search results page by URL and parse it without a browser"""
+    return parse_hindu_links(fetch_html("https://www.thehindu.com/search/", params={"q": keyword_query(search_term)}))
+
+def search_hindu_browser(search_term):
     links = []
-    try:
-        # ---- Step 1: Open The Hindu Website ----
-        driver.get("https://www.thehindu.com/")
-        time.sleep(3)
-
-        # ---- Step 2: Click Search Icon ----
-        search_icon = driver.find_element(By.XPATH, "//header//div[contains(@class, 'container')]//div[contains(@class, 'hamburger-search')]/a")
-        search_icon.click()
-        time.sleep(2)
-
-        # ---- Step 3: Enter Search Keywords in Search Bar ----
-        search_input = driver.find_element(By.XPATH, '//*[@id="gsc-i-id1"]')
-
-        # Filter top keywords
-        stopwords = {"the", "is", "in", "at", "of", "on", "and", "a", "to", "after", "has", "with", "for", "by", "an", "as", "it", "from", "this", "that", "be", "are", "was", "were", "or", "but", "not", "which", "have", "had", "will", "would", "can", "could", "should", "may", "might", "do", "does", "did", "so", "such", "if", "then", "than", "also", "their", "its", "about", "into", "more", "other", "some", "any", "all", "no", "only", "over", "out", "up", "down", "off", "just", "now", "like", "because", "how", "when", "where", "who", "what", "why"}
-        keywords = [word for word in search_term.split() if word.lower() not in stopwords]
-        keyword_query = " ".join(keywords[:10])  # Use top 10 keywords
-
-        search_input.send_keys(keyword_query)
-        search_input.send_keys(Keys.RETURN)
-        time.sleep(5)  # Let results load
-
-        # ---- Step 4: Scrape Result Links from Results Section ----
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-        results_div = soup.select_one('#___gcse_0 div div div div:nth-of-type(5)')  # Results section
-
-        count = 0
-        if results_div:
-            for a_tag in results_div.find_all("a", href=True):
-                href = a_tag["href"]
-                text = a_tag.get_text(strip=True)
-                if text and href.startswith("https://www.thehindu.com"):
-                    count += 1
-                    links.append(href)
-                    if count == 3:
-                        break
-    except Exception as e:
-        print(f"❌ Error: {e}")
-    finally:
-        driver.quit()
+    with get_browser_pool().lease("hindu") as driver:
+        try:
+            # ---- Step 1: Open The Hindu Website ----
+            with get_fetch_scheduler().slot("https://www.thehindu.com/"):
+                driver.get("https://www.thehindu.com/")
+            wait = WebDriverWait(driver, config.BROWSER_WAIT_TIMEOUT)
+
+            # ---- Step 2: Click Search Icon ----
+            search_icon = wait.until(EC.element_to_be_clickable((By.XPATH, SEARCH_ICON_XPATH)))
+            search_icon.click()
+
+            # ---- Step 3: Enter Search Keywords in Search Bar ----
+            search_input = wait.until(EC.visibility_of_element_located((By.XPATH, '//*[@id="gsc-i-id1"]')))
+
+            # Filter top keywords
+            query = keyword_query(search_term)  # Use top 10 keywords
+
+            search_input.send_keys(query)
+            search_input.send_keys(Keys.RETURN)
+            try:
+                # Results are rendered by the Google Custom Search widget
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "#___gcse_0 .gsc-webResult")))
+            except TimeoutException:
+                pass  # parse_hindu_links finds nothing and returns []
+
+            # ---- Step 4: Scrape Result Links from Results Section ----
+            links = parse_hindu_links(driver.page_source)
+        except Exception as e:
+            record_scraper_error("hindu")
+            print(f"❌ Error: {e}")
+            raise
     return links
 
+@timed("search_hindu")
+def get_hindu_links(search_term):
+    # Plain HTTP first; the browser only runs when that finds nothing
+    if config.HTTP_SEARCH:
+        try:
+            links = search_hindu_http(search_term)
+        except Exception as e:
+            print(f"⚠️ Hindu HTTP search failed, falling back to browser: {e}")
+            links = []
+        if links:
+            record_search_path("hindu", "http")
+            return links
+    record_search_path("hindu", "browser")
+    return search_hindu_browser(search_term)
+
 if __name__ == "__main__":
     search_term = input("Enter search term: ")
     hindu_links = get_hindu_links(search_term)
@@ -0,0 +1,63 @@
+"""
+Shared keep-alive HTTP session for fetching pages without a browser.
+
+Connections are pooled per host, so repeated searches against the same site
+reuse an open TLS connection instead of paying the handshake every time.
+Requests go through the fetch scheduler, which paces each host and retries
+transient failures, so the adapter itself does not retry.
+"""
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend import config
+from backend.fetch_scheduler import check_status, get_fetch_scheduler
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(DEFAULT_HEADERS)
+                adapter = HTTPAdapter(
+                    pool_connections=config.HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=config.HTTP_POOL_MAXSIZE,
+                    max_retries=0,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _session = session
+    return _session
+
+
+def http_get(url, **kwargs):
+    """GET through the shared session, paced and retried per host by the fetch scheduler"""
+    kwargs.setdefault("timeout", config.HTTP_TIMEOUT)
+
+    def attempt():
+        response = get_http_session().get(url, **kwargs)
+        check_status(url, response.status_code, response.headers)
+        return response
+    return get_fetch_scheduler().call(url, attempt)
+
+
+def fetch_html(url, params=None, timeout=None):
+    """GET a page through the shared session and return its decoded text"""
+    response = http_get(url, params=params, timeout=timeout or config.HTTP_TIMEOUT)
+    response.raise_for_status()
+    return response.text
@@ -0,0 +1,153 @@
+import json
+import time
+import uuid
+import logging
+import threading
+
+from backend import config
+from backend.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class JobQueue:
+    """
+    Durable verification job queue stored in SQLite.
+
+    Workers lease a job for a limited time and must complete it or extend the
+    lease with heartbeats. A job whose lease runs out (for example because its
+    worker crashed) becomes available to the next worker that asks, until it
+    has been attempted max_attempts times.
+    """
+
+    def __init__(self, db_path=None, lease_seconds=None, max_attempts=None):
+        self.db_path = db_path or config.JOB_DB_PATH
+        self.lease_seconds = lease_seconds or config.JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts or config.JOB_MAX_ATTEMPTS
+        self._lock = threading.Lock()
+        self._conn = connect(self.db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker_id TEXT,
+                lease_expires REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)")
+
+    def submit(self, text):
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, text, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, text, QUEUED, now, now),
+            )
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, status, result, error, attempts, created_at, updated_at FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "result": json.loads(row[2]) if row[2] else None,
+            "error": row[3],
+            "attempts": row[4],
+            "created_at": row[5],
+            "updated_at": row[6],
+        }
+
+    def lease(self, worker_id):
+        """Atomically claim the oldest queued or lease-expired job; returns (job_id, text) or None"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs that keep killing their worker are given up on instead of looping forever
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, updated_at = ? "
+                    "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                    (FAILED, "Lease expired too many times", now, RUNNING, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, text FROM jobs WHERE status = ? OR (status = ? AND lease_expires < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (QUEUED, RUNNING, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, worker_id = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? "
+                        "WHERE id = ?",
+                        (RUNNING, worker_id, now + self.lease_seconds, now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return (row[0], row[1]) if row is not None else None
+
+    def heartbeat(self, job_id, worker_id):
+        """Extend the lease; returns False if the job was re-leased to someone else"""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (now + self.lease_seconds, now, job_id, worker_id, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result):
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND worker_id = ? AND status = ?",
+                (DONE, json.dumps(result, ensure_ascii=False), time.time(), job_id, worker_id, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """Requeue the job after an error, or mark it failed once attempts are used up"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, error = ?, "
+                "worker_id = NULL, lease_expires = NULL, updated_at = ? WHERE id = ? AND worker_id = ? AND status = ?",
+                (self.max_attempts, FAILED, QUEUED, error, time.time(), job_id, worker_id, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+
+_job_queue = None
+_job_queue_lock = threading.Lock()
+
+
+def get_job_queue():
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                _job_queue = JobQueue()
+    return _job_queue
@@ -0,0 +1,115 @@
+"""
+Prometheus instrumentation shared by the API, the scrapers and the vector DB builder.
+
+Import the helpers (time_stage, timed, record_scraper_error, ...) wherever a
+stage should be measured; fastmain exposes everything at /metrics.
+"""
+import time
+import functools
+from contextlib import contextmanager
+
+from prometheus_client import Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+STAGE_LATENCY = Histogram(
+    "fnd_stage_latency_seconds", "Latency of each pipeline stage", ["stage"], buckets=LATENCY_BUCKETS
+)
+STAGE_ERRORS = Counter("fnd_stage_errors_total", "Exceptions raised inside a timed stage", ["stage"])
+LINKS_FOUND = Histogram(
+    "fnd_links_found", "Search result links found per verification", buckets=(0, 1, 2, 3, 5, 8, 13, 20)
+)
+CHUNKS_PRODUCED = Histogram(
+    "fnd_chunks_produced", "Text chunks produced per verification", buckets=(0, 5, 10, 25, 50, 100, 250, 500, 1000)
+)
+IN_FLIGHT = Gauge("fnd_requests_in_flight", "HTTP requests currently being served", ["path"])
+VERIFICATIONS = Gauge("fnd_verifications", "Verifications holding or waiting for a slot", ["state"])
+CACHE_LOOKUPS = Counter("fnd_cache_lookups_total", "Cache lookups by cache and outcome", ["cache", "result"])
+CACHE_HIT_RATIO = Gauge("fnd_cache_hit_ratio", "Hit ratio of each cache since start", ["cache"])
+SCRAPER_ERRORS = Counter("fnd_scraper_errors_total", "Scraper failures per source", ["source"])
+INGESTED_ARTICLES = Counter("fnd_ingested_articles_total", "Articles added to the local news index", ["domain"])
+SEARCH_SOURCE_RESULTS = Counter(
+    "fnd_search_source_results_total", "Fan-out search outcomes per source", ["source", "status"]
+)
+SEARCH_PATH = Counter("fnd_search_path_total", "Searches per source by the path that served them", ["source", "path"])
+FETCH_QUEUE_WAIT = Histogram(
+    "fnd_fetch_queue_wait_seconds", "Time a fetch waited for its host's rate limit and concurrency cap", ["host"],
+    buckets=(0, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+FETCH_RETRIES = Counter("fnd_fetch_retries_total", "Fetches retried after a transient failure", ["host", "reason"])
+CIRCUIT_STATE = Gauge("fnd_circuit_state", "Circuit breaker state: 0 closed, 1 half-open, 2 open", ["kind", "name"])
+CIRCUIT_REJECTED = Counter("fnd_circuit_rejected_total", "Calls short-circuited by an open breaker", ["kind", "name"])
+LLM_TOKENS = Counter("fnd_llm_tokens_total", "LLM tokens processed", ["direction"])
+BOILERPLATE_REMOVED_BYTES = Histogram(
+    "fnd_boilerplate_removed_bytes", "Page text bytes discarded by main-content extraction", ["method"],
+    buckets=(0, 1000, 2500, 5000, 10000, 25000, 50000, 100000, 250000),
+)
+BROWSER_SESSIONS = Gauge("fnd_browser_sessions", "Pooled browser sessions by state", ["state"])
+BROWSER_BLOCKED_REQUESTS = Counter(
+    "fnd_browser_blocked_requests_total", "Requests cancelled by resource blocking", ["site", "type"]
+)
+BROWSER_TRANSFERRED_BYTES = Counter(
+    "fnd_browser_transferred_bytes_total", "Bytes actually downloaded by scraper browsers", ["site"]
+)
+BROWSER_RECYCLED = Counter("fnd_browser_sessions_recycled_total", "Browser sessions replaced, by reason", ["reason"])
+JOB_OUTCOMES = Counter("fnd_job_outcomes_total", "Jobs finished by a worker, by outcome", ["outcome"])
+
+
+@contextmanager
+def time_stage(stage):
+    """Observe the duration of the enclosed block under the given stage label"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.labels(stage).inc()
+        raise
+    finally:
+        STAGE_LATENCY.labels(stage).observe(time.perf_counter() - start)
+
+
+def timed(stage):
+    """Decorator form of time_stage"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with time_stage(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_scraper_error(source):
+    SCRAPER_ERRORS.labels(source).inc()
+
+
+def record_search_source(source, status):
+    SEARCH_SOURCE_RESULTS.labels(source, status).inc()
+
+
+def record_search_path(source, path):
+    SEARCH_PATH.labels(source, path).inc()
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def record_job_outcome(outcome):
+    JOB_OUTCOMES.labels(outcome).inc()
+
+
+def record_llm_tokens(tokens_in, tokens_out):
+    if tokens_in:
+        LLM_TOKENS.labels("in").inc(tokens_in)
+    if tokens_out:
+        LLM_TOKENS.labels("out").inc(tokens_out)
+
+
+def track_gauge(gauge, label, fn):
+    """Make a labelled gauge report fn() whenever it is scraped"""
+    gauge.labels(label).set_function(fn)
+
+
+def render_latest():
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -0,0 +1,341 @@
+"""
+Background ingestion of news feeds into a persistent local index.
+
+The ingester polls the RSS feeds and news sitemaps of ET, BBC and The Hindu
+with conditional GETs. Articles it has not seen before are fetched through the
+article store (which also strips boilerplate), chunked and embedded once, and
+appended to a Chroma collection on disk. Verification queries that index
+first, so live search scraping is only needed for stories newer than the last
+poll.
+
+Every API process starts an ingester, but only the one holding the polling
+lease in ingest.sqlite3 polls; the others take over if it stops renewing it.
+"""
+import os
+import time
+import uuid
+import asyncio
+import hashlib
+import logging
+import functools
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+from backend import config
+from backend.article_fetcher import get_article_fetcher
+from backend.article_store import canonical_url, url_domain
+from backend.http_client import http_get
+from backend.metrics import INGESTED_ARTICLES, time_stage
+from backend.resources import get_resources
+from backend.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+INDEX_COLLECTION = "news_index"
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(node, name):
+    for child in node:
+        if _local(child.tag) == name and child.text:
+            return child.text.strip()
+    return None
+
+
+def parse_feed(xml_text):
+    """Entries of an RSS 2.0, RDF, Atom or news sitemap document as dicts with url, title and published"""
+    root = ET.fromstring(xml_text)
+    kind = _local(root.tag)
+    entries = []
+    if kind in ("rss", "RDF"):
+        for item in root.iter():
+            if _local(item.tag) != "item":
+                continue
+            url = _child_text(item, "link") or _child_text(item, "guid")
+            if url:
+                entries.append({"url": url, "title": _child_text(item, "title"), "published": _child_text(item, "pubDate")})
+    elif kind == "feed":
+        for entry in root:
+            if _local(entry.tag) != "entry":
+                continue
+            link = next(
+                (c.get("href") for c in entry if _local(c.tag) == "link" and c.get("rel", "alternate") == "alternate"),
+                None,
+            )
+            if link:
+                entries.append({"url": link, "title": _child_text(entry, "title"), "published": _child_text(entry, "updated")})
+    elif kind == "urlset":
+        for node in root:
+            if _local(node.tag) != "url":
+                continue
+            url = _child_text(node, "loc")
+            news = next((c for c in node if _local(c.tag) == "news"), None)
+            title = _child_text(news, "title") if news is not None else None
+            published = _child_text(news, "publication_date") if news is not None else _child_text(node, "lastmod")
+            if url:
+                entries.append({"url": url, "title": title, "published": published})
+    else:
+        logger.warning(f"Unsupported feed document <{kind}>")
+    return entries
+
+
+class NewsIndex:
+    """Persistent Chroma collection of chunks from ingested articles"""
+
+    def __init__(self, persist_directory=None, resources=None):
+        self.persist_directory = persist_directory or os.path.join(config.CACHE_DIR, "news_index")
+        self.resources = resources
+        self._store = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    from langchain_community.vectorstores import Chroma
+                    resources = self.resources or get_resources()
+                    self._store = Chroma(
+                        collection_name=INDEX_COLLECTION,
+                        embedding_function=resources.embeddings,
+                        persist_directory=self.persist_directory,
+                    )
+        return self._store
+
+    def add(self, doc):
+        """Chunk, embed and append one article; returns the number of chunks"""
+        resources = self.resources or get_resources()
+        splits = resources.splitter.split_documents([doc])
+        if not splits:
+            return 0
+        url_hash = hashlib.sha256(canonical_url(doc.metadata["source"]).encode("utf-8")).hexdigest()[:16]
+        now = time.time()
+        for split in splits:
+            split.metadata["ingested_at"] = now
+        with time_stage("index_add"):
+            self.store.add_documents(splits, ids=[f"{url_hash}-{i}" for i in range(len(splits))])
+        return len(splits)
+
+    def search(self, embedding, k=None, max_distance=None):
+        """Chunks close enough to the query embedding, best first"""
+        max_distance = config.INDEX_MAX_DISTANCE if max_distance is None else max_distance
+        with time_stage("index_search"):
+            if self.count() == 0:
+                return []
+            results = self.store.similarity_search_by_vector_with_relevance_scores(
+                embedding, k=k or config.RETRIEVER_K
+            )
+        return [doc for doc, distance in results if distance <= max_distance]
+
+    def prune(self, max_age=None):
+        """Drop chunks ingested more than max_age seconds ago"""
+        max_age = config.INDEX_MAX_AGE if max_age is None else max_age
+        if max_age <= 0:
+            return
+        self.store.delete(where={"ingested_at": {"$lt": time.time() - max_age}})
+
+    def count(self):
+        return self.store._collection.count()
+
+
+class NewsIngester:
+    def __init__(self, feeds=None, db_path=None, index=None, max_per_feed=None):
+        self.feeds = feeds if feeds is not None else config.INGEST_FEEDS
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, "ingest.sqlite3")
+        self.index = index or get_news_index()
+        self.max_per_feed = max_per_feed or config.INGEST_MAX_PER_FEED
+        # A pool of its own: a poll can queue hundreds of articles, and in the API's embed
+        # pool they would sit ahead of live verifications' query embeddings
+        self._embed_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest")
+        self.owner = uuid.uuid4().hex
+        self.leader = False
+        self.last_poll = None
+        self.last_result = None
+        self._lock = threading.Lock()
+        self._conn = connect(self.db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS feeds (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                polled_at REAL,
+                status INTEGER
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS ingested (
+                url TEXT PRIMARY KEY,
+                domain TEXT NOT NULL,
+                title TEXT,
+                published TEXT,
+                chunks INTEGER NOT NULL,
+                ingested_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS lease (
+                name TEXT PRIMARY KEY,
+                owner TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+
+    async def _embed(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._embed_pool, functools.partial(fn, *args))
+
+    def _claim_lease(self, duration):
+        """Take or renew the polling lease; False while another live process holds it"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT owner, expires_at FROM lease WHERE name = 'poll'").fetchone()
+                claimed = row is None or row[0] == self.owner or row[1] < now
+                if claimed:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO lease (name, owner, expires_at) VALUES ('poll', ?, ?)",
+                        (self.owner, now + duration),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return claimed
+
+    def _release_lease(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM lease WHERE name = 'poll' AND owner = ?", (self.owner,))
+
+    def _fetch_feed(self, feed_url):
+        """Conditional GET of a feed; returns the response, with status 304 when unchanged"""
+        with self._lock:
+            row = self._conn.execute("SELECT etag, last_modified FROM feeds WHERE url = ?", (feed_url,)).fetchone()
+        headers = {}
+        if row is not None:
+            if row[0]:
+                headers["If-None-Match"] = row[0]
+            if row[1]:
+                headers["If-Modified-Since"] = row[1]
+        response = http_get(feed_url, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def _remember_feed(self, feed_url, response):
+        with self._lock:
+            if response.status_code == 304:
+                self._conn.execute("UPDATE feeds SET polled_at = ?, status = 304 WHERE url = ?", (time.time(), feed_url))
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO feeds (url, etag, last_modified, polled_at, status) VALUES (?, ?, ?, ?, ?)",
+                (feed_url, response.headers.get("ETag"), response.headers.get("Last-Modified"), time.time(), response.status_code),
+            )
+
+    def _unseen(self, entries):
+        fresh = []
+        with self._lock:
+            for entry in entries:
+                key = canonical_url(entry["url"])
+                if self._conn.execute("SELECT 1 FROM ingested WHERE url = ?", (key,)).fetchone() is None:
+                    fresh.append(entry)
+        return fresh[:self.max_per_feed]
+
+    def _mark_ingested(self, entry, chunks):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingested (url, domain, title, published, chunks, ingested_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (canonical_url(entry["url"]), url_domain(entry["url"]), entry["title"], entry["published"], chunks, time.time()),
+            )
+
+    async def _ingest(self, entry):
+        doc = await get_article_fetcher().load(entry["url"])
+        chunks = await self._embed(self.index.add, doc)
+        await asyncio.to_thread(self._mark_ingested, entry, chunks)
+        INGESTED_ARTICLES.labels(url_domain(entry["url"])).inc()
+        return chunks
+
+    async def poll_feed(self, feed_url):
+        try:
+            response = await asyncio.to_thread(self._fetch_feed, feed_url)
+        except Exception as e:
+            logger.warning(f"Could not poll feed {feed_url}: {e}")
+            return {"status": "error", "new": 0, "chunks": 0}
+        if response.status_code == 304:
+            await asyncio.to_thread(self._remember_feed, feed_url, response)
+            return {"status": "not_modified", "new": 0, "chunks": 0}
+        try:
+            entries = await asyncio.to_thread(lambda: self._unseen(parse_feed(response.content)))
+        except ET.ParseError as e:
+            logger.warning(f"Could not parse feed {feed_url}: {e}")
+            return {"status": "error", "new": 0, "chunks": 0}
+        results = await asyncio.gather(*(self._ingest(entry) for entry in entries), return_exceptions=True)
+        chunks = 0
+        new = 0
+        for entry, result in zip(entries, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"Could not ingest {entry['url']}: {result}")
+                continue
+            new += 1
+            chunks += result
+        # Keep the validators only once every entry made it in, so failed articles are retried next poll
+        if new == len(entries):
+            await asyncio.to_thread(self._remember_feed, feed_url, response)
+        return {"status": "ok", "new": new, "chunks": chunks}
+
+    async def poll_once(self):
+        """Poll every feed once; returns a per-feed summary"""
+        with time_stage("ingest_poll"):
+            summaries = await asyncio.gather(*(self.poll_feed(url) for url in self.feeds))
+            await self._embed(self.index.prune)
+        self.last_poll = time.time()
+        self.last_result = dict(zip(self.feeds, summaries))
+        total = sum(s["new"] for s in summaries)
+        logger.info(f"Ingest poll done: {total} new articles from {len(self.feeds)} feeds")
+        return self.last_result
+
+    async def run(self, interval=None):
+        """Poll forever until cancelled, whenever this process holds the polling lease"""
+        interval = interval or config.INGEST_INTERVAL
+        try:
+            while True:
+                try:
+                    # Outlives one missed renewal, so a slow poll does not hand the lease over
+                    self.leader = await asyncio.to_thread(self._claim_lease, interval * 2)
+                    if self.leader:
+                        await self.poll_once()
+                except Exception as e:
+                    logger.error(f"Ingest poll failed: {e}")
+                await asyncio.sleep(interval)
+        finally:
+            if self.leader:
+                self._release_lease()
+            self._embed_pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        with self._lock:
+            ingested = self._conn.execute("SELECT domain, COUNT(*) FROM ingested GROUP BY domain").fetchall()
+        return {
+            "feeds": len(self.feeds),
+            "leader": self.leader,
+            "last_poll": self.last_poll,
+            "last_result": self.last_result,
+            "ingested": dict(ingested),
+        }
+
+
+_news_index = None
+_news_index_lock = threading.Lock()
+
+
+def get_news_index():
+    global _news_index
+    if _news_index is None:
+        with _news_index_lock:
+            if _news_index is None:
+                _news_index = NewsIndex()
+    return _news_index
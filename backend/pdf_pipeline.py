@@ -0,0 +1,276 @@
+"""
+Staged download-and-extract pipeline for regulator press-release PDFs.
+
+Downloads run on a thread pool, paced per host by the fetch scheduler. Text
+extraction and topic scoring are CPU bound, so they run on a shared process
+pool. Results are handed back in the order the releases were submitted, so
+callers build exactly the rows the old one-PDF-at-a-time loop produced, while
+the wall time approaches that of the slowest few PDFs.
+
+Before a release is extracted in full, its first pages are screened, fetched
+through HTTP Range requests where the server allows it. A key term (or enough
+similarity) means the release is kept and its whole text extracted. A release
+showing neither after PDF_SCREEN_PAGES pages is rejected without reading the
+rest. A related term that only appears later in a long circular is missed;
+setting FND_PDF_SCREEN_PAGES=0 trades that back for full extraction.
+"""
+import logging
+import threading
+import multiprocessing
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from backend import config
+from backend.metrics import time_stage, record_cache_lookup
+from backend.pdf_stream import RangeFile, iter_page_texts, open_remote_pdf, pdf_pages
+from backend.topic_matcher import get_topic_matcher
+
+logger = logging.getLogger(__name__)
+
+PDFResult = namedtuple("PDFResult", ["release", "pdf_bytes", "analysis", "error"])
+# complete: every page was read. analysis: as analyse_pdf for a complete read, the
+# (unrelated) score of the first pages for a rejected one, None when the release is kept
+Screening = namedtuple("Screening", ["complete", "analysis"])
+
+
+def extract_pdf_text(pdf_bytes):
+    """Text of every page, one page per line block; None when the PDF cannot be read"""
+    try:
+        return "\n".join(iter_page_texts(pdf_bytes)).strip()
+    except Exception as e:
+        logger.error(f"Error extracting text from PDF in memory: {e}")
+        return None
+
+
+def score_text(text, news_topic, key_terms, similarity_threshold=0.3):
+    """(is_related, max_similarity, found_terms) of text against the news topic"""
+    return get_topic_matcher(news_topic, key_terms).score(text, similarity_threshold)
+
+
+def score_release(text, title, news_topic, key_terms, similarity_threshold):
+    """(text, title_score, content_score) for a release whose text is already known"""
+    return (
+        text,
+        score_text(title, news_topic, key_terms, similarity_threshold),
+        score_text(text, news_topic, key_terms, similarity_threshold),
+    )
+
+
+def is_related(analysis):
+    return analysis[1][0] or analysis[2][0]
+
+
+def analyse_pdf(pdf_bytes, title, news_topic, key_terms, similarity_threshold):
+    """Extract and score one PDF; returns (text, title_score, content_score) or None without text"""
+    text = extract_pdf_text(pdf_bytes)
+    if not text:
+        return None
+    return score_release(text, title, news_topic, key_terms, similarity_threshold)
+
+
+def screen_pdf(source, title, news_topic, key_terms, similarity_threshold, screen_pages):
+    """
+    Read a PDF (bytes or a RangeFile) a page at a time until it is clearly
+    related (a key term appears) or, after screen_pages pages, clearly
+    unrelated (no key term and similarity below the threshold).
+    """
+    if score_text(title, news_topic, key_terms, similarity_threshold)[0]:
+        # A related title keeps the release whatever its pages say
+        return Screening(False, None)
+    matcher = get_topic_matcher(news_topic, key_terms)
+    page_count, pages = pdf_pages(source)
+    texts = []
+    for page in pages:
+        texts.append(page.extract_text())
+        if matcher.found_terms(texts[-1].lower()):
+            return Screening(False, None)
+        if len(texts) == screen_pages and len(texts) < page_count:
+            text = "\n".join(texts).strip()
+            if matcher.similarity(text) >= similarity_threshold:
+                return Screening(False, None)
+            return Screening(False, score_release(text, title, news_topic, key_terms, similarity_threshold))
+    text = "\n".join(texts).strip()
+    return Screening(True, score_release(text, title, news_topic, key_terms, similarity_threshold) if text else None)
+
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+_process_pool_holders = 0
+
+
+def get_pdf_process_pool():
+    """
+    Process pool shared by every pipeline run; None when extraction should stay in-thread.
+
+    The workers are spawned, so each one re-imports the main module: a script
+    that scrapes at import time must keep that under an
+    `if __name__ == "__main__":` guard, or every worker starts a scrape of its own.
+    """
+    global _process_pool
+    if config.PDF_EXTRACT_WORKERS <= 0:
+        return None
+    if _process_pool is None:
+        with _process_pool_lock:
+            if _process_pool is None:
+                # Created lazily from download threads: forking then could copy locks held by
+                # other threads (logging, SQLite, HTTP pools) into the children and deadlock them
+                _process_pool = ProcessPoolExecutor(
+                    max_workers=config.PDF_EXTRACT_WORKERS, mp_context=multiprocessing.get_context("spawn")
+                )
+    return _process_pool
+
+
+def close_pdf_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(cancel_futures=True)
+            _process_pool = None
+
+
+def hold_pdf_process_pool():
+    """Mark a scraping run as using the pool; pair with release_pdf_process_pool"""
+    global _process_pool_holders
+    with _process_pool_lock:
+        _process_pool_holders += 1
+
+
+def release_pdf_process_pool():
+    """End a run started with hold_pdf_process_pool, closing the pool when no other run still uses it"""
+    global _process_pool_holders
+    with _process_pool_lock:
+        _process_pool_holders -= 1
+        if _process_pool_holders > 0:
+            return
+    close_pdf_process_pool()
+
+
+class PDFPipeline:
+    """
+    download(url) -> bytes or None feeds analyse_pdf on the process pool.
+    Releases are screened first (see screen_pdf), so only kept ones have their
+    whole text extracted. With a scrape ledger, releases it already holds skip
+    the download while fresh, and skip extraction when the downloaded bytes
+    are unchanged.
+
+    run() yields a PDFResult per release in input order, at most
+    `window` releases ahead of the consumer, and stops scheduling new work as
+    soon as the consumer stops iterating.
+    """
+
+    def __init__(self, download, source, download_workers=None, window=None, ledger=None, release_key=None,
+                 screen_pages=None):
+        self.download = download
+        self.source = source
+        self.ledger = ledger
+        self.release_key = release_key or (lambda release: release["pdf_url"])
+        self.download_workers = download_workers or config.PDF_DOWNLOAD_WORKERS
+        self.window = window or self.download_workers * 2
+        self.screen_pages = config.PDF_SCREEN_PAGES if screen_pages is None else screen_pages
+
+    def _analyse(self, fn, *args, stage="pdf_extract"):
+        with time_stage(f"{self.source}_{stage}"):
+            pool = get_pdf_process_pool()
+            return pool.submit(fn, *args).result() if pool is not None else fn(*args)
+
+    def _screen(self, source, scoring):
+        """screen_pdf over bytes (on the process pool) or a RangeFile (in this thread); None when it fails"""
+        try:
+            if isinstance(source, RangeFile):
+                with time_stage(f"{self.source}_pdf_screen"):
+                    return screen_pdf(source, *scoring, self.screen_pages)
+            return self._analyse(screen_pdf, source, *scoring, self.screen_pages, stage="pdf_screen")
+        except Exception as e:
+            logger.info(f"Could not screen {getattr(source, 'url', 'PDF')}, extracting it whole: {e}")
+            return None
+
+    def _open_remote(self, url):
+        try:
+            return open_remote_pdf(url)
+        except Exception as e:
+            # The plain download below reports real failures
+            logger.info(f"No Range access to {url}: {e}")
+            return None
+
+    def _stored_text(self, key, record, checked):
+        text = self.ledger.read_text(record)
+        if text is not None:
+            self.ledger.touch(self.source, key, checked=checked)
+        return text
+
+    def _finish_screening(self, release, key, pdf_bytes, screening):
+        if self.ledger is not None and screening.analysis is not None:
+            self.ledger.record(
+                self.source, key, release, pdf_bytes, screening.analysis[0], partial=not screening.complete
+            )
+        return PDFResult(release, pdf_bytes, screening.analysis, None)
+
+    def _process(self, release, news_topic, key_terms, similarity_threshold):
+        pdf_bytes = None
+        url = release["pdf_url"]
+        scoring = (release["title"], news_topic, key_terms, similarity_threshold)
+        try:
+            key = record = None
+            if self.ledger is not None:
+                key = self.release_key(release)
+                record = self.ledger.lookup(self.source, key)
+                text = self._stored_text(key, record, checked=False) if self.ledger.is_fresh(record) else None
+                analysis = self._analyse(score_release, text, *scoring) if text is not None else None
+                # First pages alone only settle a release that they show to be unrelated
+                hit = analysis is not None and not (record["partial"] and is_related(analysis))
+                record_cache_lookup("scrape_ledger", hit)
+                if hit:
+                    return PDFResult(release, None, analysis, None)
+                if record is not None and record["partial"]:
+                    record = None
+
+            screen = self.screen_pages > 0 and not score_text(*scoring)[0]
+            if screen and record is None and config.PDF_RANGE_BLOCK > 0:
+                remote = self._open_remote(url)
+                if isinstance(remote, RangeFile):
+                    screening = self._screen(remote, scoring)
+                    if screening is not None and screening.analysis is not None:
+                        return self._finish_screening(release, key, None, screening)
+                    # Kept (or without text): the whole PDF is needed after all; a failed screen is retried on it
+                    screen = screening is None
+                else:
+                    pdf_bytes = remote
+
+            if pdf_bytes is None:
+                pdf_bytes = self.download(url)
+            if pdf_bytes is None:
+                return PDFResult(release, None, None, None)
+            if self.ledger is not None and self.ledger.unchanged(record, pdf_bytes):
+                text = self._stored_text(key, record, checked=True)
+                if text is not None:
+                    return PDFResult(release, pdf_bytes, self._analyse(score_release, text, *scoring), None)
+
+            if screen:
+                screening = self._screen(pdf_bytes, scoring)
+                if screening is not None and (screening.complete or screening.analysis is not None):
+                    return self._finish_screening(release, key, pdf_bytes, screening)
+            analysis = self._analyse(analyse_pdf, pdf_bytes, *scoring)
+            if self.ledger is not None and analysis is not None:
+                self.ledger.record(self.source, key, release, pdf_bytes, analysis[0])
+            return PDFResult(release, pdf_bytes, analysis, None)
+        except Exception as e:
+            return PDFResult(release, pdf_bytes, None, e)
+
+    def run(self, releases, news_topic, key_terms, similarity_threshold=0.3):
+        releases = iter(releases)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=self.download_workers, thread_name_prefix=f"{self.source}-pdf") as pool:
+            try:
+                while True:
+                    while len(pending) < self.window:
+                        release = next(releases, None)
+                        if release is None:
+                            break
+                        pending.append(pool.submit(self._process, release, news_topic, key_terms, similarity_threshold))
+                    if not pending:
+                        return
+                    yield pending.popleft().result()
+            finally:
+                # The consumer has what it needs; drop work that has not started
+                for future in pending:
+                    future.cancel()
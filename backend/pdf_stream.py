@@ -0,0 +1,157 @@
+"""
+Lazy, page-at-a-time access to remote press-release PDFs.
+
+open_remote_pdf asks for the first block of a PDF with an HTTP Range request.
+A small PDF arrives whole in that one response. For a larger one the result is
+a RangeFile, a read-only seekable file that fetches further blocks only when
+PyPDF2 reads them. PyPDF2 loads the trailer, the cross-reference table and
+then each page on demand, so reading the first few pages touches a handful of
+blocks rather than the whole document. Servers that ignore Range simply send
+the whole PDF, as before.
+"""
+import io
+import re
+
+import PyPDF2
+from PyPDF2 import PageObject
+from PyPDF2.generic import IndirectObject
+
+from backend import config
+from backend.http_client import http_get
+
+INHERITABLE_PAGE_ATTRIBUTES = ("/Resources", "/MediaBox", "/CropBox", "/Rotate")
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+
+class RangeUnsupported(Exception):
+    """The server did not answer a Range request with the requested bytes"""
+
+
+def _range_get(url, start, end, if_range=None):
+    headers = {"Range": f"bytes={start}-{end}", "Accept-Encoding": "identity"}
+    if if_range:
+        headers["If-Range"] = if_range
+    response = http_get(url, headers=headers, timeout=30)
+    response.raise_for_status()
+    return response
+
+
+class RangeFile(io.RawIOBase):
+    """Read-only file over a remote PDF, fetching fixed-size blocks on first read"""
+
+    def __init__(self, url, size, block_size, blocks=None, validator=None):
+        self.url = url
+        self.size = size
+        self.block_size = block_size
+        self.blocks = dict(blocks or {})
+        # ETag or Last-Modified of the first response, so a PDF replaced mid-read is not mixed up
+        self.validator = validator
+        self.requests = 0
+        self.bytes_fetched = sum(len(block) for block in self.blocks.values())
+        self._pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self.size + offset
+        else:
+            raise ValueError(f"invalid whence {whence}")
+        self._pos = max(self._pos, 0)
+        return self._pos
+
+    def _fetch(self, first, last):
+        # One request for a run of missing blocks
+        start, end = first * self.block_size, min((last + 1) * self.block_size, self.size) - 1
+        response = _range_get(self.url, start, end, self.validator)
+        if response.status_code != 206 or len(response.content) != end - start + 1:
+            raise RangeUnsupported(f"{self.url} changed or stopped honouring Range (HTTP {response.status_code})")
+        self.requests += 1
+        self.bytes_fetched += len(response.content)
+        for index in range(first, last + 1):
+            offset = (index - first) * self.block_size
+            self.blocks[index] = response.content[offset:offset + self.block_size]
+
+    def _ensure(self, first, last):
+        index = first
+        while index <= last:
+            if index in self.blocks:
+                index += 1
+                continue
+            run_end = index
+            while run_end + 1 <= last and run_end + 1 not in self.blocks:
+                run_end += 1
+            self._fetch(index, run_end)
+            index = run_end + 1
+
+    def readinto(self, buffer):
+        end = min(self._pos + len(buffer), self.size)
+        if end <= self._pos:
+            return 0
+        first, last = self._pos // self.block_size, (end - 1) // self.block_size
+        self._ensure(first, last)
+        data = b"".join(self.blocks[index] for index in range(first, last + 1))
+        chunk = data[self._pos - first * self.block_size:end - first * self.block_size]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+
+
+def open_remote_pdf(url, block_size=None):
+    """
+    bytes when the whole PDF came back in the first response, otherwise a
+    RangeFile over it. Raises RangeUnsupported when the size is not known.
+    """
+    block_size = block_size or config.PDF_RANGE_BLOCK
+    response = _range_get(url, 0, block_size - 1)
+    if response.status_code == 200:
+        return response.content
+    match = CONTENT_RANGE.match(response.headers.get("Content-Range", ""))
+    if response.status_code != 206 or match is None or match.group(3) == "*" or int(match.group(1)) != 0:
+        raise RangeUnsupported(f"{url} answered a Range request with HTTP {response.status_code}")
+    size = int(match.group(3))
+    if len(response.content) >= size:
+        return response.content[:size]
+    if len(response.content) != block_size:
+        raise RangeUnsupported(f"{url} sent {len(response.content)} bytes for a {block_size} byte range")
+    validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+    return RangeFile(url, size, block_size, blocks={0: response.content}, validator=validator)
+
+
+def _walk_pages(reader, node, inherit, reference=None):
+    # reader.pages flattens the whole page tree up front, loading every page
+    # object; walking it here loads each page only when the caller reaches it
+    node = node.get_object()
+    if node.get("/Type", "/Pages") == "/Pages":
+        inherit = {**inherit, **{attr: node[attr] for attr in INHERITABLE_PAGE_ATTRIBUTES if attr in node}}
+        for kid in node["/Kids"]:
+            yield from _walk_pages(reader, kid, inherit, kid if isinstance(kid, IndirectObject) else None)
+    elif node["/Type"] == "/Page":
+        page = PageObject(reader, reference)
+        page.update({**inherit, **node})
+        yield page
+
+
+def pdf_pages(source):
+    """(page count, lazy iterator over the pages) of a PDF given as bytes or a seekable binary file"""
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    reader = PyPDF2.PdfReader(stream)
+    root = reader.trailer["/Root"].get_object()["/Pages"].get_object()
+    return root.get("/Count", 0), _walk_pages(reader, root, {})
+
+
+def iter_page_texts(source):
+    """Text of each page in turn, extracted only as the caller asks for it"""
+    for page in pdf_pages(source)[1]:
+        yield page.extract_text()
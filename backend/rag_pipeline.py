@@ -1,81 +1,122 @@
 import os
 import re
 import json
-from backend.bbcscrape import get_bbc_links
-from backend.hinduscrape import get_hindu_links
+import uuid
+import asyncio
+from backend import config
+from backend.metrics import time_stage, timed
+from backend.resources import get_resources
 from backend.trusted_news_fallback import get_trusted_context
 os.environ["USER_AGENT"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
 
-def run_rag_pipeline(news_text, links):
-    # 1. Try trusted fallback first
-    """trusted_context = get_trusted_context(news_text)
-    if trusted_context:
-        docs = [type('Doc', (), {'page_content': trusted_context})()]
-    else:"""
-    from langchain_community.document_loaders import WebBaseLoader
-    from langchain.text_splitter import RecursiveCharacterTextSplitter
-    loader = WebBaseLoader(links)
-    docs = loader.load()
-    splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-    splits = splitter.split_documents(docs)
-    docs = splits
 
+def format_docs(docs):
+    return "\n\n".join(doc.page_content for doc in docs)
+
+
+async def _load_documents(links):
+    from backend.article_fetcher import AsyncArticleFetcher
+    fetcher = AsyncArticleFetcher()
+    try:
+        docs = await fetcher.load_all(links)
+    finally:
+        await fetcher.close()
+    return [docs[url] for url in links if url in docs]
+
+
+@timed("article_load")
+def load_documents(links):
+    """Fetch all links concurrently through the article store; links that fail are skipped"""
+    return asyncio.run(_load_documents(links))
+
+
+@timed("chunk_split")
+def split_documents(docs, resources=None):
+    resources = resources or get_resources()
+    return resources.splitter.split_documents(docs)
+
+
+class _PrecomputedEmbeddings:
+    """Hands Chroma vectors computed beforehand so embedding and indexing can be timed separately"""
+
+    def __init__(self, vectors, embeddings):
+        self.vectors = vectors
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts):
+        return self.vectors
+
+    def embed_query(self, text):
+        return self.embeddings.embed_query(text)
+
+
+def retrieve_context(news_text, splits, resources=None):
+    """Index the chunks in a throwaway Chroma collection and return the top-k matches"""
     from langchain_community.vectorstores import Chroma
-    from langchain_huggingface import HuggingFaceEmbeddings
-    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-    vectorstore = Chroma.from_documents(documents=docs, embedding=embeddings)
-    retriever = vectorstore.as_retriever(search_kwargs={"k": 2})
-    from langchain_ollama import OllamaLLM
-    llm = OllamaLLM(model="llama3")
-    from langchain.prompts import ChatPromptTemplate
-    from langchain_core.runnables import RunnablePassthrough
-    from langchain_core.output_parsers import StrOutputParser
-    def format_docs(docs):
-        return "\n\n".join(doc.page_content for doc in docs)
-    prompt = ChatPromptTemplate.from_template(
-        """
-You are a fact verification assistant.
-
-Your task is to determine whether the **news in the question** is trustworthy or fake by strictly comparing it with the **trusted information in the context**.
-
---------------------
-Context (trusted source):
-{context}
-
-News to verify (question):
-{question}
---------------------
-
-Instructions:
-1. Compare the news content to the trusted context only.Compare the meaning and intent of the news with the context.
-2. Output a **trust score** between 0 and 1, indicating how well the news aligns with the context.
-3. Based on the trust score, give a **verdict**:
-   - If trust score > 0.8 → "Highly Trustworthy"
-   - If 0.5 ≤ trust score ≤ 0.8 → "Likely Trustworthy"
-   - If trust score < 0.5 → "Not Trustworthy"
-4. Generate a trusted news content as output compulsorily for every response and include it in the JSON response and inculde it in the JSON response as "trusted_news" compulsorily for every response.
-   The trusted news content should be a summary or paraphrase of the most relevant and trustworthy information from the context that supports your verdict.
-5. If the news content has some promotional content or advertisements, ignore it.
-6. If the news content is not related to the context, genearate the trusted news content as "No relevant information found in the trusted context" and conclude that it is not trusted news.
-7.Your response must follow this exact JSON format:
-```json
-{{
-  "trust_score": <score from 0 to 1>,
-  "verdict": "<your verdict>",
-  "trusted_news": "<trusted news content>"
-}}
-8.EACH OF YOUR RESPONSES MUST STRICTLY INCLUDE THE JSON FORMAT ABOVE.
-"""
-    )
-    rag_chain = (
-        {"context": retriever | format_docs, "question": RunnablePassthrough()}
-        | prompt
-        | llm
-        | StrOutputParser()
-    )
-    response = rag_chain.invoke(news_text)
-    print(response)
-    #print("Response from RAG pipeline:", response)
+    resources = resources or get_resources()
+    with time_stage("chunk_embed"):
+        vectors = resources.embeddings.embed_documents([doc.page_content for doc in splits])
+    # A unique collection per call keeps chunks from earlier requests out of this one
+    with time_stage("chroma_index"):
+        vectorstore = Chroma.from_documents(
+            documents=splits,
+            embedding=_PrecomputedEmbeddings(vectors, resources.embeddings),
+            collection_name=f"rag-{uuid.uuid4().hex}",
+        )
+    try:
+        with time_stage("retrieve"):
+            retriever = vectorstore.as_retriever(search_kwargs={"k": config.RETRIEVER_K})
+            return retriever.invoke(news_text)
+    finally:
+        vectorstore.delete_collection()
+
+
+@timed("batch_retrieve")
+def retrieve_contexts_batch(query_embeddings, item_splits, resources=None):
+    """
+    Top-k chunks for many queries with a single embedding call over all distinct chunks.
+
+    item_splits holds, per query, the chunks it may draw context from; chunks
+    shared between queries are embedded once. MiniLM vectors are unit-length,
+    so ranking by dot product matches the L2 ranking Chroma uses.
+    """
+    import numpy as np
+    resources = resources or get_resources()
+    unique_chunks = {}
+    for splits in item_splits:
+        for chunk in splits:
+            unique_chunks.setdefault(id(chunk), chunk)
+    chunk_ids = list(unique_chunks)
+    position = {chunk_id: i for i, chunk_id in enumerate(chunk_ids)}
+    if not chunk_ids:
+        return [[] for _ in item_splits]
+    chunk_vectors = np.asarray(resources.embeddings.embed_documents([unique_chunks[c].page_content for c in chunk_ids]))
+    contexts = []
+    for query_embedding, splits in zip(query_embeddings, item_splits):
+        if not splits:
+            contexts.append([])
+            continue
+        rows = [position[id(chunk)] for chunk in splits]
+        scores = chunk_vectors[rows] @ np.asarray(query_embedding)
+        top = np.argsort(scores)[::-1][:config.RETRIEVER_K]
+        contexts.append([splits[i] for i in top])
+    return contexts
+
+
+@timed("llm_generate")
+def generate_response(news_text, context_docs, resources=None):
+    resources = resources or get_resources()
+    return resources.chain.invoke({"context": format_docs(context_docs), "question": news_text})
+
+
+def stream_response(news_text, context_docs, resources=None):
+    """Yield LLM output chunks as they are generated"""
+    resources = resources or get_resources()
+    with time_stage("llm_generate"):
+        yield from resources.chain.stream({"context": format_docs(context_docs), "question": news_text})
+
+
+def parse_response(response):
     json_match = re.search(r'\{[\s\S]*\}', response)
     if json_match:
         json_str = json_match.group(0)
@@ -83,8 +124,24 @@ Instructions:
             response_json = json.loads(json_str)
             print(response_json)
             return response_json
-            
+
         except json.JSONDecodeError:
             return {"error": "Failed to parse JSON."}
     else:
-        return {"error": "No JSON found in response."}
\ No newline at end of file
+        return {"error": "No JSON found in response."}
+
+
+def run_rag_pipeline(news_text, links):
+    # 1. Try trusted fallback first
+    """trusted_context = get_trusted_context(news_text)
+    if trusted_context:
+        docs = [type('Doc', (), {'page_content': trusted_context})()]
+    else:"""
+    resources = get_resources()
+    docs = load_documents(links)
+    splits = split_documents(docs, resources)
+    context_docs = retrieve_context(news_text, splits, resources)
+    response = generate_response(news_text, context_docs, resources)
+    print(response)
+    #print("Response from RAG pipeline:", response)
+    return parse_response(response)
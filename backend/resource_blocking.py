@@ -0,0 +1,110 @@
+"""
+Resource blocking for the headless Chrome sessions used by the scrapers.
+
+The scrapers only read anchors and text, so images, fonts, stylesheets,
+media and third-party trackers are cancelled before they are requested
+through the DevTools Network.setBlockedURLs command. Sites that need some of
+those to work get an allowlist. When FND_BROWSER_NETWORK_STATS is on, the
+session's performance log is read back after each use to count what was
+blocked and how many bytes were actually transferred.
+"""
+import json
+import logging
+from collections import Counter
+
+from backend import config
+from backend.metrics import BROWSER_BLOCKED_REQUESTS, BROWSER_TRANSFERRED_BYTES
+
+logger = logging.getLogger(__name__)
+
+TYPE_PATTERNS = {
+    "image": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.avif*", "*.svg*", "*.ico*"],
+    "font": ["*.woff*", "*.woff2*", "*.ttf*", "*.otf*", "*.eot*"],
+    "stylesheet": ["*.css*"],
+    "media": ["*.mp4*", "*.webm*", "*.m3u8*", "*.mp3*"],
+}
+
+TRACKER_PATTERNS = [
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*", "*googletagservices.com*",
+    "*google-analytics.com*", "*adservice.google.*", "*amazon-adsystem.com*", "*facebook.net*",
+    "*scorecardresearch.com*", "*chartbeat.*", "*taboola.com*", "*outbrain.com*", "*criteo.*",
+    "*quantserve.com*", "*hotjar.com*", "*moatads.com*", "*adnxs.com*", "*pubmatic.com*",
+    "*rubiconproject.com*", "*nr-data.net*", "*cxense.com*", "*permutive.*", "*izooto.com*",
+    "*clevertap*", "*colombiaonline.com*", "*tvid.in*",
+]
+
+# Resource types and domains each site needs to behave for the scraper
+SITE_ALLOWLISTS = {
+    # The search overlay is only positioned (and clickable) once its CSS has loaded
+    "bbc": {"types": {"stylesheet"}, "domains": []},
+    # Results come from the Google Custom Search widget
+    "hindu": {"types": {"stylesheet"}, "domains": ["cse.google.com", "www.google.com", "www.googleapis.com"]},
+}
+
+
+def blocked_types(site=None):
+    allowed = SITE_ALLOWLISTS.get(site, {}).get("types", set())
+    return [t for t in config.BLOCK_RESOURCE_TYPES if t in TYPE_PATTERNS and t not in allowed]
+
+
+def blocked_patterns(site=None):
+    """URL patterns to cancel for this site"""
+    patterns = [p for t in blocked_types(site) for p in TYPE_PATTERNS[t]]
+    if config.BLOCK_TRACKERS:
+        allowed_domains = SITE_ALLOWLISTS.get(site, {}).get("domains", [])
+        patterns += [p for p in TRACKER_PATTERNS if not any(domain in p for domain in allowed_domains)]
+    return patterns + config.BLOCK_EXTRA_PATTERNS
+
+
+def configure_options(options):
+    """Turn on network performance logging, which record_network_stats reads back"""
+    if config.BROWSER_NETWORK_STATS:
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+    return options
+
+
+def blocking_prefs(site=None):
+    """Chrome prefs for a session dedicated to one site; merge into its "prefs" option"""
+    if config.BLOCK_RESOURCES and "image" in blocked_types(site):
+        return {"profile.managed_default_content_settings.images": 2}
+    return {}
+
+
+def block_resources(driver, site=None):
+    """Apply the site's blocklist to the session; replaces whatever was set before"""
+    if not config.BLOCK_RESOURCES:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked_patterns(site)})
+    except Exception as e:
+        logger.warning(f"Could not enable resource blocking for {site or 'session'}: {e}")
+
+
+def record_network_stats(driver, site=None):
+    """Drain the performance log and count blocked requests and transferred bytes"""
+    if not config.BROWSER_NETWORK_STATS:
+        return None
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return None
+    site = site or "other"
+    blocked = Counter()
+    transferred = 0
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method = message.get("method")
+        params = message.get("params", {})
+        if method == "Network.loadingFailed" and params.get("blockedReason"):
+            blocked[params.get("type", "Other").lower()] += 1
+        elif method == "Network.loadingFinished":
+            transferred += params.get("encodedDataLength", 0)
+    for resource_type, count in blocked.items():
+        BROWSER_BLOCKED_REQUESTS.labels(site, resource_type).inc(count)
+    BROWSER_TRANSFERRED_BYTES.labels(site).inc(transferred)
+    return {"blocked": dict(blocked), "transferred_bytes": transferred}
@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+
+from backend import config
+from backend.metrics import record_llm_tokens
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TEMPLATE = """
+You are a fact verification assistant.
+
+Your task is to determine whether the **news in the question** is trustworthy or fake by strictly comparing it with the **trusted information in the context**.
+
+--------------------
+Context (trusted source):
+{context}
+
+News to verify (question):
+{question}
+--------------------
+
+Instructions:
+1. Compare the news content to the trusted context only.Compare the meaning and intent of the news with the context.
+2. Output a **trust score** between 0 and 1, indicating how well the news aligns with the context.
+3. Based on the trust score, give a **verdict**:
+   - If trust score > 0.8 → "Highly Trustworthy"
+   - If 0.5 ≤ trust score ≤ 0.8 → "Likely Trustworthy"
+   - If trust score < 0.5 → "Not Trustworthy"
+4. Generate a trusted news content as output compulsorily for every response and include it in the JSON response and inculde it in the JSON response as "trusted_news" compulsorily for every response.
+   The trusted news content should be a summary or paraphrase of the most relevant and trustworthy information from the context that supports your verdict.
+5. If the news content has some promotional content or advertisements, ignore it.
+6. If the news content is not related to the context, genearate the trusted news content as "No relevant information found in the trusted context" and conclude that it is not trusted news.
+7.Your response must follow this exact JSON format:
+```json
+{{
+  "trust_score": <score from 0 to 1>,
+  "verdict": "<your verdict>",
+  "trusted_news": "<trusted news content>"
+}}
+8.EACH OF YOUR RESPONSES MUST STRICTLY INCLUDE THE JSON FORMAT ABOVE.
+"""
+
+
+def _token_usage_callback():
+    """Callback handler that feeds Ollama's prompt/eval token counts into the metrics"""
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    class TokenUsageCallback(BaseCallbackHandler):
+        def on_llm_end(self, response, **kwargs):
+            for generations in response.generations:
+                for generation in generations:
+                    info = generation.generation_info or {}
+                    record_llm_tokens(info.get("prompt_eval_count", 0), info.get("eval_count", 0))
+
+    return TokenUsageCallback()
+
+
+class PipelineResources:
+    """
+    Process-wide holder for the heavy objects used by the RAG pipeline.
+
+    The embedding model, LLM client, text splitter and prompt chain are built
+    once and shared by every request instead of being recreated per call.
+    """
+
+    def __init__(self, embedding_model=None, llm_model=None):
+        self.embedding_model_name = embedding_model or config.EMBEDDING_MODEL
+        self.llm_model_name = llm_model or config.LLM_MODEL
+        self.embeddings = None
+        self.llm = None
+        self.splitter = None
+        self.prompt = None
+        self.chain = None
+        self.loaded = False
+        self.ready = False
+        self.warmup_seconds = None
+        self.error = None
+
+    def load(self):
+        """Import langchain and construct the shared pipeline objects"""
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+        from langchain.prompts import ChatPromptTemplate
+        from langchain_core.output_parsers import StrOutputParser
+        from langchain_huggingface import HuggingFaceEmbeddings
+        from langchain_ollama import OllamaLLM
+
+        logger.info(f"Loading embedding model: {self.embedding_model_name}")
+        self.embeddings = HuggingFaceEmbeddings(model_name=self.embedding_model_name)
+        logger.info(f"Creating LLM client: {self.llm_model_name}")
+        self.llm = OllamaLLM(model=self.llm_model_name, callbacks=[_token_usage_callback()])
+        self.splitter = RecursiveCharacterTextSplitter(chunk_size=config.CHUNK_SIZE, chunk_overlap=config.CHUNK_OVERLAP)
+        self.prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
+        self.chain = self.prompt | self.llm | StrOutputParser()
+        self.loaded = True
+        return self
+
+    def warm_up(self):
+        """Run one embedding and one generation so the first real request is not cold"""
+        if not self.loaded:
+            self.load()
+        start = time.perf_counter()
+        try:
+            self.embeddings.embed_query("warm-up")
+            self.splitter.split_text("warm-up")
+            self.chain.invoke({"context": "warm-up", "question": "warm-up"})
+        except Exception as e:
+            self.error = str(e)
+            logger.error(f"Warm-up inference failed: {e}")
+            raise
+        self.warmup_seconds = time.perf_counter() - start
+        self.ready = True
+        self.error = None
+        logger.info(f"Pipeline resources warmed up in {self.warmup_seconds:.2f}s")
+        return self
+
+    def status(self):
+        return {
+            "ready": self.ready,
+            "loaded": self.loaded,
+            "embedding_model": self.embedding_model_name,
+            "llm_model": self.llm_model_name,
+            "warmup_seconds": self.warmup_seconds,
+            "error": self.error,
+        }
+
+
+_resources = None
+_resources_lock = threading.Lock()
+
+
+def get_resources():
+    """Return the shared PipelineResources, loading them lazily if startup did not"""
+    global _resources
+    if _resources is None:
+        with _resources_lock:
+            if _resources is None:
+                _resources = PipelineResources().load()
+    return _resources
+
+
+def current_resources():
+    """Return the shared PipelineResources if they exist, without loading them"""
+    return _resources
+
+
+def init_resources(warm_up=True):
+    """Build (and optionally warm up) the shared resources; called from the app lifespan"""
+    global _resources
+    with _resources_lock:
+        if _resources is None:
+            _resources = PipelineResources().load()
+        resources = _resources
+    if warm_up and not resources.ready:
+        resources.warm_up()
+    return resources
+
+
+def install_resources(resources):
+    """Replace the shared resources, e.g. with fakes for offline benchmarks"""
+    global _resources
+    with _resources_lock:
+        _resources = resources
+    return resources
+
+
+def reset_resources():
+    global _resources
+    with _resources_lock:
+        _resources = None
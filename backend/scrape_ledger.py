@@ -0,0 +1,163 @@
+"""
+Persistent ledger of RBI and SEBI press releases already scraped.
+
+Each release is keyed by its source and a stable id (the RBI prid, or the
+SEBI release link) and records the sha256 of its PDF, where the extracted text
+is kept and when it was last seen and last checked. A release checked within
+FND_SCRAPE_RECHECK_SECONDS is served from the ledger without any download.
+Once that expires, the PDF is downloaded again, and text extraction is
+skipped when the bytes hash the same. Releases rejected after screening their
+first pages are kept as partial entries holding just those pages, which is
+enough to reject them again for another topic without any download. Text
+files are content-addressed and written atomically, and the index is a WAL
+SQLite database, so several scraper processes can share one ledger.
+"""
+import os
+import time
+import hashlib
+import logging
+import tempfile
+import threading
+from urllib.parse import urlsplit, parse_qs
+
+from backend import config
+from backend.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+
+def rbi_release_key(release):
+    """The prid of an RBI press release, falling back to its PDF URL"""
+    prid = parse_qs(urlsplit(release.get("detail_url") or "").query).get("prid")
+    return prid[0] if prid else release["pdf_url"]
+
+
+def sebi_release_key(release):
+    return release.get("detail_url") or release["pdf_url"]
+
+
+class ScrapeLedger:
+    def __init__(self, db_path=None, text_dir=None, recheck_seconds=None):
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, "scrape_ledger.sqlite3")
+        self.text_dir = text_dir or os.path.join(config.CACHE_DIR, "scrape_texts")
+        self.recheck_seconds = config.SCRAPE_RECHECK_SECONDS if recheck_seconds is None else recheck_seconds
+        self._lock = threading.Lock()
+        self._conn = connect(self.db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS releases (
+                source TEXT NOT NULL,
+                release_key TEXT NOT NULL,
+                pdf_url TEXT NOT NULL,
+                title TEXT,
+                content_hash TEXT NOT NULL,
+                text_path TEXT NOT NULL,
+                first_seen REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                checked_at REAL NOT NULL,
+                partial INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (source, release_key)
+            )"""
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(releases)")}
+        if "partial" not in columns:
+            self._conn.execute("ALTER TABLE releases ADD COLUMN partial INTEGER NOT NULL DEFAULT 0")
+
+    def lookup(self, source, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash, text_path, last_seen, checked_at, partial FROM releases "
+                "WHERE source = ? AND release_key = ?",
+                (source, key),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "content_hash": row[0], "text_path": row[1], "last_seen": row[2], "checked_at": row[3],
+            "partial": bool(row[4]),
+        }
+
+    def is_fresh(self, record):
+        return record is not None and time.time() - record["checked_at"] < self.recheck_seconds
+
+    @staticmethod
+    def read_text(record):
+        """Stored text of a release, or None when its file has gone missing"""
+        try:
+            with open(record["text_path"], encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def touch(self, source, key, checked=False):
+        """Mark a release as seen this run; checked=True also restarts its recheck interval"""
+        now = time.time()
+        with self._lock:
+            if checked:
+                self._conn.execute(
+                    "UPDATE releases SET last_seen = ?, checked_at = ? WHERE source = ? AND release_key = ?",
+                    (now, now, source, key),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE releases SET last_seen = ? WHERE source = ? AND release_key = ?", (now, source, key)
+                )
+
+    def _write_text(self, source, name, text):
+        folder = os.path.join(self.text_dir, source)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, f"{name}.txt")
+        if not os.path.exists(path):
+            # Write then rename, so a concurrent reader never sees a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=folder, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        return path
+
+    def record(self, source, key, release, pdf_bytes, text, partial=False):
+        """
+        Store the text of a freshly extracted release. partial=True marks text
+        of the screened first pages only; pdf_bytes is None when the PDF was
+        read through Range requests, and such entries never count as unchanged.
+        """
+        content_hash = hashlib.sha256(pdf_bytes).hexdigest() if pdf_bytes is not None else ""
+        name = hashlib.sha256(text.encode("utf-8")).hexdigest() if partial or not content_hash else content_hash
+        path = self._write_text(source, f"{name}.partial" if partial else name, text)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """INSERT INTO releases
+                   (source, release_key, pdf_url, title, content_hash, text_path, first_seen, last_seen, checked_at,
+                    partial)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (source, release_key) DO UPDATE SET
+                       pdf_url = excluded.pdf_url, title = excluded.title, content_hash = excluded.content_hash,
+                       text_path = excluded.text_path, last_seen = excluded.last_seen, checked_at = excluded.checked_at,
+                       partial = excluded.partial""",
+                (source, key, release["pdf_url"], release.get("title"), content_hash, path, now, now, now, int(partial)),
+            )
+
+    @staticmethod
+    def unchanged(record, pdf_bytes):
+        return (
+            record is not None and not record["partial"]
+            and record["content_hash"] == hashlib.sha256(pdf_bytes).hexdigest()
+        )
+
+    def stats(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT source, COUNT(*), MAX(last_seen) FROM releases GROUP BY source").fetchall()
+        return {source: {"releases": count, "last_seen": last_seen} for source, count, last_seen in rows}
+
+
+_scrape_ledger = None
+_scrape_ledger_lock = threading.Lock()
+
+
+def get_scrape_ledger():
+    global _scrape_ledger
+    if _scrape_ledger is None:
+        with _scrape_ledger_lock:
+            if _scrape_ledger is None:
+                _scrape_ledger = ScrapeLedger()
+    return _scrape_ledger
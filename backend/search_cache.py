@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import logging
+import threading
+
+from backend import config
+from backend.metrics import record_cache_lookup
+from backend.sqlite_store import connect
+from backend.verdict_cache import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+class SearchCache:
+    """
+    Links found per (source, normalized keyword query), stored in SQLite.
+
+    Non-empty results live for `ttl` seconds. Empty results are remembered
+    for the much shorter `negative_ttl`, so a source that found nothing is not
+    searched again immediately but is retried once news has had time to break.
+    """
+
+    def __init__(self, db_path=None, ttl=None, negative_ttl=None):
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, "searches.sqlite3")
+        self.ttl = config.SEARCH_CACHE_TTL if ttl is None else ttl
+        self.negative_ttl = config.SEARCH_CACHE_NEGATIVE_TTL if negative_ttl is None else negative_ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self._conn = connect(self.db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS searches (
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                links TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (source, query)
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS searches_expires_at ON searches (expires_at)")
+
+    def get(self, source, query):
+        """Return the cached links (possibly an empty list) or None on a miss"""
+        normalized = normalize_text(query)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT links, expires_at FROM searches WHERE source = ? AND query = ?", (source, normalized)
+            ).fetchone()
+            if row is not None and row[1] > now:
+                links = json.loads(row[0])
+                if links:
+                    self.hits += 1
+                else:
+                    self.negative_hits += 1
+                record_cache_lookup("search", True)
+                return links
+            if row is not None:
+                self._conn.execute("DELETE FROM searches WHERE source = ? AND query = ?", (source, normalized))
+            self.misses += 1
+            record_cache_lookup("search", False)
+            return None
+
+    def set(self, source, query, links):
+        ttl = self.ttl if links else self.negative_ttl
+        if ttl <= 0:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches (source, query, links, created_at, expires_at) VALUES (?, ?, ?, ?, ?)",
+                (source, normalize_text(query), json.dumps(list(links)), now, now + ttl),
+            )
+
+    def invalidate(self, source=None):
+        """Drop every entry for one source, or for all sources; returns the number removed"""
+        with self._lock:
+            if source is None:
+                cursor = self._conn.execute("DELETE FROM searches")
+            else:
+                cursor = self._conn.execute("DELETE FROM searches WHERE source = ?", (source,))
+            logger.info(f"Invalidated {cursor.rowcount} cached searches for {source or 'all sources'}")
+            return cursor.rowcount
+
+    def purge_expired(self):
+        with self._lock:
+            return self._conn.execute("DELETE FROM searches WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def stats(self):
+        hits = self.hits + self.negative_hits
+        lookups = hits + self.misses
+        with self._lock:
+            per_source = dict(self._conn.execute("SELECT source, COUNT(*) FROM searches GROUP BY source").fetchall())
+        return {
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "entries": per_source,
+            "ttl_seconds": self.ttl,
+            "negative_ttl_seconds": self.negative_ttl,
+        }
+
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache():
+    global _search_cache
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                _search_cache = SearchCache()
+    return _search_cache
@@ -0,0 +1,113 @@
+"""
+Concurrent search across every trusted news source.
+
+Each registered source runs at the same time under its own deadline. Links are
+merged and de-duplicated in the order they arrive, and whatever has arrived
+when the overall budget runs out is returned, so a slow source costs coverage
+rather than latency. Every source sits behind a circuit breaker, so one that
+keeps failing or blowing its deadline is skipped at once until it recovers.
+"""
+import time
+import asyncio
+import logging
+import functools
+from collections import namedtuple
+
+from backend import config
+from backend.browser_pool import lease_deadline
+from backend.circuit_breaker import CircuitOpen, get_breaker
+from backend.etscrape import get_et_links
+from backend.bbcscrape import get_bbc_links
+from backend.hinduscrape import get_hindu_links
+from backend.metrics import record_search_source
+
+logger = logging.getLogger(__name__)
+
+SearchSource = namedtuple("SearchSource", ["name", "fn", "deadline"])
+
+SOURCES = {}
+
+
+def register_source(name, fn, deadline=None):
+    """Add a source; fn(search_term) must return a list of article URLs"""
+    SOURCES[name] = SearchSource(name, fn, deadline or config.SEARCH_SOURCE_DEADLINE)
+
+
+register_source("et", get_et_links)
+register_source("bbc", get_bbc_links)
+register_source("hindu", get_hindu_links)
+
+
+def _before(deadline, fn, *args):
+    # Runs in the scrape thread: a browser lease must not wait past the source's deadline
+    with lease_deadline(deadline):
+        return fn(*args)
+
+
+def enabled_sources():
+    return [name for name in config.SEARCH_SOURCES if name in SOURCES]
+
+
+async def fan_out(run, sources=None, budget=None):
+    """
+    Search all sources concurrently and return (links, report).
+
+    run(name, fn) must return an awaitable producing that source's links; the
+    caller decides how the blocking scraper is executed. fn is the scraper
+    behind its circuit breaker. The report maps each source to its status
+    (ok, empty, timeout, error, open or over_budget), the number of links it
+    contributed and when it finished.
+    """
+    sources = enabled_sources() if sources is None else sources
+    budget = config.SEARCH_BUDGET if budget is None else budget
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    tasks = {}
+    for name in sources:
+        source = SOURCES[name]
+        # Calls slower than the deadline count against the source even when they finish
+        breaker = get_breaker("source", name, slow_after=source.deadline)
+        guarded = functools.partial(_before, time.monotonic() + source.deadline, breaker.call, source.fn)
+        tasks[asyncio.ensure_future(asyncio.wait_for(run(name, guarded), source.deadline))] = name
+
+    links, seen, report = [], set(), {}
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = budget - (loop.time() - start)
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            # Tasks finishing together are merged in source order
+            for task in sorted(done, key=lambda t: sources.index(tasks[t])):
+                name = tasks[task]
+                found = []
+                try:
+                    found = task.result() or []
+                    status = "ok" if found else "empty"
+                except asyncio.TimeoutError:
+                    status = "timeout"
+                    logger.warning(f"Search source {name} missed its {SOURCES[name].deadline}s deadline")
+                except CircuitOpen as e:
+                    status = "open"
+                    logger.info(f"Skipped search source {name}: {e}")
+                except Exception as e:
+                    status = "error"
+                    logger.warning(f"Search source {name} failed: {e}")
+                added = 0
+                for url in found:
+                    if url not in seen:
+                        seen.add(url)
+                        links.append(url)
+                        added += 1
+                report[name] = {"status": status, "links": added, "seconds": round(loop.time() - start, 3)}
+                record_search_source(name, status)
+    finally:
+        for task in pending:
+            task.cancel()
+    for task in pending:
+        name = tasks[task]
+        report[name] = {"status": "over_budget", "links": 0, "seconds": round(loop.time() - start, 3)}
+        record_search_source(name, "over_budget")
+    return links, report
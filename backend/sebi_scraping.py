@@ -13,19 +13,33 @@ from urllib.parse import urljoin, urlparse
 import logging
 import re
 from io import BytesIO
-from difflib import SequenceMatcher
+from backend import config
+from backend.metrics import time_stage, record_scraper_error
+from backend.fetch_scheduler import get_fetch_scheduler
+from backend.http_client import http_get
+from backend.pdf_pipeline import (
+    PDFPipeline, analyse_pdf, extract_pdf_text, score_text, hold_pdf_process_pool, release_pdf_process_pool,
+)
+from backend.topic_matcher import dice, shingles
+from backend.scrape_ledger import get_scrape_ledger, sebi_release_key
+from backend.resource_blocking import configure_options, blocking_prefs, block_resources, record_network_stats
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+RELEASE_LINK_XPATH = "//a[contains(@href, '.pdf') or contains(@href, '.PDF') or contains(@href, 'press') or contains(@href, 'Press')]"
+
 class SEBINewsTopicScraperHeadless:
     def __init__(self, download_folder="./sebi_pdfs", news_topic=None):
         self.download_folder = download_folder
         self.base_url = "https://www.sebi.gov.in"
         self.press_release_url = "https://www.sebi.gov.in/sebiweb/home/HomeAction.do?doListing=yes&sid=6&ssid=23&smid=0"
         self.driver = None
+        self.holds_pdf_pool = False
         self.scraped_data = []
+        # Releases scraped by earlier runs (or other processes) are reused from here
+        self.ledger = get_scrape_ledger() if config.SCRAPE_LEDGER else None
         
         # News topic to search for
         self.news_topic = news_topic or "securities market"
@@ -109,9 +123,11 @@ class SEBINewsTopicScraperHeadless:
             "download.directory_upgrade": True,
             "plugins.always_open_pdf_externally": True,
             "profile.default_content_settings.popups": 0,
-            "profile.default_content_setting_values.notifications": 2
+            "profile.default_content_setting_values.notifications": 2,
+            **blocking_prefs("sebi"),
         }
         chrome_options.add_experimental_option("prefs", prefs)
+        configure_options(chrome_options)
         
         try:
             # You can specify chromedriver path if needed
@@ -127,6 +143,9 @@ class SEBINewsTopicScraperHeadless:
             self.driver.execute_cdp_cmd('Network.setUserAgentOverride', {
                 "userAgent": 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
             })
+
+            # Skip images, fonts, stylesheets and trackers; only links and PDFs are needed
+            block_resources(self.driver, "sebi")
             
             logger.info("Headless Chrome driver initialized successfully")
             logger.info(f"Browser version: {self.driver.capabilities['browserVersion']}")
@@ -137,35 +156,12 @@ class SEBINewsTopicScraperHeadless:
     
     def calculate_text_similarity(self, text1, text2):
         """Calculate similarity between two text strings"""
-        return SequenceMatcher(None, text1.lower(), text2.lower()).ratio()
+        return dice(shingles(text1), shingles(text2))
     
     def is_news_topic_related(self, text, similarity_threshold=0.3):
         """Check if text is related to the news topic"""
-        if not text:
-            return False, 0, []
-        
-        text_lower = text.lower()
-        found_terms = []
-        max_similarity = 0
-        
-        # Check for key terms presence
-        for term in self.key_terms:
-            if term in text_lower:
-                found_terms.append(term)
-        
-        # Calculate similarity with the original news topic
-        similarity = self.calculate_text_similarity(text, self.news_topic)
-        max_similarity = max(max_similarity, similarity)
-        
-        # Check for partial matches with key terms
-        for term in self.key_terms:
-            term_similarity = self.calculate_text_similarity(text, term)
-            max_similarity = max(max_similarity, term_similarity)
-        
-        # Consider it related if we have term matches OR high similarity
-        is_related = len(found_terms) > 0 or max_similarity >= similarity_threshold
-        
-        return is_related, max_similarity, found_terms
+        # Key-term scan plus shingle similarity, compiled once per topic and shared with the PDF workers
+        return score_text(text, self.news_topic, self.key_terms, similarity_threshold)
     
     def get_press_releases_headless(self, max_pages=5):
         """Scrape SEBI press release links using headless browser"""
@@ -173,15 +169,16 @@ class SEBINewsTopicScraperHeadless:
         
         try:
             logger.info("Navigating to SEBI press releases page (headless)...")
-            self.driver.get(self.press_release_url)
+            with get_fetch_scheduler().slot(self.press_release_url):
+                self.driver.get(self.press_release_url)
             
-            wait = WebDriverWait(self.driver, 20)
+            wait = WebDriverWait(self.driver, config.BROWSER_WAIT_TIMEOUT)
             
             for page in range(max_pages):
                 logger.info(f"Scraping SEBI page {page + 1} (headless)")
                 
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-                time.sleep(3)  # Wait for dynamic content to load
+                # Wait for the dynamic listing to render a release link instead of a fixed delay
+                wait.until(EC.presence_of_element_located((By.XPATH, RELEASE_LINK_XPATH)))
                 
                 # Look for press release links in SEBI's structure
                 # Try multiple selectors as SEBI's structure might vary
@@ -302,7 +299,8 @@ class SEBINewsTopicScraperHeadless:
                         next_button = next_buttons[0]
                         if next_button.is_enabled():
                             self.driver.execute_script("arguments[0].click();", next_button)
-                            time.sleep(3)
+                            # The old page's button goes stale once the next page replaces it
+                            wait.until(EC.staleness_of(next_button))
                             continue
                     else:
                         logger.info("No more pages or reached max pages limit")
@@ -320,20 +318,23 @@ class SEBINewsTopicScraperHeadless:
     def download_pdf_to_memory(self, pdf_url):
         """Download PDF to memory for content checking"""
         try:
-            # Add headers to mimic browser request
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                'Accept': 'application/pdf,application/octet-stream,*/*',
-                'Accept-Language': 'en-US,en;q=0.9',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-            }
+            with time_stage("sebi_pdf_download"):
+                # Add headers to mimic browser request
+                headers = {
+                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+                    'Accept': 'application/pdf,application/octet-stream,*/*',
+                    'Accept-Language': 'en-US,en;q=0.9',
+                    'Accept-Encoding': 'gzip, deflate, br',
+                    'Connection': 'keep-alive',
+                    'Upgrade-Insecure-Requests': '1',
+                }
             
-            response = requests.get(pdf_url, stream=True, timeout=30, headers=headers)
-            response.raise_for_status()
-            return BytesIO(response.content)
+                # The scheduler paces sebi.gov.in and retries transient failures
+                response = http_get(pdf_url, timeout=30, headers=headers)
+                response.raise_for_status()
+                return BytesIO(response.content)
         except Exception as e:
+            record_scraper_error("sebi")
             logger.error(f"Error downloading PDF to memory from {pdf_url}: {e}")
             return None
     
@@ -341,8 +342,11 @@ class SEBINewsTopicScraperHeadless:
         """Alternative: Download PDF using Selenium (if direct requests fail)"""
         try:
             logger.info(f"Downloading SEBI PDF using headless browser: {pdf_url}")
-            self.driver.get(pdf_url)
-            time.sleep(5)  # Wait for download to complete
+            with get_fetch_scheduler().slot(pdf_url):
+                self.driver.get(pdf_url)
+            WebDriverWait(self.driver, config.BROWSER_WAIT_TIMEOUT).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
             
             # Get current URL (might redirect to actual PDF)
             current_url = self.driver.current_url
@@ -361,13 +365,8 @@ class SEBINewsTopicScraperHeadless:
     def extract_text_from_pdf_memory(self, pdf_stream):
         """Extract text content from PDF in memory"""
         try:
-            pdf_reader = PyPDF2.PdfReader(pdf_stream)
-            text = ""
-            
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text.strip()
+            with time_stage("sebi_pdf_extract"):
+                return extract_pdf_text(pdf_stream.getvalue())
         except Exception as e:
             logger.error(f"Error extracting text from PDF in memory: {e}")
             return None
@@ -380,27 +379,39 @@ class SEBINewsTopicScraperHeadless:
         # Sort by title similarity first (prioritize likely matches)
         press_releases_sorted = sorted(press_releases, key=lambda x: x['title_similarity'], reverse=True)
         
-        for release in press_releases_sorted:
+        def download(pdf_url):
+            pdf_stream = self.download_pdf_to_memory(pdf_url)
+            return pdf_stream.getvalue() if pdf_stream else None
+        
+        # Downloads and extraction run ahead in parallel; results still arrive in sorted order
+        pipeline = PDFPipeline(
+            download, "sebi",
+            ledger=self.ledger, release_key=sebi_release_key,
+        )
+        results = pipeline.run(press_releases_sorted, self.news_topic, self.key_terms, similarity_threshold)
+        for result in results:
             if processed_count >= max_pdfs:
+                results.close()
                 break
             
+            release = result.release
             try:
                 logger.info(f"Processing SEBI release (headless): {release['title'][:50]}...")
+                if result.error is not None:
+                    raise result.error
                 
-                # Try direct download first (faster)
-                pdf_stream = self.download_pdf_to_memory(release['pdf_url'])
+                pdf_stream = BytesIO(result.pdf_bytes) if result.pdf_bytes else None
+                analysis = result.analysis
                 
                 # If direct download fails, try using headless browser
-                if not pdf_stream:
+                if not pdf_stream and not analysis:
                     pdf_stream = self.download_pdf_using_selenium(release['pdf_url'])
+                    if pdf_stream:
+                        analysis = analyse_pdf(pdf_stream.getvalue(), release['title'], self.news_topic, self.key_terms, similarity_threshold)
                 
-                if pdf_stream:
-                    pdf_text = self.extract_text_from_pdf_memory(pdf_stream)
-                    
-                    if pdf_text:
-                        # Check for news topic relevance in both title and content
-                        title_is_related, title_similarity, title_terms = self.is_news_topic_related(release['title'], similarity_threshold)
-                        content_is_related, content_similarity, content_terms = self.is_news_topic_related(pdf_text, similarity_threshold)
+                if pdf_stream or analysis:
+                    if analysis:
+                        pdf_text, (title_is_related, title_similarity, title_terms), (content_is_related, content_similarity, content_terms) = analysis
                         
                         # Combine all found terms
                         all_terms = list(set(title_terms + content_terms))
@@ -418,6 +429,8 @@ class SEBINewsTopicScraperHeadless:
                             # Optionally save the PDF file if it's related to the topic
                             pdf_file_path = None
                             if save_matching_pdfs:
+                                # Releases served from the scrape ledger were not downloaded this run
+                                pdf_stream = pdf_stream or self.download_pdf_to_memory(release['pdf_url'])
                                 pdf_file_path = self.save_pdf_from_memory(pdf_stream, safe_filename)
                             
                             # Store the data
@@ -446,7 +459,6 @@ class SEBINewsTopicScraperHeadless:
                             logger.info(f"✗ Not related to topic, skipping SEBI: {release['title'][:50]}... (Similarity: {max_similarity:.2f})")
                         
                         processed_count += 1
-                        time.sleep(0.5)  # Reduced delay for headless mode
                     else:
                         logger.warning(f"Could not extract text from SEBI PDF: {release['title'][:50]}...")
                 else:
@@ -529,11 +541,17 @@ class SEBINewsTopicScraperHeadless:
     def cleanup(self):
         """Close headless browser and cleanup"""
         if self.driver:
+            record_network_stats(self.driver, "sebi")
             self.driver.quit()
             logger.info("Headless browser closed")
+        if self.holds_pdf_pool:
+            self.holds_pdf_pool = False
+            release_pdf_process_pool()
     
     def run_news_topic_scraping(self, max_pages=3, max_pdfs=10, save_matching_pdfs=False, similarity_threshold=0.3):
         """Run the complete SEBI news topic scraping process"""
+        hold_pdf_process_pool()
+        self.holds_pdf_pool = True
         try:
             logger.info("Starting SEBI News Topic headless scraping...")
             logger.info(f"Target news topic: '{self.news_topic[:100]}...'")
@@ -545,7 +563,8 @@ class SEBINewsTopicScraperHeadless:
             self.setup_headless_chrome_driver()
             
             # Get press release links
-            press_releases = self.get_press_releases_headless(max_pages=max_pages)
+            with time_stage("sebi_listing"):
+                press_releases = self.get_press_releases_headless(max_pages=max_pages)
             
             if not press_releases:
                 logger.error("No SEBI press releases found")
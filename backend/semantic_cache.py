@@ -0,0 +1,154 @@
+import time
+import uuid
+import logging
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from backend import config
+from backend.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticVerdictCache:
+    """
+    Near-duplicate verdict cache over MiniLM embeddings of verified claims.
+
+    Claims are kept in a fixed-capacity matrix of unit vectors, so a lookup is
+    one matrix-vector product. When full, the least recently used entry is
+    evicted. Every entry records where its verdict came from and how often it
+    has been served, so answers can be audited back to the original claim.
+    """
+
+    def __init__(self, threshold=None, max_entries=None, ttl=None):
+        self.threshold = config.SEMANTIC_CACHE_THRESHOLD if threshold is None else threshold
+        self.max_entries = max_entries or config.SEMANTIC_CACHE_SIZE
+        self.ttl = config.VERDICT_CACHE_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._entries = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _unit(embedding):
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _is_fresh(self, entry, now):
+        return self.ttl <= 0 or now - entry["created_at"] < self.ttl
+
+    def lookup(self, embedding):
+        """Return (verdict, provenance) for the closest fresh claim above the threshold, or None"""
+        query = self._unit(embedding)
+        now = time.time()
+        with self._lock:
+            if not self._entries:
+                self.misses += 1
+                record_cache_lookup("semantic", False)
+                return None
+            sims = self._vectors[:len(self._entries)] @ query
+            for idx in np.argsort(sims)[::-1]:
+                similarity = float(sims[idx])
+                if similarity < self.threshold:
+                    break
+                entry = self._entries[idx]
+                if not self._is_fresh(entry, now):
+                    continue
+                entry["hits"] += 1
+                entry["last_used"] = now
+                self.hits += 1
+                record_cache_lookup("semantic", True)
+                provenance = {
+                    "tier": "semantic",
+                    "similarity": similarity,
+                    "entry_id": entry["id"],
+                    "matched_claim": entry["claim"],
+                    "verified_at": datetime.fromtimestamp(entry["created_at"]).isoformat(),
+                    "sources": list(entry["sources"]),
+                }
+                return dict(entry["verdict"]), provenance
+            self.misses += 1
+            record_cache_lookup("semantic", False)
+            return None
+
+    def add(self, claim, embedding, verdict, sources=None):
+        """Index a freshly verified claim; error results are never stored"""
+        if not isinstance(verdict, dict) or "error" in verdict:
+            return None
+        vector = self._unit(embedding)
+        now = time.time()
+        entry = {
+            "id": uuid.uuid4().hex,
+            "claim": claim,
+            "verdict": dict(verdict),
+            "sources": list(sources or []),
+            "created_at": now,
+            "last_used": now,
+            "hits": 0,
+        }
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+            if len(self._entries) < self.max_entries:
+                idx = len(self._entries)
+                self._entries.append(entry)
+            else:
+                idx = self._victim(now)
+                logger.debug(f"Evicting semantic cache entry {self._entries[idx]['id']}")
+                self._entries[idx] = entry
+                self.evictions += 1
+            self._vectors[idx] = vector
+        return entry["id"]
+
+    def _victim(self, now):
+        # Prefer an expired slot, otherwise the least recently used one
+        for idx, entry in enumerate(self._entries):
+            if not self._is_fresh(entry, now):
+                return idx
+        return min(range(len(self._entries)), key=lambda i: self._entries[i]["last_used"])
+
+    def audit(self):
+        """Provenance of every cached claim, most served first"""
+        with self._lock:
+            entries = sorted(self._entries, key=lambda e: e["hits"], reverse=True)
+            return [
+                {
+                    "entry_id": e["id"],
+                    "claim": e["claim"],
+                    "verified_at": datetime.fromtimestamp(e["created_at"]).isoformat(),
+                    "sources": list(e["sources"]),
+                    "hits": e["hits"],
+                    "verdict": e["verdict"].get("verdict"),
+                }
+                for e in entries
+            ]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+        }
+
+
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+
+def get_semantic_cache():
+    global _semantic_cache
+    if _semantic_cache is None:
+        with _semantic_cache_lock:
+            if _semantic_cache is None:
+                _semantic_cache = SemanticVerdictCache()
+    return _semantic_cache
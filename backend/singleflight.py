@@ -0,0 +1,111 @@
+import asyncio
+from collections import Counter
+
+
+class _StreamFlight:
+    """One shared async iterator, its items buffered so every subscriber sees them all from the start"""
+
+    def __init__(self, iterator, on_abandon):
+        self.items = []
+        self.error = None
+        self.finished = False
+        self.subscribers = 0
+        self._on_abandon = on_abandon
+        self._changed = asyncio.Event()
+        self.task = asyncio.ensure_future(self._drive(iterator))
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _drive(self, iterator):
+        try:
+            async for item in iterator:
+                self.items.append(item)
+                self._notify()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = True
+            self._notify()
+
+    async def subscribe(self):
+        self.subscribers += 1
+        position = 0
+        try:
+            while True:
+                while position < len(self.items):
+                    yield self.items[position]
+                    position += 1
+                if self.finished:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await self._changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.finished:
+                # Nobody is listening any more; stop the underlying work instead of finishing it unseen
+                self._on_abandon()
+                self.task.cancel()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is still running await that same task and receive its result
+    (or exception). The task is shielded, so a caller disconnecting does not
+    cancel the work for the others. stream() does the same for async
+    iterators such as streamed LLM tokens. Keys are tuples whose first element
+    names the stage, which is also used for the per-stage counters.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self._streams = {}
+        self.executed = Counter()
+        self.coalesced = Counter()
+
+    async def do(self, key, fn, *args, **kwargs):
+        task = self._tasks.get(key)
+        if task is not None:
+            self.coalesced[key[0]] += 1
+            return await asyncio.shield(task)
+        self.executed[key[0]] += 1
+        task = asyncio.ensure_future(fn(*args, **kwargs))
+        self._tasks[key] = task
+        task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def stream(self, key, fn, *args, **kwargs):
+        """
+        Async-iterator form of do(). The first caller's fn(*args, **kwargs) is
+        driven once; every caller for the key receives all of its items, a late
+        joiner starting with a replay of those already produced. The work is
+        cancelled once its last subscriber has gone.
+        """
+        flight = self._streams.get(key)
+        if flight is None:
+            self.executed[key[0]] += 1
+            flight = _StreamFlight(fn(*args, **kwargs), lambda: self._drop_stream(key, flight))
+            self._streams[key] = flight
+            flight.task.add_done_callback(lambda _: self._drop_stream(key, flight))
+        else:
+            self.coalesced[key[0]] += 1
+        async for item in flight.subscribe():
+            yield item
+
+    def _drop_stream(self, key, flight):
+        if self._streams.get(key) is flight:
+            del self._streams[key]
+
+    def in_flight(self):
+        return len(self._tasks) + len(self._streams)
+
+    def stats(self):
+        return {
+            stage: {"executed": self.executed[stage], "coalesced": self.coalesced[stage]}
+            for stage in sorted(set(self.executed) | set(self.coalesced))
+        }
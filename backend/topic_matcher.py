@@ -0,0 +1,69 @@
+"""
+Topic relevance scoring for scraped press releases, built once per news topic.
+
+A difflib.SequenceMatcher ratio between a whole document and the topic (and
+again against every key term) is quadratic in document length, and long
+circulars made it dominate scraping CPU. TopicMatcher instead precomputes
+the lowercased key terms and the word shingles of the topic and of each term.
+Scoring a document is then one scan per key term and one pass to shingle the
+document, both linear in its length.
+"""
+import re
+import functools
+
+WORD = re.compile(r"\w+")
+
+
+def shingles(text):
+    """Word unigrams and bigrams of the lowercased text"""
+    tokens = WORD.findall(text.lower())
+    return set(tokens).union(zip(tokens, tokens[1:]))
+
+
+def dice(a, b):
+    """Dice coefficient of two shingle sets, between 0 and 1"""
+    if not a and not b:
+        return 0.0
+    # Set intersection walks the smaller set, so a huge document costs nothing extra here
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class TopicMatcher:
+    def __init__(self, news_topic, key_terms):
+        self.news_topic = news_topic
+        self.key_terms = list(key_terms)
+        self._lowered = [term.lower() for term in self.key_terms]
+        self._topic_shingles = shingles(news_topic)
+        self._term_shingles = [shingles(term) for term in self.key_terms]
+
+    def found_terms(self, text_lower):
+        # str.__contains__ is a C-level substring search; on CPython a scan per term
+        # beats walking a Python-level automaton over every character by about 10x
+        return [term for term, lowered in zip(self.key_terms, self._lowered) if lowered in text_lower]
+
+    def similarity(self, text):
+        text_shingles = shingles(text)
+        best = dice(text_shingles, self._topic_shingles)
+        for term_shingles in self._term_shingles:
+            best = max(best, dice(text_shingles, term_shingles))
+        return best
+
+    def score(self, text, similarity_threshold=0.3):
+        """(is_related, max_similarity, found_terms), the tuple is_news_topic_related returns"""
+        if not text:
+            return False, 0, []
+        found = self.found_terms(text.lower())
+        max_similarity = self.similarity(text)
+        # Related if we have term matches OR high similarity
+        is_related = len(found) > 0 or max_similarity >= similarity_threshold
+        return is_related, max_similarity, found
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_matcher(news_topic, key_terms):
+    return TopicMatcher(news_topic, key_terms)
+
+
+def get_topic_matcher(news_topic, key_terms):
+    """Matcher for the topic, built once and reused (also within each PDF worker process)"""
+    return _cached_matcher(news_topic, tuple(key_terms))
@@ -0,0 +1,161 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+from backend import config
+from backend.metrics import record_cache_lookup
+from backend.sqlite_store import connect
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text):
+    """Lowercase, drop punctuation and collapse whitespace so trivially different copies share a key"""
+    text = re.sub(r"[^\w\s]", "", text.lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def cache_key(text):
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class VerdictCache:
+    """
+    Two-tier cache of pipeline verdicts keyed by normalized news text.
+
+    The in-memory tier is a bounded LRU; the SQLite tier survives restarts.
+    Entries older than the TTL are treated as misses and removed.
+    """
+
+    def __init__(self, db_path=None, ttl=None, memory_size=None, disk_size=None):
+        self.db_path = db_path or os.path.join(config.CACHE_DIR, "verdicts.sqlite3")
+        self.ttl = config.VERDICT_CACHE_TTL if ttl is None else ttl
+        self.memory_size = memory_size or config.VERDICT_CACHE_MEMORY_SIZE
+        self.disk_size = disk_size or config.VERDICT_CACHE_DISK_SIZE
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._conn = connect(self.db_path)
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS verdicts (
+                key TEXT PRIMARY KEY,
+                normalized_text TEXT NOT NULL,
+                verdict TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS verdicts_accessed_at ON verdicts (accessed_at)")
+
+    def _is_fresh(self, created_at, now):
+        return self.ttl <= 0 or now - created_at < self.ttl
+
+    def _remember(self, key, verdict, created_at):
+        self._memory[key] = (verdict, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get(self, text):
+        """Return a copy of the cached verdict for this text, or None"""
+        key = cache_key(text)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                verdict, created_at = entry
+                if self._is_fresh(created_at, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    record_cache_lookup("verdict", True)
+                    return dict(verdict)
+                del self._memory[key]
+                self.expired += 1
+
+            row = self._conn.execute("SELECT verdict, created_at FROM verdicts WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                verdict, created_at = json.loads(row[0]), row[1]
+                if self._is_fresh(created_at, now):
+                    self._conn.execute("UPDATE verdicts SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._remember(key, verdict, created_at)
+                    self.disk_hits += 1
+                    record_cache_lookup("verdict", True)
+                    return dict(verdict)
+                self._conn.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                self.expired += 1
+
+            self.misses += 1
+            record_cache_lookup("verdict", False)
+            return None
+
+    def set(self, text, verdict):
+        """Store a verdict; error results are never cached"""
+        if not isinstance(verdict, dict) or "error" in verdict:
+            return
+        key = cache_key(text)
+        now = time.time()
+        with self._lock:
+            self._remember(key, dict(verdict), now)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, normalized_text, verdict, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, normalize_text(text), json.dumps(verdict, ensure_ascii=False), now, now),
+            )
+            self._evict_disk()
+
+    def _evict_disk(self):
+        count = self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+        if count > self.disk_size:
+            self._conn.execute(
+                "DELETE FROM verdicts WHERE key IN (SELECT key FROM verdicts ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.disk_size,),
+            )
+
+    def purge_expired(self):
+        """Drop every expired entry from both tiers"""
+        if self.ttl <= 0:
+            return 0
+        cutoff = time.time() - self.ttl
+        with self._lock:
+            for key in [k for k, (_, created_at) in self._memory.items() if created_at <= cutoff]:
+                del self._memory[key]
+            cursor = self._conn.execute("DELETE FROM verdicts WHERE created_at <= ?", (cutoff,))
+            return cursor.rowcount
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._conn.execute("DELETE FROM verdicts")
+
+    def stats(self):
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+            "ttl_seconds": self.ttl,
+        }
+
+
+_verdict_cache = None
+_verdict_cache_lock = threading.Lock()
+
+
+def get_verdict_cache():
+    global _verdict_cache
+    if _verdict_cache is None:
+        with _verdict_cache_lock:
+            if _verdict_cache is None:
+                _verdict_cache = VerdictCache()
+    return _verdict_cache
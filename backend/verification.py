@@ -0,0 +1,304 @@
+import re
+import asyncio
+import hashlib
+import logging
+from backend.article_fetcher import get_article_fetcher
+from backend.rag_pipeline import (
+    split_documents, retrieve_context, retrieve_contexts_batch, generate_response, stream_response,
+    parse_response,
+)
+from backend import config
+from backend.metrics import LINKS_FOUND, CHUNKS_PRODUCED, time_stage
+from backend.resources import get_resources
+from backend.search_cache import get_search_cache
+from backend.search_fanout import fan_out
+from backend.news_ingest import get_news_index
+from backend.singleflight import SingleFlight
+from backend.verdict_cache import get_verdict_cache, cache_key
+from backend.semantic_cache import get_semantic_cache
+
+logger = logging.getLogger(__name__)
+
+# Identical work requested concurrently (same headline, query, article or prompt) runs once
+flights = SingleFlight()
+
+
+def extract_keywords(text):
+    stopwords = {"the", "is", "in","headline", "at", "of", "on", "and", "a", "to", "after", "has", "with", "for", "by", "an", "as", "it", "from", "this", "that", "be", "are", "was", "were", "or", "but", "not", "which", "have", "had", "will", "would", "can", "could", "should", "may", "might", "do", "does", "did", "so", "such", "if", "then", "than", "also", "their", "its", "about", "into", "more", "other", "some", "any", "all", "no", "only", "over", "out", "up", "down", "off", "just", "now", "like", "because", "how", "when", "where", "who", "what", "why"}
+    words = re.findall(r"\w+", text)
+    keywords = [word for word in words if word.lower() not in stopwords]
+
+    return " ".join(keywords[:10])
+
+
+async def _search_source(name, fn, keywords, executor):
+    links = await executor.run("scrape", fn, keywords)
+    # Stored inside the flight, so a search that outlives the fan-out budget still fills the cache
+    await asyncio.to_thread(get_search_cache().set, name, keywords, links)
+    return links
+
+
+async def search_sources(keywords, executor):
+    """Search every enabled source at once; returns (links, per-source report)"""
+    query = " ".join(keywords.lower().split())
+    search_cache = get_search_cache()
+
+    async def run(name, fn):
+        cached = await asyncio.to_thread(search_cache.get, name, query)
+        if cached is not None:
+            return cached
+        return await flights.do(("search", name, query), _search_source, name, fn, keywords, executor)
+
+    return await fan_out(run)
+
+
+async def search_links(keywords, executor):
+    links, _ = await search_sources(keywords, executor)
+    return links
+
+
+async def load_articles(links):
+    """Fetch all articles concurrently, once per in-flight URL; failed or overdue articles are skipped"""
+    fetcher = get_article_fetcher()
+
+    async def fetch(url):
+        return [await fetcher.load(url)]
+
+    tasks = {url: asyncio.ensure_future(flights.do(("article", url), fetch, url)) for url in dict.fromkeys(links)}
+    if not tasks:
+        return {}
+    # The fetches are shielded flights, so abandoning one here still lets it finish into the article store
+    with time_stage("article_load"):
+        await asyncio.wait(tasks.values(), timeout=config.FETCH_TOTAL_TIMEOUT)
+    docs_by_url = {}
+    for url, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            logger.warning(f"Gave up on {url} after {config.FETCH_TOTAL_TIMEOUT}s")
+        elif task.exception() is not None:
+            logger.warning(f"Failed to load {url}: {task.exception()}")
+        else:
+            docs_by_url[url] = task.result()
+    return docs_by_url
+
+
+async def search_index(embedding, executor):
+    """Chunks from the ingested news index close to the claim; empty when the index cannot help"""
+    if not config.INGEST_ENABLED:
+        return []
+    try:
+        return await executor.run("embed", get_news_index().search, embedding)
+    except Exception as e:
+        logger.warning(f"News index lookup failed, falling back to live search: {e}")
+        return []
+
+
+def _index_sources(docs):
+    return list(dict.fromkeys(doc.metadata.get("source") for doc in docs if doc.metadata.get("source")))
+
+
+def _context_hash(context_docs):
+    return hashlib.sha256("\x00".join(doc.page_content for doc in context_docs).encode("utf-8")).hexdigest()
+
+
+async def _generate(news_text, context_docs, executor, resources):
+    return await flights.do(
+        ("generate", cache_key(news_text), _context_hash(context_docs)),
+        executor.run, "generate", generate_response, news_text, context_docs, resources,
+    )
+
+
+def _stream_generate(news_text, context_docs, executor, resources):
+    # One LLM stream per claim and context; concurrent viewers share its tokens, replayed from the start
+    return flights.stream(
+        ("generate_stream", cache_key(news_text), _context_hash(context_docs)),
+        executor.iterate, "generate", stream_response, news_text, context_docs, resources,
+    )
+
+
+async def verify_news_events(news_text, executor, stream_tokens=True):
+    """
+    Run the verification for one news text, yielding (event, data) pairs as each stage finishes.
+
+    The final event is always "verdict" carrying the same dict verify_news returns.
+    Identical concurrent generations are coalesced either way; with
+    stream_tokens=False the LLM output arrives in one piece.
+    """
+    key = cache_key(news_text)
+    verdict_cache = get_verdict_cache()
+    cached = await asyncio.to_thread(verdict_cache.get, news_text)
+    if cached is not None:
+        yield "verdict", cached
+        return
+
+    # Near-duplicate wording of an already verified claim skips scraping and generation
+    resources = get_resources()
+    semantic_cache = get_semantic_cache()
+    embedding = await flights.do(("embed", key), executor.run, "embed", resources.embeddings.embed_query, news_text)
+    match = semantic_cache.lookup(embedding)
+    if match is not None:
+        verdict, provenance = match
+        logger.info(f"Semantic cache hit ({provenance['similarity']:.3f}) from claim {provenance['entry_id']}")
+        verdict["cache"] = provenance
+        yield "verdict", verdict
+        return
+
+    # Stories the background ingester has already indexed need no live search
+    indexed = await search_index(embedding, executor)
+    if len(indexed) >= config.INDEX_MIN_HITS:
+        context_docs = indexed
+        links = _index_sources(indexed)
+        LINKS_FOUND.observe(len(links))
+        yield "links", {"links": links, "sources": {"index": {"status": "ok", "links": len(links)}}}
+        yield "chunks", {"total": len(indexed), "retrieved": [doc.page_content[:200] for doc in context_docs]}
+    else:
+        keywords = extract_keywords(news_text)
+        yield "keywords", {"keywords": keywords}
+        links, sources = await search_sources(keywords, executor)
+        LINKS_FOUND.observe(len(links))
+        yield "links", {"links": links, "sources": sources}
+        docs_by_url = await load_articles(links)
+        docs = [doc for url in links if url in docs_by_url for doc in docs_by_url[url]]
+        yield "documents", {"count": len(docs)}
+        splits = await executor.run("embed", split_documents, docs, resources)
+        CHUNKS_PRODUCED.observe(len(splits))
+        context_docs = await flights.do(
+            ("retrieve", key, tuple(docs_by_url)), executor.run, "embed", retrieve_context, news_text, splits, resources
+        )
+        yield "chunks", {"total": len(splits), "retrieved": [doc.page_content[:200] for doc in context_docs]}
+
+    if stream_tokens:
+        tokens = []
+        async for token in _stream_generate(news_text, context_docs, executor, resources):
+            tokens.append(token)
+            yield "token", {"text": token}
+        response = "".join(tokens)
+    else:
+        response = await _generate(news_text, context_docs, executor, resources)
+    result = parse_response(response)
+    await asyncio.to_thread(verdict_cache.set, news_text, result)
+    semantic_cache.add(news_text, embedding, result, sources=links)
+    yield "verdict", result
+
+
+async def _verify_news(news_text, executor):
+    result = None
+    async for event, data in verify_news_events(news_text, executor, stream_tokens=False):
+        if event == "verdict":
+            result = data
+    return result
+
+
+async def verify_news(news_text, executor):
+    """Extract keywords, search trusted sources and run the RAG pipeline for one news text"""
+    # Concurrent requests for the same normalized text share one verification
+    return await flights.do(("verify", cache_key(news_text)), _verify_news, news_text, executor)
+
+
+def _error_result(e):
+    return {"error": f"{type(e).__name__}: {e}"}
+
+
+async def verify_batch(news_texts, executor):
+    """
+    Verify many news texts at once, sharing work between them.
+
+    Cache lookups and query embeddings are batched, each distinct keyword
+    query is searched once, each distinct article is fetched and split once,
+    and all chunks are embedded in one call. Failures are reported per item.
+
+    Verdict cache hits are free; the rest of the batch runs under
+    executor.slots_for(misses) admission slots and may raise Overloaded.
+    """
+    resources = get_resources()
+    verdict_cache = get_verdict_cache()
+    results = [None] * len(news_texts)
+
+    pending = []
+    # One trip off the event loop for every lookup; the cache does SQLite I/O under its lock
+    cached_verdicts = await asyncio.to_thread(lambda: [verdict_cache.get(text) for text in news_texts])
+    for i, cached in enumerate(cached_verdicts):
+        if cached is not None:
+            results[i] = cached
+        else:
+            pending.append(i)
+    if not pending:
+        return results
+    async with executor.admission(executor.slots_for(len(pending))):
+        await _verify_pending(news_texts, pending, results, executor, resources)
+    return results
+
+
+async def _verify_pending(news_texts, pending, results, executor, resources):
+    # Fills results in for the texts that missed the verdict cache
+    verdict_cache = get_verdict_cache()
+    semantic_cache = get_semantic_cache()
+    embeddings = await executor.run("embed", resources.embeddings.embed_documents, [news_texts[i] for i in pending])
+    query_embeddings = dict(zip(pending, embeddings))
+    remaining = []
+    for i in pending:
+        match = semantic_cache.lookup(query_embeddings[i])
+        if match is not None:
+            verdict, provenance = match
+            verdict["cache"] = provenance
+            results[i] = verdict
+        else:
+            remaining.append(i)
+    if not remaining:
+        return
+
+    # Items the local news index already covers skip the live search
+    indexed = await asyncio.gather(*(search_index(query_embeddings[i], executor) for i in remaining))
+    index_contexts = {i: docs for i, docs in zip(remaining, indexed) if len(docs) >= config.INDEX_MIN_HITS}
+    remaining = [i for i in remaining if i not in index_contexts]
+
+    # Search each distinct keyword query once
+    keywords = {i: extract_keywords(news_texts[i]) for i in remaining}
+    queries = list(dict.fromkeys(keywords.values()))
+    searched = await asyncio.gather(*(search_links(q, executor) for q in queries), return_exceptions=True)
+    links_by_query = dict(zip(queries, searched))
+
+    item_links = {}
+    for i in remaining:
+        found = links_by_query[keywords[i]]
+        if isinstance(found, BaseException):
+            results[i] = _error_result(found)
+        else:
+            item_links[i] = list(dict.fromkeys(found))
+
+    # Fetch and split each distinct article once
+    urls = list(dict.fromkeys(url for links in item_links.values() for url in links))
+    docs_by_url = await load_articles(urls)
+    splits_by_url = {}
+    for url, docs in docs_by_url.items():
+        splits_by_url[url] = await executor.run("embed", split_documents, docs, resources)
+
+    items = [i for i in item_links if results[i] is None]
+    item_splits = [[chunk for url in item_links[i] for chunk in splits_by_url.get(url, [])] for i in items]
+    contexts = []
+    if items:
+        try:
+            contexts = await executor.run(
+                "embed", retrieve_contexts_batch, [query_embeddings[i] for i in items], item_splits, resources
+            )
+        except Exception as e:
+            for i in items:
+                results[i] = _error_result(e)
+            items = []
+    for i, docs in index_contexts.items():
+        item_links[i] = _index_sources(docs)
+    items = list(items) + list(index_contexts)
+    contexts = list(contexts) + list(index_contexts.values())
+
+    responses = await asyncio.gather(
+        *(_generate(news_texts[i], context, executor, resources) for i, context in zip(items, contexts)),
+        return_exceptions=True,
+    )
+    for i, response in zip(items, responses):
+        if isinstance(response, BaseException):
+            results[i] = _error_result(response)
+            continue
+        result = parse_response(response)
+        await asyncio.to_thread(verdict_cache.set, news_texts[i], result)
+        semantic_cache.add(news_texts[i], query_embeddings[i], result, sources=item_links[i])
+        results[i] = result
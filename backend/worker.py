@@ -0,0 +1,144 @@
+"""
+Verification worker processes for the durable job queue.
+
+Run separately from the API, e.g. `python -m backend.worker --processes 4`.
+Each process loads and warms its own models once, then leases jobs from the
+queue until stopped. The supervisor restarts any process that dies; the job
+it was holding is picked up again when its lease expires. A process that
+keeps dying soon after starting (models that fail to load, say) is restarted
+with growing delays and given up after JOB_MAX_RESTARTS attempts in a row.
+"""
+import os
+import time
+import uuid
+import signal
+import socket
+import asyncio
+import logging
+import argparse
+import multiprocessing
+
+from backend import config
+from backend.article_fetcher import close_article_fetcher
+from backend.browser_pool import close_browser_pool
+from backend.executor import VerificationExecutor
+from backend.job_queue import JobQueue
+from backend.metrics import record_job_outcome
+from backend.resources import init_resources
+from backend.verification import verify_news
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+
+async def _heartbeat(queue, job_id, worker_id):
+    while True:
+        await asyncio.sleep(queue.lease_seconds / 3)
+        if not await asyncio.to_thread(queue.heartbeat, job_id, worker_id):
+            logger.warning(f"Lost lease on job {job_id}")
+            return
+
+
+async def _work(worker_id, stop):
+    queue = JobQueue()
+    executor = VerificationExecutor()
+    try:
+        while not stop.is_set():
+            job = await asyncio.to_thread(queue.lease, worker_id)
+            if job is None:
+                await asyncio.sleep(config.JOB_POLL_INTERVAL)
+                continue
+            job_id, text = job
+            logger.info(f"[{worker_id}] Processing job {job_id}")
+            heartbeat = asyncio.create_task(_heartbeat(queue, job_id, worker_id))
+            try:
+                result = await verify_news(text, executor)
+            except Exception as e:
+                logger.error(f"[{worker_id}] Job {job_id} failed: {e}")
+                if await asyncio.to_thread(queue.fail, job_id, worker_id, f"{type(e).__name__}: {e}"):
+                    record_job_outcome("failed")
+                else:
+                    record_job_outcome("lost_lease")
+                    logger.warning(f"[{worker_id}] Lease on job {job_id} was lost before its failure was recorded")
+            else:
+                # False when the lease expired and the job went to another worker, whose result will stand
+                if await asyncio.to_thread(queue.complete, job_id, worker_id, result):
+                    record_job_outcome("completed")
+                    logger.info(f"[{worker_id}] Completed job {job_id}")
+                else:
+                    record_job_outcome("lost_lease")
+                    logger.warning(f"[{worker_id}] Lease on job {job_id} was lost, discarding its result")
+            finally:
+                heartbeat.cancel()
+    finally:
+        executor.shutdown()
+        await close_article_fetcher()
+        close_browser_pool()
+
+
+def run_worker(stop=None):
+    """Entry point of one worker process"""
+    stop = stop or multiprocessing.Event()
+    # The supervisor owns shutdown: Ctrl+C stops it, and it signals the workers through `stop`
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    init_resources()
+    logger.info(f"Worker {worker_id} ready")
+    asyncio.run(_work(worker_id, stop))
+
+
+def supervise(processes):
+    """Keep `processes` workers alive until interrupted"""
+    stop = multiprocessing.Event()
+
+    def spawn():
+        process = multiprocessing.Process(target=run_worker, args=(stop,), daemon=False)
+        process.start()
+        return process, time.monotonic()
+
+    workers = [spawn() for _ in range(processes)]
+    # Per slot: consecutive early deaths, and when the next restart is due
+    failures = [0] * processes
+    restart_at = [None] * processes
+    try:
+        while any(worker is not None for worker in workers):
+            time.sleep(2)
+            now = time.monotonic()
+            for i, worker in enumerate(workers):
+                if worker is None:
+                    continue
+                process, started = worker
+                if process.is_alive():
+                    continue
+                if restart_at[i] is None:
+                    failures[i] = 0 if now - started >= config.JOB_RESTART_MIN_UPTIME else failures[i] + 1
+                    if config.JOB_MAX_RESTARTS and failures[i] > config.JOB_MAX_RESTARTS:
+                        logger.error(f"Worker pid {process.pid} died {failures[i]} times in a row, giving up on it")
+                        workers[i] = None
+                        continue
+                    delay = min(2 ** failures[i], config.JOB_RESTART_MAX_BACKOFF) if failures[i] else 0
+                    logger.warning(f"Worker pid {process.pid} exited with {process.exitcode}, restarting in {delay}s")
+                    restart_at[i] = now + delay
+                if now >= restart_at[i]:
+                    restart_at[i] = None
+                    workers[i] = spawn()
+        logger.error("No workers left running")
+    except KeyboardInterrupt:
+        logger.info("Stopping workers...")
+    finally:
+        stop.set()
+        for worker in workers:
+            if worker is None:
+                continue
+            process = worker[0]
+            process.join(timeout=config.JOB_LEASE_SECONDS)
+            if process.is_alive():
+                process.terminate()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run verification workers for the job queue")
+    parser.add_argument("--processes", type=int, default=config.JOB_WORKERS)
+    args = parser.parse_args()
+    supervise(args.processes)
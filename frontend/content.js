@@ -158,25 +158,77 @@
     };
   }
   
-  // Send to FastAPI backend and show result in popup
-  function sendToBackend(data) {
+  // Show pipeline progress in the loading panel while the verdict streams in
+  function showProgress(stage, detail) {
+    showDetectionResult({}, true);
+    const resultDiv = document.getElementById("fake-news-extension-panel");
+    resultDiv.innerHTML = `<div style="display:flex;flex-direction:column;align-items:center;justify-content:center;min-height:100px;">
+        <span style="font-size:2em;">⏳</span>
+        <b style="margin-top:10px;">${stage}</b>
+        ${detail ? `<span style="margin-top:8px;font-size:0.85em;white-space:pre-wrap;max-height:150px;overflow:auto;">${detail}</span>` : ""}
+      </div>`;
+  }
+
+  function escapeHtml(text) {
+    const div = document.createElement("div");
+    div.innerText = text;
+    return div.innerHTML;
+  }
+
+  // Send to FastAPI backend and stream progress events until the verdict arrives
+  async function sendToBackend(data) {
     showDetectionResult({}, true); // Show loading verdict immediately
     const fullText = `📰 Headline:\n${data.headline}\n\n📄 Description:\n${data.description}`;
-    fetch("http://127.0.0.1:8000/run_rag_pipeline/", {
-      method: "POST",
-      headers: {
-        "Content-Type": "application/json"
-      },
-      body: JSON.stringify({ text: fullText })
-    })
-      .then(res => res.json())
-      .then(result => {
-        showDetectionResult(result); // Show the backend verdict/result in the extension panel
-      })
-      .catch(err => {
-        console.error("❌ Failed to send data:", err);
-        alert("Error checking news authenticity: " + err.message);
+    try {
+      const response = await fetch("http://127.0.0.1:8000/run_rag_pipeline/stream", {
+        method: "POST",
+        headers: {
+          "Content-Type": "application/json"
+        },
+        body: JSON.stringify({ text: fullText })
       });
+      if (!response.ok) {
+        throw new Error(`Backend returned ${response.status}`);
+      }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      let generated = "";
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split("\n\n");
+        buffer = events.pop();
+        for (const raw of events) {
+          const eventLine = raw.split("\n").find(line => line.startsWith("event: "));
+          const dataLine = raw.split("\n").find(line => line.startsWith("data: "));
+          if (!eventLine || !dataLine) continue;
+          const event = eventLine.slice(7);
+          const payload = JSON.parse(dataLine.slice(6));
+          if (event === "keywords") {
+            showProgress("Searching trusted sources...", escapeHtml(payload.keywords));
+          } else if (event === "links") {
+            showProgress(`Found ${payload.links.length} articles, loading...`);
+          } else if (event === "documents") {
+            showProgress(`Loaded ${payload.count} documents, finding relevant passages...`);
+          } else if (event === "chunks") {
+            showProgress("Generating verdict...");
+          } else if (event === "token") {
+            generated += payload.text;
+            showProgress("Generating verdict...", escapeHtml(generated));
+          } else if (event === "verdict") {
+            showDetectionResult(payload); // Show the backend verdict/result in the extension panel
+          } else if (event === "error") {
+            throw new Error(payload.error);
+          }
+        }
+      }
+    } catch (err) {
+      console.error("❌ Failed to send data:", err);
+      alert("Error checking news authenticity: " + err.message);
+    }
   }
 
   // When button is clicked
@@ -0,0 +1,48 @@
+from backend.article_store import ArticleStore, canonical_url
+
+
+def page(text):
+    return f"<html><head><title>Story</title></head><body><article><p>{text}</p></article></body></html>"
+
+
+def make_store(tmp_path, **overrides):
+    return ArticleStore(db_path=str(tmp_path / "articles.sqlite3"), **{"max_bytes": 10_000, "fresh_seconds": 60, **overrides})
+
+
+def stored_bytes(store):
+    return store._conn.execute("SELECT COALESCE(SUM(size), 0) FROM contents").fetchone()[0]
+
+
+def test_canonical_url_drops_tracking_and_fragments():
+    assert canonical_url("HTTPS://Example.com/a?utm_source=x&b=2&a=1#top") == "https://example.com/a?a=1&b=2"
+
+
+def test_syndicated_copies_share_text(tmp_path):
+    store = make_store(tmp_path)
+    store.store("https://a.com/story", page("same story " * 20))
+    store.store("https://b.com/story", page("same story " * 20))
+    stats = store.stats()
+    assert stats["unique_contents"] == 1
+    assert stats["stored_bytes"] == stored_bytes(store)
+
+
+def test_running_total_tracks_replacements_and_evictions(tmp_path):
+    store = make_store(tmp_path, max_bytes=3_000)
+    for i in range(30):
+        store.store(f"https://a.com/{i}", page(f"story {i} " * 30))
+        store.store(f"https://b.com/{i}", page(f"story {i} " * 30))
+    store.store("https://a.com/29", page("rewritten " * 30))
+    total = store.stats()["stored_bytes"]
+    assert total == stored_bytes(store) <= 3_000
+    orphans = store._conn.execute(
+        "SELECT COUNT(*) FROM contents WHERE content_hash NOT IN (SELECT content_hash FROM articles)"
+    ).fetchone()[0]
+    assert orphans == 0
+    assert store.lookup("https://a.com/0") is None
+    assert store.lookup("https://a.com/29")["text"].startswith("rewritten")
+
+
+def test_total_survives_a_restart(tmp_path):
+    store = make_store(tmp_path)
+    store.store("https://a.com/story", page("story " * 20))
+    assert make_store(tmp_path).stats()["stored_bytes"] == stored_bytes(store) > 0
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from backend.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpen
+
+
+def failing():
+    raise ConnectionError("down")
+
+
+def make_breaker(**overrides):
+    settings = {"failure_threshold": 2, "reset_timeout": 0.05, **overrides}
+    return CircuitBreaker("test", "site", **settings)
+
+
+def test_opens_after_consecutive_failures():
+    breaker = make_breaker()
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(failing)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpen):
+        breaker.call(lambda: "never runs")
+
+
+def test_success_resets_the_failure_count():
+    breaker = make_breaker()
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.call(lambda: "ok") == "ok"
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = make_breaker(failure_threshold=1)
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_failed_probe_opens_again():
+    breaker = make_breaker(failure_threshold=1)
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    time.sleep(0.06)
+    with pytest.raises(ConnectionError):
+        breaker.call(failing)
+    assert breaker.state == OPEN
+
+
+def test_slow_calls_count_as_failures():
+    breaker = make_breaker(failure_threshold=1, slow_after=0.01)
+    assert breaker.call(lambda: time.sleep(0.02) or "late") == "late"
+    assert breaker.state == OPEN
+
+
+def test_ignored_errors_do_not_count():
+    breaker = make_breaker(failure_threshold=1, ignore=(ValueError,))
+
+    def bad_input():
+        raise ValueError("the site answered")
+
+    with pytest.raises(ValueError):
+        breaker.call(bad_input)
+    assert breaker.state == CLOSED
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+import requests
+
+from backend.fetch_scheduler import HostPolicy, FetchScheduler, RetryableStatus, check_status, url_host
+
+
+def make_scheduler(**overrides):
+    settings = {"rate": 10.0, "burst": 2, "concurrency": 2, "retries": 2, "backoff_base": 0.001, "backoff_max": 0.01}
+    return FetchScheduler(**{**settings, **overrides})
+
+
+def test_burst_is_free_then_requests_are_paced():
+    scheduler = make_scheduler()
+    assert scheduler._try_acquire("example.com") == 0
+    scheduler._release("example.com")
+    assert scheduler._try_acquire("example.com") == 0
+    scheduler._release("example.com")
+    delay = scheduler._try_acquire("example.com")
+    assert 0 < delay <= 0.1
+
+
+def test_tokens_refill_at_the_host_rate():
+    scheduler = make_scheduler(rate=50.0, burst=1)
+    assert scheduler._try_acquire("example.com") == 0
+    scheduler._release("example.com")
+    time.sleep(0.03)
+    assert scheduler._try_acquire("example.com") == 0
+
+
+def test_concurrency_cap_holds_callers_back():
+    scheduler = make_scheduler(burst=5, concurrency=1)
+    assert scheduler._try_acquire("example.com") == 0
+    assert scheduler._try_acquire("example.com") > 0
+    scheduler._release("example.com")
+    assert scheduler._try_acquire("example.com") == 0
+
+
+def test_hosts_are_paced_independently_and_regulators_get_their_policy():
+    scheduler = make_scheduler(burst=1)
+    assert scheduler._try_acquire("a.example") == 0
+    assert scheduler._try_acquire("b.example") == 0
+    assert scheduler.policy(url_host("https://WWW.RBI.org.in/Scripts/x")) == HostPolicy(rate=2.0, burst=3, concurrency=2)
+    assert scheduler.policy("notrbi.org.in") == scheduler.default_policy
+
+
+def test_retryable_statuses_carry_retry_after():
+    with pytest.raises(RetryableStatus) as raised:
+        check_status("https://example.com", 503, {"Retry-After": "7"})
+    assert raised.value.retry_after == 7.0
+    check_status("https://example.com", 404, {})
+    check_status("https://example.com", 200, {})
+
+
+def test_transient_failures_are_retried():
+    scheduler = make_scheduler()
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise requests.ConnectionError("reset")
+        return "ok"
+
+    assert scheduler.call("https://example.com/a", flaky) == "ok"
+    assert len(attempts) == 3
+
+
+def test_retries_run_out():
+    scheduler = make_scheduler(retries=1)
+
+    def always_busy():
+        check_status("https://example.com/a", 429, {})
+
+    with pytest.raises(RetryableStatus):
+        scheduler.call("https://example.com/a", always_busy)
+
+
+def test_other_errors_are_not_retried():
+    scheduler = make_scheduler()
+    attempts = []
+
+    def broken():
+        attempts.append(1)
+        raise ValueError("bad markup")
+
+    with pytest.raises(ValueError):
+        scheduler.call("https://example.com/a", broken)
+    assert attempts == [1]
+    assert scheduler.stats()["example.com"]["active"] == 0
+
+
+def test_backoff_honours_retry_after_up_to_the_cap():
+    scheduler = make_scheduler(backoff_base=0.1, backoff_max=5)
+    assert 0 <= scheduler.backoff(0) <= 0.1
+    assert scheduler.backoff(0, retry_after=3) >= 3
+    assert scheduler.backoff(0, retry_after=60) <= 5
@@ -0,0 +1,66 @@
+import os
+import time
+
+from backend.scrape_ledger import ScrapeLedger, rbi_release_key, sebi_release_key
+
+RELEASE = {
+    "pdf_url": "https://rbi.org.in/pdfs/PR123.PDF",
+    "detail_url": "https://rbi.org.in/Scripts/BS_PressReleaseDisplay.aspx?prid=5678",
+    "title": "Monetary Policy Statement",
+}
+
+
+def make_ledger(tmp_path, **overrides):
+    return ScrapeLedger(
+        db_path=str(tmp_path / "ledger.sqlite3"), text_dir=str(tmp_path / "texts"), **{"recheck_seconds": 60, **overrides}
+    )
+
+
+def test_release_keys():
+    assert rbi_release_key(RELEASE) == "5678"
+    assert rbi_release_key({"pdf_url": "https://rbi.org.in/a.pdf"}) == "https://rbi.org.in/a.pdf"
+    assert sebi_release_key(RELEASE) == RELEASE["detail_url"]
+
+
+def test_recorded_release_is_fresh_and_unchanged(tmp_path):
+    ledger = make_ledger(tmp_path)
+    ledger.record("rbi", "5678", RELEASE, b"%PDF bytes", "policy text")
+    record = ledger.lookup("rbi", "5678")
+    assert ledger.is_fresh(record)
+    assert ledger.read_text(record) == "policy text"
+    assert ledger.unchanged(record, b"%PDF bytes")
+    assert not ledger.unchanged(record, b"%PDF other bytes")
+
+
+def test_ledger_is_shared_across_instances(tmp_path):
+    make_ledger(tmp_path).record("rbi", "5678", RELEASE, b"%PDF bytes", "policy text")
+    record = make_ledger(tmp_path).lookup("rbi", "5678")
+    assert record is not None and not record["partial"]
+
+
+def test_recheck_interval(tmp_path):
+    ledger = make_ledger(tmp_path, recheck_seconds=0.05)
+    ledger.record("rbi", "5678", RELEASE, b"%PDF bytes", "policy text")
+    time.sleep(0.06)
+    assert not ledger.is_fresh(ledger.lookup("rbi", "5678"))
+    ledger.touch("rbi", "5678", checked=True)
+    assert ledger.is_fresh(ledger.lookup("rbi", "5678"))
+
+
+def test_partial_and_range_read_entries_never_count_as_unchanged(tmp_path):
+    ledger = make_ledger(tmp_path)
+    ledger.record("rbi", "5678", RELEASE, b"%PDF bytes", "first pages", partial=True)
+    partial = ledger.lookup("rbi", "5678")
+    assert partial["partial"]
+    assert ledger.read_text(partial) == "first pages"
+    assert not ledger.unchanged(partial, b"%PDF bytes")
+    ledger.record("sebi", "release", RELEASE, None, "read through Range requests")
+    assert not ledger.unchanged(ledger.lookup("sebi", "release"), b"")
+
+
+def test_missing_text_file_reads_as_none(tmp_path):
+    ledger = make_ledger(tmp_path)
+    ledger.record("rbi", "5678", RELEASE, b"%PDF bytes", "policy text")
+    record = ledger.lookup("rbi", "5678")
+    os.remove(record["text_path"])
+    assert ledger.read_text(record) is None
@@ -0,0 +1,40 @@
+import time
+
+from backend.search_cache import SearchCache
+
+
+def make_cache(tmp_path, **overrides):
+    settings = {"ttl": 60, "negative_ttl": 60, **overrides}
+    return SearchCache(db_path=str(tmp_path / "searches.sqlite3"), **settings)
+
+
+def test_links_are_keyed_by_source_and_normalized_query(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("et", "RBI Repo Rate", ["https://a", "https://b"])
+    assert cache.get("et", "rbi  repo rate!") == ["https://a", "https://b"]
+    assert cache.get("bbc", "rbi repo rate") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_empty_results_use_the_negative_ttl(tmp_path):
+    cache = make_cache(tmp_path, negative_ttl=0.05)
+    cache.set("et", "quiet story", [])
+    assert cache.get("et", "quiet story") == []
+    assert cache.negative_hits == 1
+    time.sleep(0.06)
+    assert cache.get("et", "quiet story") is None
+
+
+def test_zero_ttl_disables_caching(tmp_path):
+    cache = make_cache(tmp_path, negative_ttl=0)
+    cache.set("et", "quiet story", [])
+    assert cache.get("et", "quiet story") is None
+
+
+def test_invalidate_one_source(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("et", "query", ["https://a"])
+    cache.set("bbc", "query", ["https://b"])
+    assert cache.invalidate("et") == 1
+    assert cache.get("et", "query") is None
+    assert cache.get("bbc", "query") == ["https://b"]
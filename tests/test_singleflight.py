@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from backend.singleflight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    calls = []
+
+    async def work(value):
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value * 2
+
+    async def main():
+        flights = SingleFlight()
+        results = await asyncio.gather(*(flights.do(("verify", "k"), work, 21) for _ in range(5)))
+        return results, flights
+
+    results, flights = asyncio.run(main())
+    assert results == [42] * 5
+    assert calls == [21]
+    assert flights.stats() == {"verify": {"executed": 1, "coalesced": 4}}
+    assert flights.in_flight() == 0
+
+
+def test_errors_reach_every_caller():
+    async def work():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    async def main():
+        flights = SingleFlight()
+        return await asyncio.gather(*(flights.do(("verify", "k"), work) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_cancelled_caller_does_not_cancel_the_others():
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def main():
+        flights = SingleFlight()
+        first = asyncio.ensure_future(flights.do(("verify", "k"), work))
+        second = asyncio.ensure_future(flights.do(("verify", "k"), work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(main()) == "done"
+
+
+async def _tokens(count, produced, delay=0.01):
+    for i in range(count):
+        await asyncio.sleep(delay)
+        produced.append(i)
+        yield i
+
+
+def test_stream_fans_out_with_replay_for_late_joiners():
+    produced = []
+
+    async def main():
+        flights = SingleFlight()
+
+        async def subscriber(delay):
+            await asyncio.sleep(delay)
+            return [item async for item in flights.stream(("generate", "k"), _tokens, 5, produced)]
+
+        results = await asyncio.gather(subscriber(0), subscriber(0.025))
+        return results, flights
+
+    results, flights = asyncio.run(main())
+    assert results == [[0, 1, 2, 3, 4], [0, 1, 2, 3, 4]]
+    assert produced == [0, 1, 2, 3, 4]
+    assert flights.stats() == {"generate": {"executed": 1, "coalesced": 1}}
+
+
+def test_stream_errors_reach_every_subscriber():
+    async def broken():
+        yield "partial"
+        raise RuntimeError("stream failed")
+
+    async def main():
+        flights = SingleFlight()
+
+        async def subscriber():
+            items = []
+            with pytest.raises(RuntimeError):
+                async for item in flights.stream(("generate", "k"), broken):
+                    items.append(item)
+            return items
+
+        return await asyncio.gather(subscriber(), subscriber())
+
+    assert asyncio.run(main()) == [["partial"], ["partial"]]
+
+
+def test_stream_is_cancelled_when_the_last_subscriber_leaves():
+    produced = []
+
+    async def main():
+        flights = SingleFlight()
+        stream = flights.stream(("generate", "k"), _tokens, 100, produced)
+        async for item in stream:
+            if item == 1:
+                break
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        return flights
+
+    flights = asyncio.run(main())
+    assert len(produced) < 5
+    assert flights.in_flight() == 0
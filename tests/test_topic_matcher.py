@@ -0,0 +1,53 @@
+import random
+
+from backend.pdf_pipeline import score_text
+from backend.topic_matcher import TopicMatcher, dice, get_topic_matcher, shingles
+
+TOPIC = "RBI keeps the repo rate unchanged at 6.5 per cent to contain inflation"
+KEY_TERMS = ["repo rate", "inflation", "RBI", "monetary policy", "6.5 per cent", "liquidity"]
+VOCABULARY = ("the reserve bank repo rate inflation monetary policy liquidity 6.5 per cent RBI rbi "
+              "circular banks deposit lending growth forecast unchanged committee").split()
+
+
+def reference_score(text, similarity_threshold=0.3):
+    """Straightforward form of what TopicMatcher.score computes"""
+    if not text:
+        return False, 0, []
+    found = [term for term in KEY_TERMS if term.lower() in text.lower()]
+    text_shingles = shingles(text)
+    similarity = max(dice(text_shingles, shingles(other)) for other in [TOPIC, *KEY_TERMS])
+    return bool(found) or similarity >= similarity_threshold, similarity, found
+
+
+def random_texts(count=200, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        words = rng.choices(VOCABULARY, k=rng.randint(0, 40))
+        yield " ".join(word.upper() if rng.random() < 0.2 else word for word in words)
+
+
+def test_matches_the_reference_scoring():
+    matcher = TopicMatcher(TOPIC, KEY_TERMS)
+    for text in random_texts():
+        assert matcher.score(text) == reference_score(text)
+
+
+def test_found_terms_keep_substring_semantics_and_order():
+    matcher = TopicMatcher(TOPIC, KEY_TERMS)
+    assert matcher.found_terms("inflation eased while the rbi held the repo rate") == ["repo rate", "inflation", "RBI"]
+    assert matcher.found_terms("hyperinflation") == ["inflation"]
+
+
+def test_dice_bounds():
+    assert dice(set(), set()) == 0.0
+    assert dice(shingles(TOPIC), shingles(TOPIC)) == 1.0
+    assert dice(shingles("alpha beta"), shingles("gamma delta")) == 0.0
+
+
+def test_empty_text_is_unrelated():
+    assert TopicMatcher(TOPIC, KEY_TERMS).score("") == (False, 0, [])
+
+
+def test_matchers_are_shared_per_topic():
+    assert get_topic_matcher(TOPIC, KEY_TERMS) is get_topic_matcher(TOPIC, list(KEY_TERMS))
+    assert score_text("the repo rate was held", TOPIC, KEY_TERMS) == reference_score("the repo rate was held")
@@ -0,0 +1,55 @@
+import time
+
+from backend.verdict_cache import VerdictCache, cache_key
+
+
+def make_cache(tmp_path, **overrides):
+    settings = {"ttl": 60, "memory_size": 2, "disk_size": 3, **overrides}
+    return VerdictCache(db_path=str(tmp_path / "verdicts.sqlite3"), **settings)
+
+
+def test_trivially_different_texts_share_a_key():
+    assert cache_key("RBI cuts repo rate!") == cache_key("  rbi cuts   REPO rate ")
+
+
+def test_hit_returns_a_copy(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("RBI cuts repo rate", {"verdict": "true"})
+    first = cache.get("rbi cuts repo rate.")
+    first["verdict"] = "changed"
+    assert cache.get("RBI cuts repo rate") == {"verdict": "true"}
+    assert cache.memory_hits == 2
+
+
+def test_disk_tier_survives_a_restart(tmp_path):
+    make_cache(tmp_path).set("RBI cuts repo rate", {"verdict": "true"})
+    cache = make_cache(tmp_path)
+    assert cache.get("RBI cuts repo rate") == {"verdict": "true"}
+    assert cache.disk_hits == 1
+
+
+def test_errors_are_not_cached(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("claim", {"error": "timeout"})
+    assert cache.get("claim") is None
+
+
+def test_expired_entries_are_misses(tmp_path):
+    cache = make_cache(tmp_path, ttl=0.05)
+    cache.set("claim", {"verdict": "true"})
+    time.sleep(0.06)
+    assert cache.get("claim") is None
+    # Both the memory and the disk copy were stale
+    assert cache.expired == 2
+    assert make_cache(tmp_path, ttl=0.05).get("claim") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = make_cache(tmp_path)
+    for i in range(4):
+        cache.set(f"claim {i}", {"verdict": i})
+        time.sleep(0.001)
+    assert len(cache._memory) == 2
+    restarted = make_cache(tmp_path)
+    assert restarted.get("claim 0") is None
+    assert [restarted.get(f"claim {i}") for i in (1, 2, 3)] == [{"verdict": 1}, {"verdict": 2}, {"verdict": 3}]